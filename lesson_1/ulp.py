@@ -2,6 +2,10 @@
 Documentation: http://neerc.ifmo.ru/wiki/index.php?title=Представление_вещественных_чисел&oldid=84685
 """
 
+import sys
+from functools import lru_cache
+from typing import NamedTuple, Sequence
+
 import numpy as np
 
 
@@ -137,6 +141,250 @@ def get_minimum_exponent(number_type: np.floating) -> int:
     return minimum_exponent + get_number_of_mantissa_bits(number_type) + 1
 
 
+class FloatFormat(NamedTuple):
+    """Description of a floating point format read from its bit layout."""
+
+    number_type: type
+    storage_bits: int
+    exponent_bits: int
+    mantissa_bits: int
+    bias: int
+    machine_epsilon: np.floating
+    maximum_exponent: int
+    minimum_exponent: int
+
+
+def _to_bits(value: np.floating) -> int:
+    """Get the bit pattern of a floating point scalar as a python integer.
+
+    The scalar is written into a zeroed buffer by a ufunc, which stores only the significant bytes,
+    so padding bytes of extended formats (e.g. 80-bit long double stored in 16 bytes) stay zero.
+    """
+
+    buffer = np.zeros(1, dtype=type(value))
+    np.positive(value, out=buffer)
+
+    return int.from_bytes(buffer.view(np.uint8).tobytes(), byteorder=sys.byteorder)
+
+
+def _from_bits(bits: int, number_type: np.floating) -> np.floating:
+    """Build a floating point scalar of the given type from its bit pattern."""
+
+    size = np.dtype(number_type).itemsize
+
+    return np.frombuffer(bits.to_bytes(size, byteorder=sys.byteorder), dtype=number_type)[0]
+
+
+@lru_cache(maxsize=None)
+def get_float_format(number_type: np.floating) -> FloatFormat:
+    """Get the floating point format description for a given floating point type.
+
+    The values are read straight from the bit patterns of 1, 2, -0 and inf, so no probing loops are needed
+    and the result is cached per type. Works for IEEE formats (np.float16, np.float32, np.float64)
+    and for the extended formats used by np.longdouble (including an explicit integer bit).
+
+    Args:
+        number_type (np.floating): The floating point type to describe.
+
+    Returns:
+        FloatFormat: The format description for the given floating point type.
+
+    Raises:
+        FloatingTypeError: The given floating point type must be either np.floating.
+
+    Doctests:
+        >>> get_float_format(np.float32).machine_epsilon == np.finfo(np.float32).eps
+        True
+        >>> get_float_format(np.float64)[2:5]
+        (11, 52, 1023)
+        >>> get_float_format(np.float16).minimum_exponent == np.finfo(np.float16).minexp
+        True
+        >>> get_float_format(np.longdouble).mantissa_bits == np.finfo(np.longdouble).nmant
+        True
+        >>> get_float_format(np.longdouble).maximum_exponent == np.finfo(np.longdouble).maxexp
+        True
+        >>> get_float_format(np.float64) is get_float_format(np.float64)
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/IEEE_754#Basic_and_interchange_formats
+    """
+
+    if not isinstance(number_type(1.0), np.floating):
+        raise FloatingTypeError()
+
+    one = _to_bits(number_type(1.0))
+    two = _to_bits(number_type(2.0))
+    sign = _to_bits(number_type(-0.0))
+
+    exponent_shift = (two - one).bit_length() - 1
+    exponent_bits = sign.bit_length() - 1 - exponent_shift
+    stored_mantissa = one & ((1 << exponent_shift) - 1)
+    bias = one >> exponent_shift
+
+    machine_epsilon = _from_bits(one + 1, number_type) - number_type(1.0)
+    largest = _from_bits(((1 << exponent_bits) - 2) << exponent_shift | ((1 << exponent_shift) - 1), number_type)
+    smallest = _from_bits(1 << exponent_shift | stored_mantissa, number_type)
+
+    return FloatFormat(
+        number_type=number_type,
+        storage_bits=8 * np.dtype(number_type).itemsize,
+        exponent_bits=exponent_bits,
+        mantissa_bits=1 - int(np.frexp(machine_epsilon)[1]),
+        bias=bias,
+        machine_epsilon=machine_epsilon,
+        maximum_exponent=int(np.frexp(largest)[1]),
+        minimum_exponent=int(np.frexp(smallest)[1]) - 1,
+    )
+
+
+def check_float_format(number_type: np.floating) -> bool:
+    """Check the bit-level format description against the probing functions.
+
+    Args:
+        number_type (np.floating): The floating point type to check.
+
+    Returns:
+        bool: True if the description agrees with the probing functions.
+
+    Doctests:
+        >>> all(check_float_format(t) for t in [np.float16, np.float32, np.float64, np.longdouble])
+        True
+    """
+
+    float_format = get_float_format(number_type)
+
+    with np.errstate(over="ignore"):
+        return bool(
+            float_format.machine_epsilon == get_machine_epsilon(number_type)
+            and float_format.mantissa_bits == get_number_of_mantissa_bits(number_type)
+            and float_format.maximum_exponent == get_maximum_exponent(number_type)
+            and float_format.minimum_exponent == get_minimum_exponent(number_type)
+        )
+
+
+class UlpComparison(NamedTuple):
+    """Summary of an element-wise ULP comparison of two arrays."""
+
+    distance: np.ndarray
+    maximum: int
+    percentiles: dict
+    worst: np.ndarray
+
+
+def _to_ordered_integers(x: np.ndarray, number_type: np.floating) -> np.ndarray:
+    """Map floating point bit patterns to integers with the same ordering as the numbers.
+
+    Negative numbers are reflected around the sign bit, so -0.0 and 0.0 both map to zero
+    and adjacent floating point numbers always map to adjacent integers.
+    """
+
+    integer_type = np.dtype(f"int{get_float_format(number_type).storage_bits}")
+    bits = x.view(integer_type).astype(np.int64)
+
+    return np.where(bits < 0, np.iinfo(integer_type).min - bits, bits)
+
+
+def ulp_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Compute the element-wise distance in ULPs between two floating point arrays.
+
+    The distance is the number of representable numbers between the elements, so it is meaningful
+    for any magnitude. The arrays are broadcast against each other and cast to their common floating point type.
+    Elements where exactly one value is NaN get the maximum possible distance, two NaNs are at distance zero.
+
+    Args:
+        a (np.ndarray): The first array.
+        b (np.ndarray): The second array.
+
+    Returns:
+        np.ndarray: The distances in ULPs as an unsigned 64-bit integer array.
+
+    Raises:
+        FloatingTypeError: The given floating point type must be either np.floating.
+
+    Doctests:
+        >>> ulp_distance(np.array([1.0, 0.0, -0.0]), np.array([np.nextafter(1.0, 2.0), -0.0, 5e-324])).tolist()
+        [1, 0, 1]
+        >>> int(ulp_distance(np.float32(-1.0), np.float32(1.0))) == 2 * (127 << 23)
+        True
+        >>> int(ulp_distance(np.float64(-np.inf), np.float64(np.inf))) == 2 * (2047 << 52)
+        True
+
+    Documentation:
+        https://randomascii.wordpress.com/2012/02/25/comparing-floating-point-numbers-2012-edition/
+    """
+
+    a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+    number_type = np.promote_types(a.dtype, b.dtype).type
+
+    if not issubclass(number_type, np.floating) or number_type not in (np.float16, np.float32, np.float64):
+        raise FloatingTypeError("The given arrays must be of type np.float16, np.float32 or np.float64.")
+
+    a = a.astype(number_type, copy=False)
+    b = b.astype(number_type, copy=False)
+
+    ordered_a = _to_ordered_integers(a, number_type).view(np.uint64)
+    ordered_b = _to_ordered_integers(b, number_type).view(np.uint64)
+    distance = np.where(
+        ordered_a.view(np.int64) >= ordered_b.view(np.int64), ordered_a - ordered_b, ordered_b - ordered_a
+    )
+
+    nan_a, nan_b = np.isnan(a), np.isnan(b)
+    distance[nan_a != nan_b] = np.iinfo(np.uint64).max
+    distance[nan_a & nan_b] = 0
+
+    return distance
+
+
+def compare_ulp(
+    a: np.ndarray, b: np.ndarray, percentiles: Sequence[float] = (50, 90, 99), worst: int = 10
+) -> UlpComparison:
+    """Compare two floating point arrays in ULPs and summarize the result.
+
+    Args:
+        a (np.ndarray): The first array, e.g. the reference solution.
+        b (np.ndarray): The second array, e.g. the new solution.
+        percentiles (Sequence[float]): The percentiles of the distance to report.
+        worst (int): The number of worst offenders to report.
+
+    Returns:
+        UlpComparison: The distances, their maximum, the requested percentiles
+        and the indices of the worst offenders ordered from the largest distance.
+
+    Raises:
+        FloatingTypeError: The given floating point type must be either np.floating.
+
+    Doctests:
+        >>> x = np.linspace(0.0, 1.0, 12).reshape(3, 4)
+        >>> y = x.copy()
+        >>> y[1, 2] = np.nextafter(np.nextafter(y[1, 2], 2.0), 2.0)
+        >>> y[2, 3] = np.nextafter(y[2, 3], 0.0)
+        >>> comparison = compare_ulp(x, y, worst=2)
+        >>> comparison.maximum, comparison.percentiles[50]
+        (2, 0.0)
+        >>> comparison.worst.tolist()
+        [[1, 2], [2, 3]]
+    """
+
+    distance = ulp_distance(a, b)
+    flat = distance.reshape(-1)
+
+    if flat.size == 0:
+        return UlpComparison(distance, 0, {q: 0.0 for q in percentiles}, np.zeros((0, distance.ndim), dtype=np.intp))
+
+    worst = min(worst, flat.size)
+    candidates = np.argpartition(flat, flat.size - worst)[flat.size - worst :] if worst else np.zeros(0, dtype=np.intp)
+    candidates = candidates[np.argsort(flat[candidates], kind="stable")[::-1]]
+    indices = np.unravel_index(candidates, distance.shape) if distance.ndim else ()
+
+    return UlpComparison(
+        distance=distance,
+        maximum=int(flat.max()),
+        percentiles={q: float(np.percentile(flat, q)) for q in percentiles},
+        worst=np.stack(indices, axis=-1) if indices else np.zeros((candidates.size, 0), dtype=np.intp),
+    )
+
+
 if __name__ == "__main__":
     for np_type in [np.float32, np.float64]:
         epsilon = get_machine_epsilon(np_type)
@@ -1,44 +1,31 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from lesson_9.tridiagonal import (  # pylint: disable=import-error
+    constant,
+    dirichlet,
+    neumann,
+)
+
 L, T = 1, 1
 n, k = 100, 100
 
 h = L / n
 tau = T / k
 
-a, b, c, d, q = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
 p = np.zeros((n + 1, k + 1))
-
-a[0], a[-1] = 0, 0
-b[0], b[-1] = -1 / h, 1
-c[0], c[-1] = 1 / h, 0
-d[0], d[-1] = 0, 0
-
-for i, j in np.ndindex(p.shape):
-    if i == 0:
-        p[i][j] = 0
-    elif j == 0:
-        p[i][j] = h * i * (1 - i * h / L) ** 2
-
-
-for m in range(1, k):
-    for i in range(1, n):
-        a[i] = -1 * tau / (2 * h**2)
-        b[i] = 1 + tau / h**2
-        c[i] = -1 * tau / (2 * h**2)
-        d[i] = p[i][m - 1] + tau / 2 * ((p[i + 1][m - 1] - 2 * p[i][m - 1] + p[i - 1][m - 1]) / h**2)
-
-    for i in range(1, n):
-        dzeta = a[i] / b[i - 1]
-        a[i] = 0
-        b[i] -= dzeta * c[i - 1]
-        d[i] -= dzeta * d[i - 1]
-
-    p[-1][m] = d[-1] / b[-1]
-
-    for i in range(n - 1, -1, -1):
-        p[i][m] = (d[i] - c[i] * p[i + 1][m]) / b[i]
+p[:, 0] = h * np.arange(n + 1) * (1 - np.arange(n + 1) * h / L) ** 2
+
+# The Crank-Nicolson scheme for p_t = p_xx with p_x(0, t) = 0 and p(L, t) = 0: the matrix of the implicit half
+# step is constant, so it is factored once for all the time steps.
+left, right = neumann(0), dirichlet(0)
+matrix = constant(n + 1, -tau / (2 * h**2), 1 + tau / h**2, -tau / (2 * h**2), h, left, right)
+
+for m in range(1, k + 1):
+    d = np.copy(p[:, m - 1])
+    d[1:-1] += tau / 2 * (p[2:, m - 1] - 2 * p[1:-1, m - 1] + p[:-2, m - 1]) / h**2
+    d[0], d[-1] = left.gamma, right.gamma
+    p[:, m] = matrix.solve(d)
 
 
 y, x = np.meshgrid(
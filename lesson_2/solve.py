@@ -2,7 +2,9 @@
 Documentation: https://en.wikipedia.org/wiki/Root-finding_algorithm
 """
 
-from typing import Callable
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional, Sequence
 
 import numpy as np
 
@@ -14,6 +16,24 @@ class DifferentSignsError(Exception):
         super().__init__(message)
 
 
+class RootEnumeration(NamedTuple):
+    """All roots of a function on an interval found by root enumeration."""
+
+    roots: np.ndarray
+    tangent_roots: np.ndarray
+    poles: np.ndarray
+
+
+class RootResult(NamedTuple):
+    """The result of a bracketing root finder."""
+
+    root: float
+    iterations: int
+    evaluations: int
+    brackets: list
+    converged: bool
+
+
 def dihotomy(f: Callable[[float], float], a: float, b: float, eps: float) -> (float, int):
     """
     Find the root of a function using the dihotomy method.
@@ -91,13 +111,197 @@ def simple_iteration(f: Callable[[float], float], x0: float, delta: float, eps:
     return x1, n
 
 
-def newton(f: Callable[[float], float], df: Callable[[float], float], x0: float, eps: float) -> (float, int):
+class Dual:
+    """
+    Dual number x + x' * epsilon with epsilon**2 = 0 for the forward-mode automatic differentiation.
+
+    The value and the derivative can be numpy arrays. The derivative may have extra leading axes,
+    one per seed direction, so a single evaluation of a function of n variables seeded with the identity
+    gives the whole Jacobian. Arithmetic operators and the common numpy ufuncs (np.sqrt, np.exp, np.sin, np.tan, ...)
+    propagate the derivative by the chain rule.
+
+    Doctests:
+        >>> y = np.sin(Dual(0.0, 1.0)) + 1.0 / np.tan(np.sqrt(Dual(1.0, 1.0)))
+        >>> round(float(y.value), 12), round(float(y.derivative), 12)
+        (0.642092615934, 0.293858536281)
+        >>> x = Dual(np.array([1.0, 2.0]), np.eye(2))
+        >>> (x[0] * x[1] ** 2).derivative.tolist()
+        [4.0, 4.0]
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Automatic_differentiation#Automatic_differentiation_using_dual_numbers
+    """
+
+    def __init__(self, value, derivative=0.0):
+        self.value = value
+        self.derivative = derivative
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs or ufunc not in _DUAL_PARTIALS:
+            return NotImplemented
+
+        values = [x.value if isinstance(x, Dual) else x for x in inputs]
+        result = ufunc(*values)
+        partials = _DUAL_PARTIALS[ufunc](result, *values)
+
+        derivative = 0.0
+        for x, partial in zip(inputs, partials):
+            if isinstance(x, Dual):
+                derivative = derivative + partial * x.derivative
+
+        return Dual(result, derivative)
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        seeds = np.ndim(self.derivative) - np.ndim(self.value)
+
+        return Dual(self.value[key], np.asarray(self.derivative)[(slice(None),) * seeds + key])
+
+    def __len__(self):
+        return len(self.value)
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.derivative!r})"
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+
+_DUAL_PARTIALS = {
+    np.negative: lambda r, x: (-1.0,),
+    np.positive: lambda r, x: (1.0,),
+    np.absolute: lambda r, x: (np.sign(x),),
+    np.square: lambda r, x: (2.0 * x,),
+    np.sqrt: lambda r, x: (0.5 / r,),
+    np.cbrt: lambda r, x: (1.0 / (3.0 * r**2),),
+    np.reciprocal: lambda r, x: (-(r**2),),
+    np.exp: lambda r, x: (r,),
+    np.log: lambda r, x: (1.0 / x,),
+    np.sin: lambda r, x: (np.cos(x),),
+    np.cos: lambda r, x: (-np.sin(x),),
+    np.tan: lambda r, x: (1.0 + r**2,),
+    np.arcsin: lambda r, x: (1.0 / np.sqrt(1.0 - x**2),),
+    np.arccos: lambda r, x: (-1.0 / np.sqrt(1.0 - x**2),),
+    np.arctan: lambda r, x: (1.0 / (1.0 + x**2),),
+    np.sinh: lambda r, x: (np.cosh(x),),
+    np.cosh: lambda r, x: (np.sinh(x),),
+    np.tanh: lambda r, x: (1.0 - r**2,),
+    np.add: lambda r, x, y: (1.0, 1.0),
+    np.subtract: lambda r, x, y: (1.0, -1.0),
+    np.multiply: lambda r, x, y: (y, x),
+    np.true_divide: lambda r, x, y: (1.0 / y, -r / y),
+    np.power: lambda r, x, y: (y * x ** (y - 1), r * np.log(np.where(x > 0, x, 1.0))),
+}
+
+
+def _as_dual(y) -> Dual:
+    """Convert the result of a function of dual numbers (e.g. np.array([Dual, Dual])) into a single Dual."""
+
+    if isinstance(y, Dual):
+        return y
+
+    components = [_as_dual(component) for component in y]
+    seeds = max(np.ndim(c.derivative) - np.ndim(c.value) for c in components)
+    derivatives = [
+        np.broadcast_to(c.derivative, np.shape(components[0].derivative)[:seeds] + np.shape(c.value))
+        for c in components
+    ]
+
+    return Dual(np.stack([c.value for c in components]), np.stack(derivatives, axis=seeds))
+
+
+def value_and_derivative(f: Callable, x: np.ndarray, *args) -> (np.ndarray, np.ndarray):
+    """
+    Compute the value and the derivative of a function in one evaluation using dual numbers.
+
+    For an array x the derivative is element-wise, i.e. f is assumed to act on every element independently.
+
+    Args:
+        f (Callable): The function f(x, *args), written with operators and numpy ufuncs.
+        x (np.ndarray): The point at which to differentiate.
+        args: The additional arguments of the function, not differentiated.
+
+    Returns:
+        np.ndarray: The value of the function.
+        np.ndarray: The derivative of the function.
+
+    Doctests:
+        >>> value_and_derivative(lambda x: x**3 - 2.0 * x, 2.0)
+        (4.0, 10.0)
+    """
+
+    y = _as_dual(f(Dual(x, np.ones_like(x)), *args))
+
+    return y.value, np.broadcast_to(y.derivative, np.shape(y.value))[()]
+
+
+def jacobian(f: Callable[[np.ndarray], np.ndarray], x: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    Compute the value and the dense Jacobian of a vector function in one evaluation using dual numbers.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): The vector function, written with operators and numpy ufuncs.
+        x (np.ndarray): The point at which to differentiate.
+
+    Returns:
+        np.ndarray: The value of the function.
+        np.ndarray: The Jacobian of the function, J[i, k] = d f_i / d x_k.
+
+    Doctests:
+        >>> jacobian(lambda x: np.array([x[0] * x[1], x[0] + np.exp(x[1])]), np.array([2.0, 0.0]))[1].tolist()
+        [[0.0, 2.0], [1.0, 1.0]]
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = _as_dual(f(Dual(x, np.eye(x.size))))
+
+    return y.value, np.broadcast_to(y.derivative, (x.size,) + np.shape(y.value)).T
+
+
+def newton(f: Callable[[float], float], df: Optional[Callable[[float], float]], x0: float, eps: float) -> (float, int):
     """
     Find the root of a function using the Newton's method.
 
     Args:
         f (Callable[[float], float]): The function to find the root of.
-        df (Callable[[float], float]): The derivative of the function.
+        df (Optional[Callable[[float], float]]): The derivative of the function. If None, the value
+            and the derivative are computed together in one evaluation of f using dual numbers.
         x0 (float): The initial approximation.
         eps (float): The precision of the root.
 
@@ -108,23 +312,516 @@ def newton(f: Callable[[float], float], df: Callable[[float], float], x0: float,
     Doctests:
         >>> newton(lambda x: x**2, lambda x: 2*x, 0.5, 1e-10)[0] < 1e-10
         True
+        >>> newton(lambda x: x**2, None, 0.5, 1e-10)[0] < 1e-10
+        True
 
     Documentation:
         https://en.wikipedia.org/wiki/Newton%27s_method
 
     """
 
-    x1 = x0 - f(x0) / df(x0)
+    if df is None:
+
+        def step(x: float) -> float:
+            fx, dfx = value_and_derivative(f, x)
+            return x - fx / dfx
+
+    else:
+
+        def step(x: float) -> float:
+            return x - f(x) / df(x)
+
+    x1 = step(x0)
 
     n = 0
     while abs(x1 - x0) > eps:
         x0 = x1
-        x1 = x0 - f(x0) / df(x0)
+        x1 = step(x0)
+        n += 1
+
+    return x1, n
+
+
+def newton_system(
+    f: Callable[[np.ndarray], np.ndarray], x0: np.ndarray, eps: float, max_iter: int = 100
+) -> (np.ndarray, int):
+    """
+    Find the root of a system of equations using the Newton's method with the Jacobian from dual numbers.
+
+    Each iteration evaluates f once to get both the value and the dense Jacobian.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): The vector function to find the root of.
+        x0 (np.ndarray): The initial approximation.
+        eps (float): The precision of the root.
+        max_iter (int): The maximum number of iterations.
+
+    Returns:
+        np.ndarray: The root of the system.
+        int: The number of iterations.
+
+    Doctests:
+        >>> root, n = newton_system(lambda x: np.array([x[0] ** 2 + x[1] ** 2 - 4.0, x[0] - x[1]]), [1.0, 2.0], 1e-12)
+        >>> np.allclose(root, np.sqrt(2.0))
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Newton%27s_method#Systems_of_equations
+
+    """
+
+    x0 = np.asarray(x0, dtype=float)
+    fx, jx = jacobian(f, x0)
+    x1 = x0 - np.linalg.solve(jx, fx)
+
+    n = 0
+    while np.max(np.abs(x1 - x0)) > eps and n < max_iter:
+        x0 = x1
+        fx, jx = jacobian(f, x0)
+        x1 = x0 - np.linalg.solve(jx, fx)
         n += 1
 
     return x1, n
 
 
+class _BudgetExhaustedError(Exception):
+    pass
+
+
+class _CachedFunction:
+    """Wrap a function so that every computed value is cached and the real calls are counted."""
+
+    def __init__(self, f: Callable[[float], float], cache: dict, max_evaluations: int):
+        self.f = f
+        self.cache = cache
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+
+    def __call__(self, x: float) -> float:
+        if x not in self.cache:
+            if self.evaluations >= self.max_evaluations:
+                raise _BudgetExhaustedError()
+            self.cache[x] = self.f(x)
+            self.evaluations += 1
+
+        return self.cache[x]
+
+
+def _brent_step(
+    a: float, b: float, c: float, fa: float, fb: float, fc: float, d: float, e: float, m: float, tol: float
+) -> (float, float):
+    """Choose the next step of the Brent's method: interpolation if it is safe, dihotomy otherwise."""
+
+    if abs(e) < tol or abs(fa) <= abs(fb):
+        return m, m
+
+    s = fb / fa
+    if a == c:
+        p, q = 2.0 * m * s, 1.0 - s
+    else:
+        q, r = fa / fc, fb / fc
+        p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+        q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+    if p > 0:
+        q = -q
+    p = abs(p)
+
+    if 2.0 * p < min(3.0 * m * q - abs(tol * q), abs(e * q)):
+        return p / q, d
+
+    return m, m
+
+
+def brent(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    eps: float,
+    max_evaluations: int = 100,
+    cache: dict = None,
+) -> RootResult:
+    """
+    Find the root of a function using the Brent's method.
+
+    The method combines inverse quadratic interpolation, the secant method and dihotomy,
+    so it converges superlinearly on smooth functions and never slower than dihotomy.
+    Every value of f is computed once: the values are stored in the cache, which can be passed
+    again to reuse them in the next call (e.g. with a smaller eps). When f is expensive
+    the number of evaluations is the cost of the method, so it is limited and reported.
+
+    Args:
+        f (Callable[[float], float]): The function to find the root of.
+        a (float): The lower bound of the interval.
+        b (float): The upper bound of the interval.
+        eps (float): The precision of the root.
+        max_evaluations (int): The maximum number of new evaluations of the function.
+        cache (dict): The cache of function values {x: f(x)}, updated in place.
+
+    Returns:
+        RootResult: The root, the number of iterations and of evaluations, the history of the brackets
+        and whether the precision was reached within the budget.
+
+    Raises:
+        DifferentSignsError: The function must have different signs at the bounds of the interval.
+
+    Doctests:
+        >>> result = brent(lambda x: x**3 - 2.0, 0.0, 2.0, 1e-12)
+        >>> abs(result.root - 2.0 ** (1.0 / 3.0)) < 1e-12, result.converged, result.evaluations < 15
+        (True, True, True)
+        >>> brent(lambda x: x**3 - 2.0, 0.0, 2.0, 1e-12, max_evaluations=5).converged
+        False
+        >>> cache = {}
+        >>> brent(np.cos, 0.0, 3.0, 1e-6, cache=cache).evaluations == len(cache)
+        True
+        >>> brent(np.cos, 0.0, 3.0, 1e-6, cache=cache).evaluations
+        0
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Brent%27s_method
+
+    """
+
+    cache = {} if cache is None else cache
+    F = _CachedFunction(f, cache, max_evaluations)
+    brackets = []
+    n = 0
+
+    try:
+        fa, fb = F(a), F(b)
+    except _BudgetExhaustedError:
+        return RootResult((a + b) / 2.0, n, F.evaluations, brackets, False)
+
+    if fa * fb > 0:
+        raise DifferentSignsError()
+
+    c, fc = b, fb
+    d = e = b - a
+
+    try:
+        while True:
+            if (fb > 0 and fc > 0) or (fb < 0 and fc < 0):
+                c, fc = a, fa
+                d = e = b - a
+
+            if abs(fc) < abs(fb):
+                a, b, c = b, c, b
+                fa, fb, fc = fb, fc, fb
+
+            brackets.append((min(b, c), max(b, c)))
+            tol = 2.0 * np.finfo(float).eps * abs(b) + 0.5 * eps
+            m = 0.5 * (c - b)
+
+            if abs(m) <= tol or fb == 0.0:
+                return RootResult(b, n, F.evaluations, brackets, True)
+
+            d, e = _brent_step(a, b, c, fa, fb, fc, d, e, m, tol)
+
+            a, fa = b, fb
+            b += d if abs(d) > tol else np.copysign(tol, m)
+            fb = F(b)
+            n += 1
+    except _BudgetExhaustedError:
+        return RootResult(b, n, F.evaluations, brackets, False)
+
+
+def _broadcast_lanes(*arrays: np.ndarray) -> (tuple, list):
+    """Broadcast per-lane arrays against each other and flatten them into writable float arrays."""
+
+    arrays = np.broadcast_arrays(*arrays)
+
+    return arrays[0].shape, [np.array(array, dtype=float).reshape(-1) for array in arrays]
+
+
+def vectorized_dihotomy(
+    f: Callable[..., np.ndarray],
+    a: np.ndarray,
+    b: np.ndarray,
+    eps: float,
+    args: Sequence[np.ndarray] = (),
+    max_iter: int = 200,
+) -> (np.ndarray, np.ndarray):
+    """
+    Find the roots of a function on many intervals at once using the dihotomy method.
+
+    All lanes are advanced together: each iteration evaluates f once on the array of midpoints
+    of the lanes that have not converged yet. Converged lanes are masked out.
+
+    Args:
+        f (Callable[..., np.ndarray]): The vectorized function f(x, *args) to find the roots of.
+        a (np.ndarray): The lower bounds of the intervals.
+        b (np.ndarray): The upper bounds of the intervals.
+        eps (float): The precision of the roots.
+        args (Sequence[np.ndarray]): The per-lane parameters of the function, broadcast against a and b.
+        max_iter (int): The maximum number of iterations.
+
+    Returns:
+        np.ndarray: The roots of the function.
+        np.ndarray: The number of iterations of each lane.
+
+    Raises:
+        DifferentSignsError: The function must have different signs at the bounds of the interval.
+
+    Doctests:
+        >>> roots, n = vectorized_dihotomy(lambda x, c: x**2 - c, 0.0, 3.0, 1e-10, args=(np.array([1.0, 4.0, 9.0]),))
+        >>> np.allclose(roots, [1.0, 2.0, 3.0]), n.tolist()
+        (True, [35, 35, 0])
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Bisection_method
+
+    """
+
+    shape, (a, b, *args) = _broadcast_lanes(a, b, *args)
+
+    fa = f(a, *args)
+    fb = f(b, *args)
+
+    if np.any(fa * fb > 0):
+        raise DifferentSignsError()
+
+    b[fa == 0.0] = a[fa == 0.0]
+    a[fb == 0.0] = b[fb == 0.0]
+    n = np.zeros(a.shape, dtype=int)
+    active = np.flatnonzero(np.abs(b - a) > eps)
+
+    while active.size and n.max() < max_iter:
+        c = (a[active] + b[active]) / 2.0
+        fc = f(c, *(arg[active] for arg in args))
+
+        left = fa[active] * fc < 0
+        root = fc == 0.0
+        b[active[left | root]] = c[left | root]
+        a[active[~left]] = c[~left]
+        fa[active[~left]] = fc[~left]
+
+        n[active] += 1
+        active = active[np.abs(b[active] - a[active]) > eps]
+
+    return ((a + b) / 2.0).reshape(shape), n.reshape(shape)
+
+
+def vectorized_newton(
+    f: Callable[..., np.ndarray],
+    df: Optional[Callable[..., np.ndarray]],
+    a: np.ndarray,
+    b: np.ndarray,
+    x0: np.ndarray,
+    eps: float,
+    args: Sequence[np.ndarray] = (),
+    max_iter: int = 100,
+) -> (np.ndarray, np.ndarray):
+    """
+    Find the roots of a function on many intervals at once using the safeguarded Newton's method.
+
+    Every lane keeps a bracket [a, b] around its root. A Newton step that leaves the bracket
+    is replaced by a dihotomy step, so each lane converges even from a poor initial approximation.
+    Each iteration evaluates f and df once on the array of the lanes that have not converged yet.
+
+    Args:
+        f (Callable[..., np.ndarray]): The vectorized function f(x, *args) to find the roots of.
+        df (Optional[Callable[..., np.ndarray]]): The vectorized derivative df(x, *args) of the function.
+            If None, the value and the derivative are computed together using dual numbers.
+        a (np.ndarray): The lower bounds of the intervals.
+        b (np.ndarray): The upper bounds of the intervals.
+        x0 (np.ndarray): The initial approximations.
+        eps (float): The precision of the roots.
+        args (Sequence[np.ndarray]): The per-lane parameters of the function, broadcast against a, b and x0.
+        max_iter (int): The maximum number of iterations.
+
+    Returns:
+        np.ndarray: The roots of the function.
+        np.ndarray: The number of iterations of each lane.
+
+    Raises:
+        DifferentSignsError: The function must have different signs at the bounds of the interval.
+
+    Doctests:
+        >>> c = np.array([1.0, 4.0, 9.0])
+        >>> roots, n = vectorized_newton(lambda x, c: x**2 - c, lambda x, c: 2 * x, 0.0, 3.0, 0.0, 1e-12, args=(c,))
+        >>> np.allclose(roots, [1.0, 2.0, 3.0]), bool(n.max() < 10)
+        (True, True)
+        >>> np.allclose(vectorized_newton(lambda x, c: x**2 - c, None, 0.0, 3.0, 0.0, 1e-12, args=(c,))[0], roots)
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Newton%27s_method
+
+    """
+
+    shape, (a, b, x0, *args) = _broadcast_lanes(a, b, x0, *args)
+
+    fa = f(a, *args)
+    fb = f(b, *args)
+
+    if np.any(fa * fb > 0):
+        raise DifferentSignsError()
+
+    x = np.where((x0 > np.minimum(a, b)) & (x0 < np.maximum(a, b)), x0, (a + b) / 2.0)
+    x = np.where(fb == 0.0, b, np.where(fa == 0.0, a, x))
+    n = np.zeros(x.shape, dtype=int)
+    active = np.flatnonzero((fa != 0.0) & (fb != 0.0))
+
+    while active.size and n.max() < max_iter:
+        xa = x[active]
+        lane_args = [arg[active] for arg in args]
+        if df is None:
+            fx, dfx = value_and_derivative(f, xa, *lane_args)
+        else:
+            fx, dfx = f(xa, *lane_args), df(xa, *lane_args)
+
+        left = fa[active] * fx < 0
+        b[active[left]] = xa[left]
+        a[active[~left]] = xa[~left]
+        fa[active[~left]] = fx[~left]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x1 = xa - fx / dfx
+
+        converged = (np.abs(x1 - xa) <= eps) | (fx == 0.0)
+        x1[fx == 0.0] = xa[fx == 0.0]
+
+        lo, hi = np.minimum(a[active], b[active]), np.maximum(a[active], b[active])
+        outside = ~converged & (~np.isfinite(x1) | (x1 <= lo) | (x1 >= hi))
+        x1[outside] = (lo[outside] + hi[outside]) / 2.0
+
+        x[active] = x1
+        n[active] += 1
+        active = active[~converged & (hi - lo > eps)]
+
+    return x.reshape(shape), n.reshape(shape)
+
+
+def _refine_sign_change(task: tuple) -> (float, bool):
+    """Refine one sign change bracket, given with the values of f at its ends, and tell a root from a pole."""
+
+    f, a, b, fa, fb, eps, args = task
+    result = brent(lambda x: f(x, *args), a, b, eps, cache={a: fa, b: fb})
+
+    return result.root, bool(abs(f(result.root, *args)) <= min(abs(fa), abs(fb)))
+
+
+def _refine_tangent(task: tuple) -> (float, float):
+    """Refine one local minimum of |f| with the golden section search."""
+
+    f, a, b, eps, args = task
+    ratio = (np.sqrt(5.0) - 1.0) / 2.0
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    fc, fd = abs(f(c, *args)), abs(f(d, *args))
+
+    while b - a > eps:
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - ratio * (b - a)
+            fc = abs(f(c, *args))
+        else:
+            a, c, fc = c, d, fd
+            d = a + ratio * (b - a)
+            fd = abs(f(d, *args))
+
+    x = (a + b) / 2.0
+
+    return x, abs(f(x, *args))
+
+
+def find_all_roots(
+    f: Callable[..., np.ndarray],
+    a: float,
+    b: float,
+    n: int,
+    eps: float,
+    args: Sequence = (),
+    tangent_tol: float = 1e-8,
+    max_workers: Optional[int] = None,
+    parallel: bool = True,
+) -> RootEnumeration:
+    """
+    Find all roots of a function on an interval.
+
+    The interval is split into n subintervals and f is evaluated on the whole grid at once.
+    Every sign change is refined independently with the Brent's method on a process pool;
+    a sign change where |f| grows while the bracket shrinks is a pole (e.g. of ctg) and is reported separately.
+    Local minima of |f| without a sign change are refined with the golden section search and reported
+    as tangent (even multiplicity) roots if |f| drops below tangent_tol. The roots between two samples
+    closer than the grid step may be missed, so n should resolve the distance between the roots.
+
+    Args:
+        f (Callable[..., np.ndarray]): The vectorized function f(x, *args) to find the roots of.
+            It must be picklable (a module level function or a numpy ufunc) if parallel is True.
+        a (float): The lower bound of the interval.
+        b (float): The upper bound of the interval.
+        n (int): The number of subintervals of the sweep.
+        eps (float): The precision of the roots.
+        args (Sequence): The additional arguments of the function.
+        tangent_tol (float): The maximum |f| at a local minimum to be reported as a tangent root.
+        max_workers (Optional[int]): The number of worker processes, by default the number of processors.
+        parallel (bool): Refine the brackets on a process pool; otherwise in the current process.
+
+    Returns:
+        RootEnumeration: The sorted roots, tangent roots and poles.
+
+    Raises:
+        ValueError: The number of subintervals must be greater than zero.
+
+    Doctests:
+        >>> np.round(find_all_roots(np.sin, 1.0, 10.0, 100, 1e-12).roots / np.pi, 12).tolist()
+        [1.0, 2.0, 3.0]
+        >>> enumeration = find_all_roots(np.tan, 1.0, 5.0, 100, 1e-12)
+        >>> np.round(enumeration.roots / np.pi, 12).tolist(), np.round(enumeration.poles / np.pi, 12).tolist()
+        ([1.0], [0.5, 1.5])
+        >>> np.round(find_all_roots(lambda x: np.sin(x) ** 2, 1.0, 5.0, 100, 1e-12, parallel=False).tangent_roots, 6)
+        array([3.141593])
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Root-finding_algorithms#Finding_roots_in_an_interval
+
+    """
+
+    if n <= 0:
+        raise ValueError("The number of subintervals must be greater than zero.")
+
+    x = np.linspace(a, b, n + 1)
+    y = np.asarray(f(x, *args), dtype=float)
+    sign = np.sign(y)
+    finite = np.isfinite(y)
+
+    exact = x[y == 0.0]
+    change = np.flatnonzero((sign[:-1] * sign[1:] < 0) & ~np.isnan(y[:-1]) & ~np.isnan(y[1:]))
+
+    middle = np.abs(y[1:-1])
+    tangent = 1 + np.flatnonzero(
+        finite[1:-1]
+        & (middle <= np.abs(y[:-2]))
+        & (middle < np.abs(y[2:]))
+        & (sign[:-2] == sign[1:-1])
+        & (sign[1:-1] == sign[2:])
+        & (sign[1:-1] != 0.0)
+    )
+
+    sign_tasks = [(f, x[i], x[i + 1], y[i], y[i + 1], eps, tuple(args)) for i in change]
+    tangent_tasks = [(f, x[i - 1], x[i + 1], eps, tuple(args)) for i in tangent]
+
+    if parallel and sign_tasks + tangent_tasks:
+        chunksize = max(1, len(sign_tasks) // (4 * (max_workers or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            refined = list(executor.map(_refine_sign_change, sign_tasks, chunksize=chunksize))
+            minima = list(executor.map(_refine_tangent, tangent_tasks, chunksize=chunksize))
+    else:
+        refined = [_refine_sign_change(task) for task in sign_tasks]
+        minima = [_refine_tangent(task) for task in tangent_tasks]
+
+    return RootEnumeration(
+        roots=np.sort(np.concatenate([exact, [root for root, is_root in refined if is_root]])),
+        tangent_roots=np.sort(np.array([root for root, value in minima if value <= tangent_tol], dtype=float)),
+        poles=np.sort(np.array([root for root, is_root in refined if not is_root], dtype=float)),
+    )
+
+
+def well_equation(x: np.ndarray, k: float) -> np.ndarray:
+    """The energy equation ctg(k * sqrt(1 - x)) = sqrt(1/x - 1) for the well depth k (picklable)."""
+
+    return 1.0 / np.tan(k * np.sqrt(1.0 - x)) - np.sqrt(1.0 / x - 1.0)
+
+
 if __name__ == "__main__":
     print(
         "Find energy of 1/2*Psi(x)'' + U(x)*Psi(x) = E*Psi(x) for the potential U(x) = -U_0, x < a and U(x) = 0, x > a."
@@ -138,11 +835,16 @@ if __name__ == "__main__":
     )
     newton_answer = newton(
         lambda x: 1.0 / np.tan(np.sqrt(1.0 - x)) - np.sqrt(1.0 / x - 1.0),
-        lambda x: 1.0 / (2.0 * np.tan(np.sqrt(1.0 - x)) ** 2 * np.sqrt(1.0 - x))
-        + 1.0 / (2.0 * np.sqrt(x**3) * (1.0 - x)),
+        None,
         0.5,
         1e-10,
     )
+    brent_answer = brent(
+        lambda x: 1.0 / np.tan(np.sqrt(1.0 - x)) - np.sqrt(1.0 / x - 1.0),
+        0.0 + 1e-5,
+        1.0 - 1e-5,
+        1e-10,
+    )
     simple_iteration_answer = simple_iteration(
         lambda x: 1.0 / np.tan(np.sqrt(1.0 - x)) - np.sqrt(1.0 / x - 1.0),
         0.7,
@@ -151,6 +853,31 @@ if __name__ == "__main__":
     )
     print(f"Dihotomy method: {dihotomy_answer[0]}", f"Number of iterations: {dihotomy_answer[1]}")
     print(f"Newton's method: {newton_answer[0]}", f"Number of iterations: {newton_answer[1]}")
+    print(
+        f"Brent's method: {brent_answer.root}",
+        f"Number of iterations: {brent_answer.iterations}",
+        f"Number of evaluations: {brent_answer.evaluations}",
+    )
     print(
         f"Simple iteration method: {simple_iteration_answer[0]}", f"Number of iterations: {simple_iteration_answer[1]}"
     )
+    print()
+
+    print("Solve ctg(k * sqrt(1 - x)) = sqrt(1/x - 1) for 1000 well depths k = 0.5, ..., 3:")
+    depths = np.linspace(0.5, 3.0, 1000)
+    vectorized_answer = vectorized_newton(
+        lambda x, k: 1.0 / np.tan(k * np.sqrt(1.0 - x)) - np.sqrt(1.0 / x - 1.0),
+        None,
+        0.0 + 1e-5,
+        1.0 - 1e-5,
+        0.5,
+        1e-10,
+        args=(depths,),
+    )
+    print(f"Vectorized Newton's method: {vectorized_answer[0][::200]}", f"Max iterations: {vectorized_answer[1].max()}")
+    print()
+
+    print("Find all roots of ctg(k * sqrt(1 - x)) = sqrt(1/x - 1) for k = 50:")
+    enumeration = find_all_roots(well_equation, 0.0 + 1e-5, 1.0 - 1e-5, 10000, 1e-12, args=(50.0,))
+    print(f"Roots: {enumeration.roots}")
+    print(f"Poles: {enumeration.poles}")
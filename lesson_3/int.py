@@ -2,11 +2,61 @@
 Documenation: https://en.wikipedia.org/wiki/Numerical_integration
 """
 
-from typing import Callable
+import heapq
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional, Sequence, Union
 
 import numpy as np
 
 
+class QuadratureResult(NamedTuple):
+    """The result of an integrator with error control."""
+
+    integral: float
+    error: float
+    evaluations: int
+
+
+# Gauss-Kronrod 7-15 nodes on [-1, 1], Kronrod weights and the embedded Gauss weights (zero at Kronrod-only nodes).
+_KRONROD_NODES = np.array(
+    [
+        0.991455371120812639206854697526329,
+        0.949107912342758524526189684047851,
+        0.864864423359769072789712788640926,
+        0.741531185599394439863864773280788,
+        0.586087235467691130294144845693013,
+        0.405845151377397166906606412076961,
+        0.207784955007898467600689403773245,
+    ]
+)
+_KRONROD_NODES = np.concatenate([-_KRONROD_NODES, [0.0], _KRONROD_NODES[::-1]])
+_KRONROD_WEIGHTS = np.array(
+    [
+        0.022935322010529224963732008058970,
+        0.063092092629978553290700663189204,
+        0.104790010322250183839876322541518,
+        0.140653259715525918745189590510238,
+        0.169004726639267902826583426598550,
+        0.190350578064785409913256402421014,
+        0.204432940075298892414161999234649,
+    ]
+)
+_KRONROD_WEIGHTS = np.concatenate([_KRONROD_WEIGHTS, [0.209482141084727828012999174891714], _KRONROD_WEIGHTS[::-1]])
+_GAUSS_WEIGHTS = np.array(
+    [0.129484966168869693270611432679082, 0.279705391489276667901467771423780, 0.381830050505118944950369775488975]
+)
+_GAUSS_WEIGHTS = np.concatenate(
+    [
+        np.stack([np.zeros(3), _GAUSS_WEIGHTS], axis=1).reshape(-1),
+        [0.0, 0.417959183673469387755102040816327, 0.0],
+        np.stack([_GAUSS_WEIGHTS[::-1], np.zeros(3)], axis=1).reshape(-1),
+    ]
+)
+
+
 def trapezoid_integrate(f: Callable[[float], float], a: float, b: float, n: int) -> float:
     """Integrate a function using the trapezoid rule.
 
@@ -89,6 +139,533 @@ def simpson_integrate(f: Callable[[float], float], a: float, b: float, n: int) -
     return integral
 
 
+def _trapezoid_rule(a: float, b: float, n: int) -> (np.ndarray, np.ndarray):
+    """Get the nodes and the weights of the composite trapezoid rule with n trapezoids."""
+
+    if n <= 0:
+        raise ValueError("The number of trapezoids must be greater than zero.")
+
+    nodes = np.linspace(a, b, n + 1)
+    weights = np.full(n + 1, (b - a) / n)
+    weights[[0, -1]] /= 2.0
+
+    return nodes, weights
+
+
+def _simpson_rule(a: float, b: float, n: int) -> (np.ndarray, np.ndarray):
+    """Get the nodes and the weights of the composite Simpson's rule with n intervals (2n + 1 nodes)."""
+
+    if n <= 0 or n % 2 != 0:
+        raise ValueError("The number of trapezoids must be greater than zero and even.")
+
+    nodes = np.linspace(a, b, 2 * n + 1)
+    weights = np.full(2 * n + 1, (b - a) / n / 3.0)
+    weights[1::2] *= 2.0
+    weights[[0, -1]] /= 2.0
+
+    return nodes, weights
+
+
+def _integrate_with_weights(
+    f: Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]],
+    nodes: np.ndarray,
+    weights: np.ndarray,
+    args: Sequence = (),
+) -> Union[float, np.ndarray]:
+    """Evaluate the integrand(s) once on all nodes and apply the quadrature weights as a dot product."""
+
+    if callable(f):
+        values = np.asarray(f(nodes, *args), dtype=float)
+    else:
+        values = np.stack([np.broadcast_to(np.asarray(g(nodes, *args), dtype=float), nodes.shape) for g in f])
+
+    integral = np.broadcast_to(values, values.shape[:-1] + nodes.shape) @ weights
+
+    return integral[()] if np.ndim(integral) == 0 else integral
+
+
+def vectorized_trapezoid_integrate(
+    f: Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]],
+    a: float,
+    b: float,
+    n: int,
+    args: Sequence = (),
+) -> Union[float, np.ndarray]:
+    """Integrate a function using the trapezoid rule with a single vectorized evaluation.
+
+    The function is called once on the array of all n + 1 nodes. It may return an array
+    whose last axis runs over the nodes (e.g. an integrand with a parameter axis), or a sequence
+    of functions may be given; the integrals of the whole batch are computed in one call.
+
+    Args:
+        f (Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]]): The vectorized function
+            f(x, *args) to integrate, or a sequence of such functions.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        n (int): The number of trapezoids to use.
+        args (Sequence): The additional arguments of the function.
+
+    Returns:
+        Union[float, np.ndarray]: The integral of the function from a to b, or the array of integrals for a batch.
+
+    Raises:
+        ValueError: The number of trapezoids must be greater than zero.
+
+    Doctests:
+        >>> abs(vectorized_trapezoid_integrate(np.exp, 0.0, 1.0, 1000) - (np.e - 1.0)) < 1e-6
+        True
+        >>> vectorized_trapezoid_integrate(lambda x, p: x**p, 0.0, 1.0, 4, args=(np.array([[0.0], [1.0]]),))
+        array([1. , 0.5])
+        >>> vectorized_trapezoid_integrate([lambda x: 1.0, lambda x: 2 * x], 0.0, 1.0, 4)
+        array([1., 1.])
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Trapezoidal_rule
+
+    """
+
+    return _integrate_with_weights(f, *_trapezoid_rule(a, b, n), args)
+
+
+def vectorized_simpson_integrate(
+    f: Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]],
+    a: float,
+    b: float,
+    n: int,
+    args: Sequence = (),
+) -> Union[float, np.ndarray]:
+    """Integrate a function using Simpson's rule with a single vectorized evaluation.
+
+    Unlike simpson_integrate, every node is evaluated once: 2n + 1 values instead of 3n.
+    The function is called once on the array of all nodes, see vectorized_trapezoid_integrate for batches.
+
+    Args:
+        f (Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]]): The vectorized function
+            f(x, *args) to integrate, or a sequence of such functions.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        n (int): The number of trapezoids to use.
+        args (Sequence): The additional arguments of the function.
+
+    Returns:
+        Union[float, np.ndarray]: The integral of the function from a to b, or the array of integrals for a batch.
+
+    Raises:
+        ValueError: The number of trapezoids must be greater than zero and even.
+
+    Doctests:
+        >>> abs(vectorized_simpson_integrate(np.exp, 0.0, 1.0, 100) - simpson_integrate(np.exp, 0.0, 1.0, 100)) < 1e-14
+        True
+        >>> vectorized_simpson_integrate(lambda x, p: x**p, 0.0, 1.0, 2, args=(np.array([[2.0], [3.0]]),))
+        array([0.33333333, 0.25      ])
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Simpson%27s_rule
+
+    """
+
+    return _integrate_with_weights(f, *_simpson_rule(a, b, n), args)
+
+
+@lru_cache(maxsize=64)
+def gauss_legendre_rule(n: int) -> (np.ndarray, np.ndarray):
+    """Get the nodes and the weights of the n-point Gauss-Legendre rule on [-1, 1].
+
+    The rule is exact for polynomials of degree 2n - 1. The rules are computed once per order
+    and kept in a bounded LRU cache; the returned arrays are read-only.
+
+    Args:
+        n (int): The number of nodes.
+
+    Returns:
+        np.ndarray: The nodes.
+        np.ndarray: The weights.
+
+    Raises:
+        ValueError: The number of nodes must be greater than zero.
+
+    Doctests:
+        >>> gauss_legendre_rule(2)[0] * np.sqrt(3.0)
+        array([-1.,  1.])
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Gauss%E2%80%93Legendre_quadrature
+    """
+
+    if n <= 0:
+        raise ValueError("The number of nodes must be greater than zero.")
+
+    nodes, weights = np.polynomial.legendre.leggauss(n)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+
+    return nodes, weights
+
+
+@lru_cache(maxsize=64)
+def gauss_lobatto_rule(n: int) -> (np.ndarray, np.ndarray):
+    """Get the nodes and the weights of the n-point Gauss-Lobatto rule on [-1, 1].
+
+    The nodes include the ends of the interval, so the composite rule shares them between panels.
+    The rule is exact for polynomials of degree 2n - 3. The rules are cached as in gauss_legendre_rule.
+
+    Args:
+        n (int): The number of nodes.
+
+    Returns:
+        np.ndarray: The nodes.
+        np.ndarray: The weights.
+
+    Raises:
+        ValueError: The number of nodes must be at least two.
+
+    Doctests:
+        >>> gauss_lobatto_rule(3)
+        (array([-1.,  0.,  1.]), array([0.33333333, 1.33333333, 0.33333333]))
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Gaussian_quadrature#Gauss%E2%80%93Lobatto_rules
+    """
+
+    if n < 2:
+        raise ValueError("The number of nodes must be at least two.")
+
+    legendre = np.polynomial.legendre.Legendre.basis(n - 1)
+    derivative, second_derivative = legendre.deriv(), legendre.deriv(2)
+
+    interior = np.sort(derivative.roots().real)
+    for _ in range(2):
+        interior -= derivative(interior) / second_derivative(interior)
+
+    nodes = np.concatenate([[-1.0], interior, [1.0]])
+    weights = 2.0 / (n * (n - 1) * legendre(nodes) ** 2)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+
+    return nodes, weights
+
+
+def _composite_rule(rule: (np.ndarray, np.ndarray), a: float, b: float, panels: int) -> (np.ndarray, np.ndarray):
+    """Map a rule on [-1, 1] onto equal panels of [a, b], merging the nodes shared by adjacent panels."""
+
+    if panels <= 0:
+        raise ValueError("The number of panels must be greater than zero.")
+
+    edges = np.linspace(a, b, panels + 1)
+    center, half = (edges[:-1] + edges[1:]) / 2.0, (edges[1:] - edges[:-1]) / 2.0
+    nodes = center[:, None] + half[:, None] * rule[0]
+    weights = half[:, None] * rule[1]
+
+    if rule[0][0] != -1.0 or panels == 1:
+        return nodes.reshape(-1), weights.reshape(-1)
+
+    shared = weights[:, :-1].copy()
+    shared[1:, 0] += weights[:-1, -1]
+
+    return np.append(nodes[:, :-1], b), np.append(shared, weights[-1, -1])
+
+
+def gauss_legendre_integrate(
+    f: Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]],
+    a: float,
+    b: float,
+    n: int,
+    panels: int = 1,
+    args: Sequence = (),
+) -> Union[float, np.ndarray]:
+    """Integrate a function using the composite Gauss-Legendre rule.
+
+    For smooth integrands the error decays exponentially with n, so tens of nodes reach
+    the accuracy the trapezoid rule needs thousands for. f is called once on all nodes;
+    batches are handled as in vectorized_trapezoid_integrate.
+
+    Args:
+        f (Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]]): The vectorized function
+            f(x, *args) to integrate, or a sequence of such functions.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        n (int): The number of nodes per panel.
+        panels (int): The number of equal panels.
+        args (Sequence): The additional arguments of the function.
+
+    Returns:
+        Union[float, np.ndarray]: The integral of the function from a to b, or the array of integrals for a batch.
+
+    Raises:
+        ValueError: The number of nodes and of panels must be greater than zero.
+
+    Doctests:
+        >>> j0 = gauss_legendre_integrate(lambda t: np.cos(np.sin(t)), 0.0, np.pi, 20) / np.pi
+        >>> abs(j0 - 0.7651976865579666) < 1e-15
+        True
+        >>> abs(gauss_legendre_integrate(lambda x: x ** (1 / 3), 0.0, 1.0, 10, panels=100) - 0.75) < 1e-4
+        True
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Gauss%E2%80%93Legendre_quadrature
+    """
+
+    return _integrate_with_weights(f, *_composite_rule(gauss_legendre_rule(n), a, b, panels), args)
+
+
+def gauss_lobatto_integrate(
+    f: Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]],
+    a: float,
+    b: float,
+    n: int,
+    panels: int = 1,
+    args: Sequence = (),
+) -> Union[float, np.ndarray]:
+    """Integrate a function using the composite Gauss-Lobatto rule.
+
+    The panel ends are nodes of the rule and are evaluated once for both adjacent panels,
+    so the composite rule needs panels * (n - 1) + 1 evaluations.
+
+    Args:
+        f (Union[Callable[..., np.ndarray], Sequence[Callable[..., np.ndarray]]]): The vectorized function
+            f(x, *args) to integrate, or a sequence of such functions.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        n (int): The number of nodes per panel.
+        panels (int): The number of equal panels.
+        args (Sequence): The additional arguments of the function.
+
+    Returns:
+        Union[float, np.ndarray]: The integral of the function from a to b, or the array of integrals for a batch.
+
+    Raises:
+        ValueError: The number of nodes must be at least two and the number of panels greater than zero.
+
+    Doctests:
+        >>> abs(gauss_lobatto_integrate(np.exp, 0.0, 1.0, 8, panels=4) - (np.e - 1.0)) < 1e-15
+        True
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Gaussian_quadrature#Gauss%E2%80%93Lobatto_rules
+    """
+
+    return _integrate_with_weights(f, *_composite_rule(gauss_lobatto_rule(n), a, b, panels), args)
+
+
+def _chunk_sum(task: tuple) -> float:
+    """Compute the weighted sum of f over one chunk of nodes with the pairwise summation of numpy."""
+
+    f, a, h, count, start, stop, rule, args = task
+    index = np.arange(start, stop)
+    values = np.broadcast_to(np.asarray(f(a + index * h, *args), dtype=float), index.shape)
+
+    if rule == "simpson":
+        weights = np.where(index % 2 == 1, 4.0, 2.0)
+        weights[(index == 0) | (index == count - 1)] = 1.0
+        return float(np.sum(values * weights)) * h / 3.0
+
+    weights = np.where((index == 0) | (index == count - 1), 0.5, 1.0)
+    return float(np.sum(values * weights)) * h
+
+
+def chunked_integrate(
+    f: Callable[..., np.ndarray],
+    a: float,
+    b: float,
+    n: int,
+    rule: str = "trapezoid",
+    chunk_size: int = 2**20,
+    args: Sequence = (),
+    max_workers: Optional[int] = None,
+    parallel: bool = True,
+) -> float:
+    """Integrate a function using the trapezoid or Simpson's rule in chunks of constant memory.
+
+    The nodes are generated chunk by chunk (x_i = a + i * h, without accumulated drift), each chunk
+    is summed pairwise by numpy on a process pool and the partial sums are combined in the chunk order
+    with the compensated (Kahan-Neumaier) summation. The memory does not depend on n and the result
+    does not depend on the number of workers.
+
+    Args:
+        f (Callable[..., np.ndarray]): The vectorized function f(x, *args) to integrate.
+            It must be picklable (a module level function or a numpy ufunc) if parallel is True.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        n (int): The number of trapezoids to use.
+        rule (str): The rule, "trapezoid" (n + 1 nodes) or "simpson" (2n + 1 nodes as in simpson_integrate).
+        chunk_size (int): The number of nodes per chunk.
+        args (Sequence): The additional arguments of the function.
+        max_workers (Optional[int]): The number of worker processes, by default the number of processors.
+        parallel (bool): Sum the chunks on a process pool; otherwise in the current process.
+
+    Returns:
+        float: The integral of the function from a to b.
+
+    Raises:
+        ValueError: The number of trapezoids must be greater than zero (and even for Simpson's rule).
+
+    Doctests:
+        >>> abs(chunked_integrate(np.exp, 0.0, 1.0, 10**6, chunk_size=10**5) - (np.e - 1.0)) < 1e-12
+        True
+        >>> sequential = chunked_integrate(np.exp, 0.0, 1.0, 100, "simpson", chunk_size=7, parallel=False)
+        >>> sequential == chunked_integrate(np.exp, 0.0, 1.0, 100, "simpson", chunk_size=7, max_workers=3)
+        True
+        >>> abs(sequential - (np.e - 1.0)) < 1e-10
+        True
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Kahan_summation_algorithm
+    """
+
+    if rule not in ("trapezoid", "simpson"):
+        raise ValueError("The rule must be either trapezoid or simpson.")
+
+    if n <= 0 or (rule == "simpson" and n % 2 != 0):
+        raise ValueError("The number of trapezoids must be greater than zero (and even for Simpson's rule).")
+
+    count = n + 1 if rule == "trapezoid" else 2 * n + 1
+    h = (b - a) / (count - 1)
+    tasks = (
+        (f, a, h, count, start, min(start + chunk_size, count), rule, tuple(args))
+        for start in range(0, count, chunk_size)
+    )
+
+    integral, compensation = 0.0, 0.0
+
+    def accumulate(partial_sums):
+        nonlocal integral, compensation
+        for partial_sum in partial_sums:
+            total = integral + partial_sum
+            if abs(integral) >= abs(partial_sum):
+                compensation += (integral - total) + partial_sum
+            else:
+                compensation += (partial_sum - total) + integral
+            integral = total
+
+    if not parallel:
+        accumulate(_chunk_sum(task) for task in tasks)
+        return integral + compensation
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while window := list(itertools.islice(tasks, 4 * max_workers)):
+            accumulate(executor.map(_chunk_sum, window))
+
+    return integral + compensation
+
+
+def romberg_integrate(
+    f: Callable[[np.ndarray], np.ndarray], a: float, b: float, eps: float, max_levels: int = 20
+) -> QuadratureResult:
+    """Integrate a function using the Romberg's method.
+
+    The trapezoid rule is refined on nested grids: each level halves the step and evaluates f
+    only at the new midpoints, reusing all the previous values. The Richardson extrapolation
+    of the trapezoid sums eliminates the error terms h^2, h^4, ... one by one.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): The vectorized function to integrate.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        eps (float): The precision of the integral.
+        max_levels (int): The maximum number of step halvings.
+
+    Returns:
+        QuadratureResult: The integral, the error estimate and the number of evaluations of f.
+
+    Doctests:
+        >>> result = romberg_integrate(lambda x: 1 / (1 + x**2), -1.0, 1.0, 1e-12)
+        >>> abs(result.integral - np.pi / 2) < 1e-12, result.evaluations
+        (True, 257)
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Romberg%27s_method
+
+    """
+
+    h = b - a
+    row = [h * (np.sum(np.broadcast_to(f(np.array([a, b])), 2)) / 2.0)]
+    evaluations = 2
+    error = np.inf
+
+    for level in range(1, max_levels + 1):
+        h /= 2.0
+        midpoints = a + h * np.arange(1, 2**level, 2)
+        evaluations += midpoints.size
+
+        previous, row = row, [row[0] / 2.0 + h * np.sum(np.broadcast_to(f(midpoints), midpoints.shape))]
+        for k, value in enumerate(previous, start=1):
+            row.append(row[k - 1] + (row[k - 1] - value) / (4.0**k - 1.0))
+
+        error = abs(row[-1] - previous[-1])
+        if level >= 3 and error <= eps:
+            break
+
+    return QuadratureResult(float(row[-1]), float(error), evaluations)
+
+
+def _gauss_kronrod(f: Callable[[np.ndarray], np.ndarray], intervals: np.ndarray) -> (np.ndarray, np.ndarray):
+    """Apply the Gauss-Kronrod 7-15 rule on many intervals with one evaluation of f."""
+
+    center = (intervals[:, 0] + intervals[:, 1]) / 2.0
+    half = (intervals[:, 1] - intervals[:, 0]) / 2.0
+    nodes = center[:, None] + half[:, None] * _KRONROD_NODES
+    values = np.broadcast_to(f(nodes), nodes.shape)
+
+    kronrod = half * (values @ _KRONROD_WEIGHTS)
+    gauss = half * (values @ _GAUSS_WEIGHTS)
+
+    return kronrod, np.abs(kronrod - gauss)
+
+
+def adaptive_integrate(
+    f: Callable[[np.ndarray], np.ndarray], a: float, b: float, eps: float, max_intervals: int = 1000
+) -> QuadratureResult:
+    """Integrate a function using the globally adaptive Gauss-Kronrod 7-15 rule.
+
+    The subintervals are kept in a priority queue ordered by their error estimate.
+    The worst one is bisected until the total error estimate drops below eps, so the nodes
+    concentrate near singularities (e.g. of x**(1/3) at zero) and the smooth parts cost almost nothing.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): The vectorized function to integrate.
+        a (float): The lower bound of the integral.
+        b (float): The upper bound of the integral.
+        eps (float): The precision of the integral.
+        max_intervals (int): The maximum number of subintervals.
+
+    Returns:
+        QuadratureResult: The integral, the error estimate and the number of evaluations of f.
+
+    Doctests:
+        >>> result = adaptive_integrate(lambda x: 1 / (1 + x**2), -1.0, 1.0, 1e-12)
+        >>> abs(result.integral - np.pi / 2) < 1e-12, result.evaluations
+        (True, 105)
+        >>> adaptive_integrate(lambda x: x ** (1 / 3), 0.0, 1.0, 1e-10).integral - 0.75 < 1e-10
+        True
+
+    Documenation:
+        https://en.wikipedia.org/wiki/Adaptive_quadrature
+
+    """
+
+    (integral,), (error,) = _gauss_kronrod(f, np.array([[a, b]]))
+    queue = [(-error, a, b, integral)]
+    evaluations = _KRONROD_NODES.size
+    total_integral, total_error = integral, error
+
+    while total_error > eps and len(queue) < max_intervals:
+        error, left, right, integral = heapq.heappop(queue)
+        middle = (left + right) / 2.0
+        integrals, errors = _gauss_kronrod(f, np.array([[left, middle], [middle, right]]))
+        evaluations += 2 * _KRONROD_NODES.size
+
+        total_integral += integrals.sum() - integral
+        total_error += errors.sum() + error
+        heapq.heappush(queue, (-errors[0], left, middle, integrals[0]))
+        heapq.heappush(queue, (-errors[1], middle, right, integrals[1]))
+
+    total_integral = sum(item[3] for item in queue)
+    total_error = -sum(item[0] for item in queue)
+
+    return QuadratureResult(float(total_integral), float(total_error), evaluations)
+
+
 if __name__ == "__main__":
     print("Integrating 1/(1+x**2) from -1 to 1:")
     for n in [4, 8, 16, 32, 64]:
@@ -115,3 +692,21 @@ if __name__ == "__main__":
         )
         print(f"Error: {np.abs(1.29587 - simpson_integrate(lambda x: x**(1/3)*np.exp(np.sin(x)), 0.0, 1.0, n)):.5}")
         print()
+
+    print("Integrating x**(1/3)*np.exp(np.sin(x)) from 0 to 1 with one vectorized call:")
+    for n in [10**4, 10**6]:
+        print(f"n = {n}")
+        print(
+            f"vectorized_simpson_integrate(lambda x: x**(1/3)*np.exp(np.sin(x)), 0.0, 1.0, {n}) = {vectorized_simpson_integrate(lambda x: x**(1/3)*np.exp(np.sin(x)), 0.0, 1.0, n):.10}"  # noqa: E501
+        )
+        print()
+
+    print("Integrating with error control to 1e-10:")
+    for name, integrate in [("romberg_integrate", romberg_integrate), ("adaptive_integrate", adaptive_integrate)]:
+        result = integrate(lambda x: 1 / (1 + x**2), -1.0, 1.0, 1e-10)
+        print(f"{name}(lambda x: 1/(1+x**2), -1.0, 1.0) = {result.integral:.12}, evaluations: {result.evaluations}")
+        result = integrate(lambda x: x ** (1 / 3) * np.exp(np.sin(x)), 0.0, 1.0, 1e-10)
+        print(
+            f"{name}(lambda x: x**(1/3)*np.exp(np.sin(x)), 0.0, 1.0) = {result.integral:.12}, evaluations: {result.evaluations}"  # noqa: E501
+        )
+    print()
@@ -1,10 +1,20 @@
-from typing import Callable
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional
 
 import numpy as np
 
+from lesson_1.ulp import get_float_format  # pylint: disable=import-error
 from lesson_3.int import trapezoid_integrate  # pylint: disable=import-error
 
 
+class DerivativeResult(NamedTuple):
+    """The derivative computed by finite differences with its error estimate."""
+
+    derivative: np.ndarray
+    error: np.ndarray
+    step: np.ndarray
+
+
 def finite_difference(f: Callable[[float], float], x: float, h: float) -> float:
     """Compute the finite difference of a function at a point.
 
@@ -35,6 +45,131 @@ def finite_difference(f: Callable[[float], float], x: float, h: float) -> float:
     return (f(x + h) - f(x - h)) / 2 / h
 
 
+@lru_cache(maxsize=64)
+def stencil_coefficients(order: int, offsets: tuple) -> np.ndarray:
+    """Compute the finite difference coefficients of a derivative on an arbitrary stencil.
+
+    The coefficients c_j give f^(order)(x) ~ sum_j c_j * f(x + offsets_j * h) / h^order
+    and are computed by the Fornberg's algorithm, once per stencil.
+
+    Args:
+        order (int): The order of the derivative.
+        offsets (tuple): The offsets of the stencil nodes in units of the step.
+
+    Returns:
+        np.ndarray: The coefficients of the stencil (read-only).
+
+    Raises:
+        ValueError: The stencil must have more nodes than the order of the derivative.
+
+    Doctests:
+        >>> stencil_coefficients(1, (-1, 0, 1)).tolist()
+        [-0.5, 0.0, 0.5]
+        >>> (stencil_coefficients(2, (-2, -1, 0, 1, 2)) * 12).tolist()
+        [-1.0, 16.0, -30.0, 16.0, -1.0]
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Finite_difference_coefficient
+    """
+
+    if order < 0 or len(offsets) <= order:
+        raise ValueError("The stencil must have more nodes than the order of the derivative.")
+
+    nodes = np.asarray(offsets, dtype=float)
+    weights = np.zeros((len(nodes), order + 1))
+    weights[0, 0] = 1.0
+    c1 = 1.0
+
+    for i in range(1, len(nodes)):
+        c2 = 1.0
+        for j in range(i):
+            c3 = nodes[i] - nodes[j]
+            c2 *= c3
+            for k in range(min(i, order), -1, -1):
+                previous = weights[i - 1, k - 1] if k > 0 else 0.0
+                weights[i, k] = c1 * (k * previous - nodes[i - 1] * weights[i - 1, k]) / c2
+            for k in range(min(i, order), -1, -1):
+                previous = weights[j, k - 1] if k > 0 else 0.0
+                weights[j, k] = (nodes[i] * weights[j, k] - k * previous) / c3
+        c1 = c2
+
+    coefficients = weights[:, order].copy()
+    coefficients.flags.writeable = False
+
+    return coefficients
+
+
+def differentiate(
+    f: Callable[[np.ndarray], np.ndarray],
+    x: np.ndarray,
+    order: int = 1,
+    accuracy: int = 2,
+    h: Optional[float] = None,
+    levels: int = 3,
+) -> DerivativeResult:
+    """Compute the derivative of a function on an array of points by central finite differences.
+
+    The central stencil of the given accuracy is evaluated at the steps h, h/2, ..., h/2^(levels - 1)
+    with a single vectorized call of f, and the results are combined by the Richardson extrapolation.
+    By default the step is chosen from the machine epsilon of the points' type (see lesson_1)
+    to balance the truncation and the roundoff errors. The error estimate is conservative: it is the change
+    made by the last extrapolation step plus the roundoff bound.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): The vectorized function to differentiate.
+        x (np.ndarray): The points at which to differentiate.
+        order (int): The order of the derivative.
+        accuracy (int): The (even) order of accuracy of the stencil.
+        h (Optional[float]): The largest step, chosen automatically by default.
+        levels (int): The number of steps of the Richardson extrapolation, at least two for the error estimate.
+
+    Returns:
+        DerivativeResult: The derivative, its error estimate and the step used at every point.
+
+    Raises:
+        ValueError: The accuracy must be a positive even number and the number of levels at least two.
+
+    Doctests:
+        >>> x = np.linspace(0.0, 2 * np.pi, 5)
+        >>> result = differentiate(np.sin, x)
+        >>> error = np.abs(result.derivative - np.cos(x))
+        >>> bool(np.max(error) < 1e-12), bool(np.all(error <= result.error))
+        (True, True)
+        >>> bool(abs(differentiate(np.exp, 1.0, order=2, accuracy=4).derivative - np.e) < 1e-9)
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Richardson_extrapolation
+    """
+
+    if accuracy <= 0 or accuracy % 2 != 0 or levels < 2:
+        raise ValueError("The accuracy must be a positive even number and the number of levels at least two.")
+
+    x = np.asarray(x, dtype=float)
+    half_width = (order + 1) // 2 + accuracy // 2 - 1
+    offsets = tuple(range(-half_width, half_width + 1))
+    coefficients = stencil_coefficients(order, offsets)
+
+    if h is None:
+        eps = get_float_format(x.dtype.type).machine_epsilon
+        h = eps ** (1.0 / (order + accuracy + 2 * (levels - 1))) * np.maximum(np.abs(x), 1.0)
+
+    steps = np.asarray(h, dtype=float)[..., None] / 2.0 ** np.arange(levels)
+    points = x[..., None, None] + steps[..., None] * np.asarray(offsets, dtype=float)
+    values = np.asarray(f(points), dtype=float)
+
+    table = [values @ coefficients / steps**order]
+    for j in range(1, levels):
+        factor = 2.0 ** (accuracy + 2 * (j - 1)) - 1.0
+        table.append(table[-1][..., 1:] + (table[-1][..., 1:] - table[-1][..., :-1]) / factor)
+
+    derivative = table[-1][..., -1]
+    roundoff = np.finfo(float).eps * np.max(np.abs(values), axis=(-2, -1)) * np.sum(np.abs(coefficients))
+    truncation = np.abs(derivative - table[-2][..., -1])
+
+    return DerivativeResult(derivative, truncation + roundoff / steps[..., -1] ** order, steps[..., -1])
+
+
 def bessel_j(n: int, x: float, h: float) -> float:
     """Compute the Bessel function of the first kind.
 
@@ -88,12 +223,144 @@ def bessel_j_prime(n: int, x: float, h: float) -> float:
     return finite_difference(lambda x: bessel_j(n, x, h), x, h)
 
 
+@lru_cache(maxsize=16)
+def _theta_table(m: int) -> (np.ndarray, np.ndarray, np.ndarray):
+    """Get theta, sin(theta) and the trapezoid weights on [0, pi] with m intervals (cached per resolution)."""
+
+    theta = np.linspace(0.0, np.pi, m + 1)
+    weights = np.full(m + 1, np.pi / m)
+    weights[[0, -1]] /= 2.0
+
+    for table in (theta, weights):
+        table.flags.writeable = False
+    sin_theta = np.sin(theta)
+    sin_theta.flags.writeable = False
+
+    return theta, sin_theta, weights
+
+
+def vectorized_bessel_j(n: np.ndarray, x: np.ndarray, h: float, block_size: int = 2**22) -> np.ndarray:
+    """Compute the Bessel function of the first kind on arrays of orders and points.
+
+    The same integral representation and trapezoid rule as in bessel_j are used, but theta, sin(theta)
+    and the weights are computed once per step size and cos(x * sin(theta) - n * theta) is evaluated
+    as a broadcast array, in blocks of at most block_size elements.
+
+    Args:
+        n (np.ndarray): The orders of the Bessel function, broadcast against x.
+        x (np.ndarray): The points at which to evaluate the Bessel function.
+        h (float): The step size.
+        block_size (int): The maximum number of elements of the intermediate array.
+
+    Returns:
+        np.ndarray: The Bessel function of order n at the points x.
+
+    Raises:
+        ValueError: The order of the Bessel function must be a non-negative integer.
+
+    Doctests:
+        >>> j = vectorized_bessel_j(np.array([[0], [1]]), np.array([1.0, 2.0]), 1e-3)
+        >>> bool(abs(j[0, 1] - bessel_j(0, 2.0, 1e-3)) < 1e-14), j.shape
+        (True, (2, 2))
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Bessel_function#Bessel's_integrals
+    """
+
+    n, x = np.broadcast_arrays(np.asarray(n), np.asarray(x, dtype=float))
+
+    if np.any(n < 0):
+        raise ValueError("The order of the Bessel function must be a non-negative integer.")
+
+    theta, sin_theta, weights = _theta_table(int(np.pi / h))
+    n_flat, x_flat = n.reshape(-1), x.reshape(-1)
+    result = np.empty(x_flat.shape)
+    step = max(1, block_size // theta.size)
+
+    for start in range(0, x_flat.size, step):
+        block = slice(start, start + step)
+        phase = np.multiply.outer(x_flat[block], sin_theta) - np.multiply.outer(n_flat[block], theta)
+        result[block] = np.cos(phase, out=phase) @ weights / np.pi
+
+    return result.reshape(x.shape)
+
+
+def bessel_j_miller(n: int, x: np.ndarray) -> np.ndarray:
+    """Compute the Bessel functions of the first kind of all orders 0, 1, ..., n by the Miller's algorithm.
+
+    The recurrence J_{k-1}(x) = 2k / x * J_k(x) - J_{k+1}(x) is stable downwards, so it is started
+    from arbitrary values at a high enough order and normalized by J_0 + 2 * (J_2 + J_4 + ...) = 1.
+    All orders come out of one sweep, vectorized over the points x.
+
+    Args:
+        n (int): The highest order of the Bessel function.
+        x (np.ndarray): The points at which to evaluate the Bessel functions.
+
+    Returns:
+        np.ndarray: The array of shape (n + 1,) + x.shape with J_0(x), ..., J_n(x).
+
+    Raises:
+        ValueError: The order of the Bessel function must be a non-negative integer.
+
+    Doctests:
+        >>> j = bessel_j_miller(3, np.array([0.0, 1.0, 10.0]))
+        >>> np.round(j[:, 1], 12).tolist()
+        [0.765197686558, 0.440050585745, 0.114903484932, 0.019563353983]
+        >>> bool(abs(j[0, 2] + 0.245935764451348) < 1e-14), j[:, 0].tolist()
+        (True, [1.0, 0.0, 0.0, 0.0])
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Bessel_function#Recurrence_relations
+    """
+
+    if n < 0:
+        raise ValueError("The order of the Bessel function must be a non-negative integer.")
+
+    x = np.asarray(x, dtype=float)
+    top = max(n, int(np.ceil(np.max(np.abs(x), initial=0.0))))
+    top = 2 * ((top + int(np.sqrt(40.0 * top)) + 10) // 2)
+
+    nonzero = x != 0.0
+    z = np.where(nonzero, x, 1.0)
+    result = np.zeros((n + 1,) + x.shape)
+    previous, current = np.zeros(x.shape), np.full(x.shape, 1e-30)
+    norm = np.zeros(x.shape)
+
+    for k in range(top, 0, -1):
+        previous, current = current, 2.0 * k / z * current - previous
+        if (k - 1) % 2 == 0:
+            norm += current if k == 1 else 2.0 * current
+        if k - 1 <= n:
+            result[k - 1] = current
+
+        overflow = np.abs(current) > 1e200
+        if np.any(overflow):
+            scale = np.where(overflow, 1e-200, 1.0)
+            previous, current, norm = previous * scale, current * scale, norm * scale
+            result[k - 1 :] *= scale
+
+    result /= norm
+    result[:, ~nonzero] = 0.0
+    result[0, ~nonzero] = 1.0
+
+    return result
+
+
 if __name__ == "__main__":
     print("Demonstrate the fulfillment of equality J'0(x) + J1(x) = 0 for x = [0, 2*np.pi]:")
+    x = np.linspace(0.0, 2 * np.pi, 10)
     for h in [1e-1, 1e-2, 1e-3, 1e-4, 1e-5]:
         print(f"h = {h}")
-        for x in np.linspace(0.0, 2 * np.pi, 10):
-            print(
-                f"bessel_j_prime(0, {x}, {h}) + bessel_j(1, {x}, {h}) = {bessel_j_prime(0, x, h) + bessel_j(1, x, h)}"
-            )
+        residual = finite_difference(lambda x: vectorized_bessel_j(0, x, h), x, h) + vectorized_bessel_j(1, x, h)
+        for x_k, residual_k in zip(x, residual):
+            print(f"bessel_j_prime(0, {x_k}, {h}) + bessel_j(1, {x_k}, {h}) = {residual_k}")
         print()
+
+    print("With the automatic step and the Richardson extrapolation (h = 1e-3 for the integral):")
+    result = differentiate(lambda x: vectorized_bessel_j(0, x, 1e-3), x)
+    for x_k, residual_k, error_k in zip(x, result.derivative + vectorized_bessel_j(1, x, 1e-3), result.error):
+        print(f"J'0({x_k}) + J1({x_k}) = {residual_k}, error estimate = {error_k}")
+    print()
+
+    print("Compare with the Miller's backward recurrence for the orders 0, 1:")
+    print(f"max |J - J_miller| = {np.max(np.abs(vectorized_bessel_j([[0], [1]], x, 1e-3) - bessel_j_miller(1, x)))}")
@@ -4,6 +4,8 @@ Documentation: https://en.wikipedia.org/wiki/Newton_polynomial
 
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.linalg import solve_banded
+from scipy.linalg.lapack import dptsv
 
 
 def divided_diff(x: list, y: list) -> list:
@@ -27,32 +29,43 @@ def divided_diff(x: list, y: list) -> list:
 
     """
 
-    n = len(y)
-    coef = np.zeros([n, n])
-    coef[:, 0] = y
+    x = np.asarray(x, dtype=float)
+    column = np.asarray(y, dtype=float)
+    coef = [float(column[0])]
 
-    for j in range(1, n):
-        for i in range(n - j):
-            coef[i][j] = (coef[i + 1][j - 1] - coef[i][j - 1]) / (x[i + j] - x[i])
+    for j in range(1, len(column)):
+        column = (column[1:] - column[:-1]) / (x[j:] - x[:-j])
+        coef.append(float(column[0]))
 
-    return list(coef[0])
+    return coef
 
 
-def newton_poly(coef, x_data, x):
+def newton_poly(coef, x_data, x, out=None, chunk_size=2**16):
     """
     Compute the value of the Newton's polynomial at the point x.
 
+    For an array of points the Horner's rule is applied in place chunk by chunk,
+    so the temporary memory does not depend on the number of points.
+
     Args:
         coef (list): The list of coefficients.
         x_data (list): The list of x values.
-        x (float): The point at which the value of the polynomial is computed.
+        x (float): The point (or the array of points) at which the value of the polynomial is computed.
+        out (np.ndarray): The C-contiguous float array of the shape of x to write the values to.
+        chunk_size (int): The number of points evaluated at once.
 
     Returns:
-        float: The value of the polynomial at the point x.
+        float: The value of the polynomial at the point x (the array out for an array of points).
+
+    Raises:
+        ValueError: The output buffer must be a C-contiguous float array of the shape of x.
 
     Doctests:
         >>> newton_poly([1, 1, 0], [0, 1, 2], 0.5)
         1.5
+        >>> out = np.empty(3)
+        >>> newton_poly([1, 1, 2], [0, 1, 2], np.array([0.0, 1.0, 3.0]), out=out, chunk_size=2) is out, out.tolist()
+        (True, [1.0, 2.0, 16.0])
 
     Documentation:
         https://en.wikipedia.org/wiki/Newton_polynomial
@@ -60,12 +73,463 @@ def newton_poly(coef, x_data, x):
     """
 
     n = len(x_data) - 1
-    p = coef[n]
 
-    for k in range(1, n + 1):
-        p = coef[n - k] + (x - x_data[n - k]) * p
+    if out is None and np.ndim(x) == 0:
+        p = coef[n]
+
+        for k in range(1, n + 1):
+            p = coef[n - k] + (x - x_data[n - k]) * p
+
+        return p
+
+    x = np.asarray(x, dtype=float)
+    out = np.empty(x.shape) if out is None else out
+
+    if out.shape != x.shape or out.dtype != np.float64 or not out.flags.c_contiguous:
+        raise ValueError("The output buffer must be a C-contiguous float array of the shape of x.")
+
+    x_flat, out_flat = x.reshape(-1), out.reshape(-1)
+    buffer = np.empty(min(chunk_size, x_flat.size))
+
+    for start in range(0, x_flat.size, chunk_size):
+        points, p = x_flat[start : start + chunk_size], out_flat[start : start + chunk_size]
+        tmp = buffer[: points.size]
+        p.fill(coef[n])
+
+        for k in range(1, n + 1):
+            np.subtract(points, x_data[n - k], out=tmp)
+            p *= tmp
+            p += coef[n - k]
+
+    return out
+
+
+def chebyshev_nodes(n: int, kind: int = 1, a: float = -1.0, b: float = 1.0) -> np.ndarray:
+    """
+    Compute the n + 1 Chebyshev nodes on [a, b] in ascending order.
+
+    Args:
+        n (int): The degree of the interpolating polynomial.
+        kind (int): 1 for the roots of T_{n+1} (first kind), 2 for the extrema of T_n (second kind).
+        a (float): The lower bound of the interval.
+        b (float): The upper bound of the interval.
+
+    Returns:
+        np.ndarray: The nodes.
+
+    Raises:
+        ValueError: The kind of the Chebyshev nodes must be 1 or 2.
+
+    Doctests:
+        >>> chebyshev_nodes(2, kind=2).tolist()
+        [-1.0, 0.0, 1.0]
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Chebyshev_nodes
+    """
+
+    if kind == 1:
+        nodes = -np.cos((2 * np.arange(n + 1) + 1) * np.pi / (2 * n + 2))
+    elif kind == 2:
+        nodes = -np.cos(np.arange(n + 1) * np.pi / max(n, 1))
+    else:
+        raise ValueError("The kind of the Chebyshev nodes must be 1 or 2.")
+
+    nodes[np.abs(nodes) < 1e-15] = 0.0
+
+    return (a + b) / 2.0 + (b - a) / 2.0 * nodes
+
+
+def barycentric_weights(x: list, kind: int = None) -> np.ndarray:
+    """
+    Compute the barycentric weights of the interpolation nodes.
+
+    For arbitrary nodes the O(n^2) product formula is used (with the differences scaled by 4 / (b - a)
+    against overflow); for the Chebyshev nodes of chebyshev_nodes the closed forms cost O(n).
+    The weights are defined up to a common factor, which cancels in barycentric_interpolate.
+
+    Args:
+        x (list): The list of x values.
+        kind (int): The kind of the Chebyshev nodes x, or None for arbitrary nodes.
+
+    Returns:
+        np.ndarray: The weights.
+
+    Raises:
+        ValueError: The kind of the Chebyshev nodes must be 1 or 2.
+
+    Doctests:
+        >>> barycentric_weights([0.0, 1.0, 2.0]).tolist()
+        [0.125, -0.25, 0.125]
+        >>> x = chebyshev_nodes(6)
+        >>> w = barycentric_weights(x)
+        >>> bool(np.allclose(w / w[0], barycentric_weights(x, kind=1) / barycentric_weights(x, kind=1)[0]))
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Lagrange_polynomial#Barycentric_form
+    """
+
+    x = np.asarray(x, dtype=float)
+    n = len(x) - 1
+    j = np.arange(n + 1)
+
+    if kind == 1:
+        return (-1.0) ** j * np.sin((2 * j + 1) * np.pi / (2 * n + 2))
+
+    if kind == 2:
+        weights = (-1.0) ** j
+        weights[[0, -1]] /= 2.0
+        return weights
+
+    if kind is not None:
+        raise ValueError("The kind of the Chebyshev nodes must be 1 or 2.")
+
+    differences = (x[:, None] - x[None, :]) * (4.0 / (np.ptp(x) or 1.0))
+    np.fill_diagonal(differences, 1.0)
+
+    return 1.0 / np.prod(differences, axis=1)
+
+
+def barycentric_interpolate(
+    x: list, y: np.ndarray, t: np.ndarray, weights: np.ndarray = None, chunk_size: int = 2**12
+) -> np.ndarray:
+    """
+    Evaluate the interpolating polynomial at the points t using the second (true) barycentric form.
+
+    The evaluation costs O(n) per point and is stable for any degree on Chebyshev nodes.
+    y may hold several interpolants on the same nodes (the last axis runs over the nodes):
+    all of them are evaluated as a single matrix product. The points t that coincide with a node
+    get the node value exactly.
 
-    return p
+    Args:
+        x (list): The list of x values.
+        y (np.ndarray): The y values of shape (..., len(x)).
+        t (np.ndarray): The points at which the polynomial is evaluated.
+        weights (np.ndarray): The barycentric weights, computed by barycentric_weights(x) if not given.
+        chunk_size (int): The number of points evaluated at once.
+
+    Returns:
+        np.ndarray: The values of shape y.shape[:-1] + t.shape.
+
+    Doctests:
+        >>> np.round(barycentric_interpolate([0.0, 1.0, 2.0], [1.0, 2.0, 5.0], np.array([0.5, 1.0, 3.0])), 12).tolist()
+        [1.25, 2.0, 10.0]
+        >>> x = chebyshev_nodes(20, kind=2)
+        >>> y = np.stack([np.sin(x), np.cos(x)])
+        >>> t = np.linspace(-1.0, 1.0, 7)
+        >>> values = barycentric_interpolate(x, y, t, barycentric_weights(x, kind=2))
+        >>> bool(np.allclose(values, np.stack([np.sin(t), np.cos(t)]), atol=1e-14))
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Lagrange_polynomial#Barycentric_form
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    t = np.asarray(t, dtype=float)
+    weights = barycentric_weights(x) if weights is None else np.asarray(weights, dtype=float)
+
+    t_flat = t.reshape(-1)
+    result = np.empty(y.shape[:-1] + t_flat.shape)
+
+    for start in range(0, t_flat.size, chunk_size):
+        block = slice(start, start + chunk_size)
+        c = np.subtract.outer(t_flat[block], x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(weights, c, out=c)
+            denominator = c.sum(axis=1)
+            result[..., block] = (y @ c.T) / denominator
+
+        for row in np.flatnonzero(~np.isfinite(denominator)):
+            result[..., start + row] = y[..., np.argmin(np.abs(x - t_flat[start + row]))]
+
+    return result.reshape(y.shape[:-1] + t.shape)
+
+
+class CubicSpline:
+    """
+    Interpolating cubic spline with natural, clamped or periodic boundary conditions.
+
+    The second derivatives at the nodes (moments) solve a tridiagonal system, the same one the run-through
+    method of lesson_9 solves, here by the banded LAPACK solver in O(n); the periodic system is cyclic and is
+    reduced to a tridiagonal one by the Sherman-Morrison formula. The polynomial coefficients of all intervals
+    are stored, so the evaluation is a vectorized np.searchsorted lookup followed by the Horner's rule, chunk by
+    chunk. On nearly equispaced nodes the interval is guessed arithmetically instead, and the guesses close to the
+    nodes, where they may be off by one, are looked up.
+
+    Args:
+        x (np.ndarray): The strictly increasing x values.
+        y (np.ndarray): The y values (y[0] == y[-1] for the periodic spline).
+        bc (str): The boundary conditions: "natural", "clamped" or "periodic".
+        derivatives (tuple): The first derivatives at the ends for the clamped spline.
+
+    Raises:
+        ValueError: Unknown boundary conditions, the spline needs at least two (three if periodic) nodes,
+            the ends of y differ for the periodic spline or the x values are not strictly increasing.
+
+    Doctests:
+        >>> spline = CubicSpline([0.0, 1.0, 2.0, 3.0], [0.0, 1.0, 8.0, 27.0], bc="clamped", derivatives=(0.0, 27.0))
+        >>> spline(np.array([0.5, 1.5, 2.5, 3.0])).tolist()
+        [0.125, 3.375, 15.625, 27.0]
+        >>> float(spline(1.5))
+        3.375
+        >>> x = np.cumsum(np.full(1000, 1e-3) * (1.0 + 3e-4 * np.sign(np.sin(np.arange(1000) / 50.0))))
+        >>> spline = CubicSpline(x, x**3, bc="clamped", derivatives=(3 * x[0] ** 2, 3 * x[-1] ** 2))
+        >>> t = np.linspace(x[0], x[-1], 100001)
+        >>> bool(np.max(np.abs(spline(t) - t**3)) < 1e-12)
+        True
+        >>> x = np.linspace(0.0, 2 * np.pi, 200)
+        >>> spline = CubicSpline(x, np.sin(x), bc="periodic")
+        >>> t = np.linspace(0.0, 2 * np.pi, 1000)
+        >>> bool(np.max(np.abs(spline(t) - np.sin(t))) < 1e-7)
+        True
+        >>> CubicSpline(x, np.cos(x) + x, bc="periodic")
+        Traceback (most recent call last):
+        ...
+        ValueError: The periodic spline needs y[0] == y[-1] (up to the rounding).
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Spline_interpolation
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, bc: str = "natural", derivatives: tuple = (0.0, 0.0)):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+
+        if bc not in ("natural", "clamped", "periodic"):
+            raise ValueError("The boundary conditions must be natural, clamped or periodic.")
+
+        if len(x) < (3 if bc == "periodic" else 2):
+            raise ValueError("The spline needs at least two (three if periodic) nodes.")
+
+        if bc == "periodic" and not np.allclose(y[0], y[-1], rtol=1e-15, atol=1e-15):
+            raise ValueError("The periodic spline needs y[0] == y[-1] (up to the rounding).")
+
+        h = np.diff(x)
+        slope = np.diff(y)
+        slope /= h
+
+        if bc == "periodic":
+            moments = self._periodic_moments(h, slope)
+        else:
+            moments = self._moments(h, slope, bc, derivatives)
+
+        self.x = x
+        self._step, self._slack = self._uniform_step(x)
+        self.coefficients = np.empty((4, len(h)))
+
+        # The coefficients are found block by block, so the temporaries stay in the cache.
+        for start in range(0, len(h), 2**14):
+            block = slice(start, start + 2**14)
+            a, b, c, d = self.coefficients[:, block]
+            left, right, step = moments[block][: len(a)], moments[start + 1 : start + len(a) + 1], h[block]
+            a[:] = y[start : start + len(a)]
+            np.multiply(left, 0.5, out=c)
+            np.subtract(right, left, out=d)
+            np.multiply(right, 0.5, out=b)
+            b += left
+            b *= step
+            b *= -1.0 / 3.0
+            b += slope[block]
+            d /= step
+            d /= 6.0
+
+    @staticmethod
+    def _uniform_step(x: np.ndarray) -> tuple:
+        """
+        Find the step of the nearly equispaced nodes and the bound of dx below which the arithmetic interval guess
+        is certainly right, (None, None) if the nodes deviate from x[0] + i * step by a tenth of the step or more.
+        """
+
+        step = (x[-1] - x[0]) / (len(x) - 1)
+        deviation = 0.0
+        for start in range(0, len(x), 2**16):
+            grid = np.arange(start, min(start + 2**16, len(x)), dtype=float)
+            grid *= step
+            grid += x[0]
+            grid -= x[start : start + 2**16]
+            deviation = max(deviation, np.max(np.abs(grid)))
+
+        if not deviation < 0.1 * step:
+            return None, None
+
+        # The interval of the guess is at least step - 2 * deviation long, plus the rounding of the guess.
+        return step, step - 2.0 * deviation - 4.0 * np.finfo(float).eps * max(abs(x[0]), abs(x[-1]))
+
+    @staticmethod
+    def _solve(diagonal: np.ndarray, off_diagonal: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """Solve the symmetric positive definite tridiagonal system of the moments in place (LAPACK dptsv)."""
+
+        _, _, solution, info = dptsv(diagonal, off_diagonal, rhs, overwrite_d=1, overwrite_e=1, overwrite_b=1)
+        if info != 0:
+            raise ValueError(f"The moments system is not positive definite (info {info}), x must be increasing.")
+
+        return solution
+
+    @staticmethod
+    def _moments(h: np.ndarray, slope: np.ndarray, bc: str, derivatives: tuple) -> np.ndarray:
+        # The system is symmetric positive definite: for the natural spline the moments at the ends are zero
+        # and only the inner ones are unknown.
+        moments = np.zeros(len(h) + 1)
+        diagonal = np.empty(len(h) + 1)
+        np.add(h[:-1], h[1:], out=diagonal[1:-1])
+        diagonal[1:-1] *= 2.0
+        rhs = moments[1:-1]
+        np.subtract(slope[1:], slope[:-1], out=rhs)
+        rhs *= 6.0
+
+        if bc == "natural":
+            if len(h) == 2:
+                rhs /= diagonal[1]
+            elif len(h) > 2:
+                moments[1:-1] = CubicSpline._solve(diagonal[1:-1], h[1:-1].copy(), rhs)
+            return moments
+
+        diagonal[0], diagonal[-1] = 2.0 * h[0], 2.0 * h[-1]
+        moments[0], moments[-1] = 6.0 * (slope[0] - derivatives[0]), 6.0 * (derivatives[1] - slope[-1])
+        return CubicSpline._solve(diagonal, h.copy(), moments)
+
+    @staticmethod
+    def _periodic_moments(h: np.ndarray, slope: np.ndarray) -> np.ndarray:
+        h_previous = np.roll(h, 1)
+        ab = np.zeros((3, len(h)))
+        ab[0, 1:] = h[:-1]
+        ab[1] = 2.0 * (h_previous + h)
+        ab[2, :-1] = h[:-1]
+
+        corner = h[-1]
+        gamma = -ab[1, 0]
+        ab[1, 0] -= gamma
+        ab[1, -1] -= corner * corner / gamma
+
+        rhs = np.zeros((len(h), 2))
+        rhs[:, 0] = 6.0 * (slope - np.roll(slope, 1))
+        rhs[0, 1], rhs[-1, 1] = gamma, corner
+
+        solution = solve_banded((1, 1), ab, rhs, overwrite_ab=True, check_finite=False)
+        x, z = solution[:, 0], solution[:, 1]
+        x -= z * (x[0] + corner * x[-1] / gamma) / (1.0 + z[0] + corner * z[-1] / gamma)
+
+        return np.append(x, x[0])
+
+    def __call__(self, t: np.ndarray, chunk_size: int = 2**14) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        t_flat = t.ravel()
+        out = np.empty(t_flat.shape)
+
+        for start in range(0, t_flat.size, chunk_size):
+            points, p = t_flat[start : start + chunk_size], out[start : start + chunk_size]
+
+            if self._step is None:
+                i = np.searchsorted(self.x, points, side="right") - 1
+            else:
+                i = np.subtract(points, self.x[0])
+                i /= self._step
+                i = i.astype(np.intp)
+            np.clip(i, 0, len(self.x) - 2, out=i)
+            dx = points - self.x[i]
+
+            if self._step is not None:
+                # The guess is off by at most one interval, only near the nodes: look those points up.
+                near = np.flatnonzero((dx < 0.0) | (dx >= self._slack))
+                if near.size:
+                    i[near] = np.clip(np.searchsorted(self.x, points[near], side="right") - 1, 0, len(self.x) - 2)
+                    dx[near] = points[near] - self.x[i[near]]
+
+            a, b, c, d = self.coefficients
+            np.multiply(d.take(i), dx, out=p)
+            p += c.take(i)
+            p *= dx
+            p += b.take(i)
+            p *= dx
+            p += a.take(i)
+
+        return out.reshape(t.shape)[()]
+
+
+class NewtonInterpolant:
+    """
+    Newton's interpolating polynomial that grows node by node.
+
+    Only the last diagonal of the divided differences table is kept, f[x_k], f[x_{k-1}, x_k], ..., f[x_0, ..., x_k],
+    so appending a node costs O(n) and its coefficient is available at once. The nodes and the coefficients
+    are stored in buffers with the amortized doubling of capacity.
+
+    Doctests:
+        >>> p = NewtonInterpolant([0.0, 1.0], [1.0, 2.0])
+        >>> p.append(2.0, 5.0)
+        1.0
+        >>> p.coefficients.tolist() == divided_diff([0.0, 1.0, 2.0], [1.0, 2.0, 5.0])
+        True
+        >>> p(np.array([3.0, 4.0])).tolist()
+        [10.0, 17.0]
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Newton_polynomial#Addition_of_new_points
+    """
+
+    def __init__(self, x: list = (), y: list = ()):
+        x = np.asarray(x, dtype=float)
+        column = np.asarray(y, dtype=float)
+        self._size = len(x)
+        self._nodes = np.empty(max(16, 2 * self._size))
+        self._coefficients = np.empty_like(self._nodes)
+        self._diagonal = np.empty_like(self._nodes)
+        self._nodes[: self._size] = x
+
+        for j in range(self._size):
+            if j > 0:
+                column = (column[1:] - column[:-1]) / (x[j:] - x[:-j])
+            self._coefficients[j] = column[0]
+            self._diagonal[j] = column[-1]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nodes(self) -> np.ndarray:
+        return self._nodes[: self._size]
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        return self._coefficients[: self._size]
+
+    def append(self, x: float, y: float) -> float:
+        """
+        Add a node to the interpolant.
+
+        Args:
+            x (float): The x value of the node, different from all the previous ones.
+            y (float): The y value of the node.
+
+        Returns:
+            float: The new (highest order) coefficient of the polynomial.
+        """
+
+        n = self._size
+
+        if n == self._nodes.size:
+            for name in ("_nodes", "_coefficients", "_diagonal"):
+                buffer = np.empty(2 * n)
+                buffer[:n] = getattr(self, name)
+                setattr(self, name, buffer)
+
+        previous = y
+        for j in range(1, n + 1):
+            previous, self._diagonal[j - 1] = (previous - self._diagonal[j - 1]) / (x - self._nodes[n - j]), previous
+        self._diagonal[n] = previous
+
+        self._nodes[n] = x
+        self._coefficients[n] = previous
+        self._size += 1
+
+        return float(previous)
+
+    def __call__(self, x: np.ndarray, out: np.ndarray = None, chunk_size: int = 2**16) -> np.ndarray:
+        return newton_poly(self.coefficients, self.nodes, x, out=out, chunk_size=chunk_size)
 
 
 if __name__ == "__main__":
@@ -88,3 +552,16 @@ if __name__ == "__main__":
         plt.plot(np.linspace(-5, 5, 100), newton_poly(coefficients, x, np.linspace(-5, 5, 100)))
 
     plt.savefig("lesson_5/polynom.png")
+
+    print()
+    print("Compare with the barycentric interpolation on the Chebyshev nodes of the second kind and natural splines:")
+    t = np.linspace(-5, 5, 1000)
+    for n in range(4, 16, 1):
+        x = [-5 + k * 10 / n for k in range(n + 1)]
+        y = [1 / (1 + x_k**2) for x_k in x]
+        x_cheb = chebyshev_nodes(n, kind=2, a=-5, b=5)
+        y_cheb = barycentric_interpolate(x_cheb, 1 / (1 + x_cheb**2), t, barycentric_weights(x_cheb, kind=2))
+        error = np.max(np.abs(newton_poly(divided_diff(x, y), x, t) - 1 / (1 + t**2)))
+        error_cheb = np.max(np.abs(y_cheb - 1 / (1 + t**2)))
+        error_spline = np.max(np.abs(CubicSpline(x, y)(t) - 1 / (1 + t**2)))
+        print(f"n = {n}, max error: equispaced = {error:.3}, Chebyshev = {error_cheb:.3}, spline = {error_spline:.3}")
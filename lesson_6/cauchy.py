@@ -1,8 +1,52 @@
-from typing import Callable
+from typing import Callable, Iterator, NamedTuple
 
 import numpy as np
 
 
+class OdeResult(NamedTuple):
+    """The solution of the Cauchy problem at the output times and the work spent on it."""
+
+    t: np.ndarray
+    y: np.ndarray
+    steps: int
+    rejected: int
+    evaluations: int
+
+
+class EnsembleResult(NamedTuple):
+    """The final points and states of the ensemble members and whether their event stopped them."""
+
+    x: np.ndarray
+    y: np.ndarray
+    event: np.ndarray
+    steps: int
+
+
+# Dormand-Prince 5(4) tableau: the nodes, the stages, the 5th order weights (the last stage row, FSAL),
+# the difference of the 5th and the embedded 4th order weights, and the dense output polynomial in s = (x - x0) / h.
+_DOPRI_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+_DOPRI_A = [
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+    np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+]
+_DOPRI_E = np.array([71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+_DOPRI_P = np.array(
+    [
+        [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+        [0.0, 0.0, 0.0, 0.0],
+        [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+        [0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+        [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+        [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+        [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+    ]
+)
+
+
 def eiler(f: Callable[[float, float], float], x0: float, y0: float, x: float, h: float) -> float:
     """
     Find the root of a function using the Eiler's method.
@@ -18,7 +62,7 @@ def eiler(f: Callable[[float, float], float], x0: float, y0: float, x: float, h:
         float: The root of the function.
 
     Doctests:
-        >>> eiler(lambda x, y: -y, 0, 1, 1, 1e-5) - np.exp(-1) < 1e-5
+        >>> abs(eiler(lambda x, y: -y, 0, 1, 1, 1e-5) - np.exp(-1)) < 1e-5
         True
 
     Documentation:
@@ -26,7 +70,7 @@ def eiler(f: Callable[[float, float], float], x0: float, y0: float, x: float, h:
 
     """
 
-    while abs(x0 - x) > h:
+    while abs(x0 - x) > h / 2.0:
         y0 = y0 + h * f(x0, y0)
         x0 = x0 + h
 
@@ -49,9 +93,9 @@ def runge_kutta(f: Callable[[float, float], float], x0: float, y0: float, x: flo
         float: The root of the function.
 
     Doctests:
-        >>> runge_kutta(lambda x, y: -y, 0, 1, 1, 1e-5, 2) - np.exp(-1) < 1e-5
+        >>> abs(runge_kutta(lambda x, y: -y, 0, 1, 1, 1e-2, 2) - np.exp(-1)) < 1e-5
         True
-        >>> runge_kutta(lambda x, y: -y, 0, 1, 1, 1e-5, 4) - np.exp(-1) < 1e-5
+        >>> abs(runge_kutta(lambda x, y: -y, 0, 1, 1, 1e-2, 4) - np.exp(-1)) < 1e-10
         True
 
     Documentation:
@@ -59,7 +103,7 @@ def runge_kutta(f: Callable[[float, float], float], x0: float, y0: float, x: flo
 
     """
 
-    while abs(x0 - x) > h:
+    while abs(x0 - x) > h / 2.0:
         if order == 2:
             k1 = h * f(x0, y0)
             k2 = h * f(x0 + h, y0 + k1)
@@ -77,14 +121,652 @@ def runge_kutta(f: Callable[[float, float], float], x0: float, y0: float, x: flo
     return y0
 
 
+def _rk_step(f: Callable, x0: float, y0: np.ndarray, f0: np.ndarray, h: float, order: int) -> np.ndarray:
+    """
+    Make one step of the Eiler's (order 1) or the Runge-Kutta (order 2 or 4) method.
+
+    Args:
+        f (Callable): The right-hand side of the equation.
+        x0 (float): The start of the step.
+        y0 (np.ndarray): The solution at x0.
+        f0 (np.ndarray): The right-hand side at (x0, y0), reused from the previous step.
+        h (float): The step.
+        order (int): The order of the method.
+
+    Returns:
+        np.ndarray: The solution at x0 + h.
+    """
+
+    if order == 1:
+        return y0 + h * f0
+
+    if order == 2:
+        k2 = f(x0 + h, y0 + h * f0)
+        return y0 + h * (f0 + k2) / 2.0
+
+    k2 = f(x0 + h / 2.0, y0 + h * f0 / 2.0)
+    k3 = f(x0 + h / 2.0, y0 + h * k2 / 2.0)
+    k4 = f(x0 + h, y0 + h * k3)
+    return y0 + h * (f0 + 2.0 * k2 + 2.0 * k3 + k4) / 6.0
+
+
+def hermite_interpolate(x0: float, y0: np.ndarray, f0: np.ndarray, y1: np.ndarray, f1: np.ndarray, h: float, x: float):
+    """
+    Evaluate the cubic Hermite interpolant of a step at the point x.
+
+    The interpolant matches the solution and its derivative at both ends of the step,
+    so it is continuously differentiable across the steps and O(h^4) accurate.
+
+    Doctests:
+        >>> hermite_interpolate(0.0, 0.0, 0.0, 1.0, 3.0, 1.0, 0.5)
+        0.125
+    """
+
+    s = (x - x0) / h
+    return (
+        (1.0 + 2.0 * s) * (1.0 - s) ** 2 * y0
+        + s * (1.0 - s) ** 2 * h * f0
+        + s**2 * (3.0 - 2.0 * s) * y1
+        + s**2 * (s - 1.0) * h * f1
+    )
+
+
+def iter_trajectory(
+    f: Callable[[float, np.ndarray], np.ndarray], x0: float, y0: np.ndarray, t: np.ndarray, h: float, order: int = 4
+) -> Iterator[tuple]:
+    """
+    Integrate the Cauchy problem once and yield the solution at the output times as soon as it is computed.
+
+    The steps of size h start at x0 (the last one is shortened to end at t[-1]), the right-hand side at the end
+    of a step is reused as the first stage of the next one, and the output times inside a step are served by
+    the cubic Hermite interpolation, so the cost does not depend on the number of the output times.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side of the equation y' = f(x, y).
+        x0 (float): The initial point.
+        y0 (np.ndarray): The initial value.
+        t (np.ndarray): The non-decreasing output times, not less than x0.
+        h (float): The step of the method.
+        order (int): The order of the method: 1 (Eiler's), 2 or 4 (Runge-Kutta).
+
+    Yields:
+        tuple: The output time and the solution at it.
+
+    Raises:
+        ValueError: The order is not 1, 2 or 4, or the output times are not sorted or precede x0.
+
+    Doctests:
+        >>> steps = iter_trajectory(lambda x, y: -y, 0.0, 1.0, [0.0, 0.5, 1.0], 1e-2)
+        >>> [(float(x), bool(abs(y - np.exp(-x)) < 1e-9)) for x, y in steps]
+        [(0.0, True), (0.5, True), (1.0, True)]
+    """
+
+    if order not in (1, 2, 4):
+        raise ValueError("The order of the method must be 1, 2 or 4.")
+
+    t = np.asarray(t, dtype=float)
+    if t.size and (t[0] < x0 or np.any(np.diff(t) < 0)):
+        raise ValueError("The output times must be sorted and not less than x0.")
+
+    y0 = np.asarray(y0, dtype=float) if np.ndim(y0) else float(y0)
+    f0 = f(x0, y0)
+    k = 0
+
+    while k < t.size:
+        while k < t.size and t[k] == x0:
+            yield float(t[k]), y0
+            k += 1
+
+        if k == t.size:
+            break
+
+        step = min(h, t[-1] - x0)
+        y1 = _rk_step(f, x0, y0, f0, step, order)
+        x1 = t[-1] if step < h else x0 + step
+        f1 = f(x1, y1)
+
+        while k < t.size and t[k] < x1:
+            yield float(t[k]), hermite_interpolate(x0, y0, f0, y1, f1, step, t[k])
+            k += 1
+
+        x0, y0, f0 = x1, y1, f1
+
+
+def trajectory(
+    f: Callable[[float, np.ndarray], np.ndarray], x0: float, y0: np.ndarray, t: np.ndarray, h: float, order: int = 4
+) -> np.ndarray:
+    """
+    Solve the Cauchy problem at the array of output times with a single integration.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side of the equation y' = f(x, y).
+        x0 (float): The initial point.
+        y0 (np.ndarray): The initial value.
+        t (np.ndarray): The non-decreasing output times, not less than x0.
+        h (float): The step of the method.
+        order (int): The order of the method: 1 (Eiler's), 2 or 4 (Runge-Kutta).
+
+    Returns:
+        np.ndarray: The solution at the output times, the first axis runs over the times.
+
+    Doctests:
+        >>> t = np.linspace(0.0, 3.0, 10)
+        >>> bool(np.max(np.abs(trajectory(lambda x, y: -y, 0.0, 1.0, t, 1e-2) - np.exp(-t))) < 1e-9)
+        True
+        >>> trajectory(lambda x, y: np.array([y[1], -y[0]]), 0.0, [0.0, 1.0], [0.0, np.pi], 1e-3)[-1].round(9) + 0.0
+        array([ 0., -1.])
+    """
+
+    values = [y for _, y in iter_trajectory(f, x0, y0, t, h, order)]
+    return np.array(values, dtype=float).reshape((len(values),) + np.shape(y0))
+
+
+class ButcherTableau(NamedTuple):
+    """The coefficients of an explicit Runge-Kutta method: a strictly lower triangular matrix, weights and nodes."""
+
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    order: int
+
+
+def _tableau(rows: list, b: list, order: int) -> ButcherTableau:
+    a = np.zeros((len(b), len(b)))
+    for i, row in enumerate(rows, start=1):
+        a[i, : len(row)] = row
+    return ButcherTableau(a, np.array(b, dtype=float), a.sum(axis=1), order)
+
+
+_SQRT21 = np.sqrt(21.0)
+
+TABLEAUX = {
+    "rk2": _tableau([[1.0]], [1 / 2, 1 / 2], 2),
+    "rk3": _tableau([[1 / 2], [-1.0, 2.0]], [1 / 6, 2 / 3, 1 / 6], 3),
+    "rk4": _tableau([[1 / 2], [0.0, 1 / 2], [0.0, 0.0, 1.0]], [1 / 6, 1 / 3, 1 / 3, 1 / 6], 4),
+    "3/8": _tableau([[1 / 3], [-1 / 3, 1.0], [1.0, -1.0, 1.0]], [1 / 8, 3 / 8, 3 / 8, 1 / 8], 4),
+    # The Dormand-Prince 5th order weights: its 7th stage only serves the error estimate and is dropped.
+    "rk45": _tableau([row.tolist() for row in _DOPRI_A[:-1]], _DOPRI_A[-1].tolist(), 5),
+    # Cooper-Verner 8th order method.
+    "rk8": _tableau(
+        [
+            [1 / 2],
+            [1 / 4, 1 / 4],
+            [1 / 7, (-7 - 3 * _SQRT21) / 98, (21 + 5 * _SQRT21) / 49],
+            [(11 + _SQRT21) / 84, 0.0, (18 + 4 * _SQRT21) / 63, (21 - _SQRT21) / 252],
+            [(5 + _SQRT21) / 48, 0.0, (9 + _SQRT21) / 36, (-231 + 14 * _SQRT21) / 360, (63 - 7 * _SQRT21) / 80],
+            [
+                (10 - _SQRT21) / 42,
+                0.0,
+                (-432 + 92 * _SQRT21) / 315,
+                (633 - 145 * _SQRT21) / 90,
+                (-504 + 115 * _SQRT21) / 70,
+                (63 - 13 * _SQRT21) / 35,
+            ],
+            [1 / 14, 0.0, 0.0, 0.0, (14 - 3 * _SQRT21) / 126, (13 - 3 * _SQRT21) / 63, 1 / 9],
+            [
+                1 / 32,
+                0.0,
+                0.0,
+                0.0,
+                (91 - 21 * _SQRT21) / 576,
+                11 / 72,
+                (-385 - 75 * _SQRT21) / 1152,
+                (63 + 13 * _SQRT21) / 128,
+            ],
+            [
+                1 / 14,
+                0.0,
+                0.0,
+                0.0,
+                1 / 9,
+                (-733 - 147 * _SQRT21) / 2205,
+                (515 + 111 * _SQRT21) / 504,
+                (-51 - 11 * _SQRT21) / 56,
+                (132 + 28 * _SQRT21) / 245,
+            ],
+            [
+                0.0,
+                0.0,
+                0.0,
+                0.0,
+                (-42 + 7 * _SQRT21) / 18,
+                (-18 + 28 * _SQRT21) / 45,
+                (-273 - 53 * _SQRT21) / 72,
+                (301 + 53 * _SQRT21) / 72,
+                (28 - 28 * _SQRT21) / 45,
+                (49 - 7 * _SQRT21) / 18,
+            ],
+        ],
+        [1 / 20, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 49 / 180, 16 / 45, 49 / 180, 1 / 20],
+        8,
+    ),
+}
+
+
+class ExplicitRungeKutta:
+    """
+    Explicit Runge-Kutta method given by its Butcher tableau.
+
+    The right-hand side is called in the in-place form f(x, y, out), writing y' into out. The stages,
+    the stage argument and the increment live in the buffers allocated once for the shape of the state,
+    and every stage is formed by a matrix-vector product into a buffer, so a step allocates no arrays.
+
+    Args:
+        f (Callable[[float, np.ndarray, np.ndarray], None]): The in-place right-hand side of y' = f(x, y).
+        shape (tuple): The shape of the state.
+        method (str): The name of a tableau in TABLEAUX: rk2, rk3, rk4, 3/8, rk45 or rk8.
+
+    Raises:
+        ValueError: Unknown method.
+
+    Doctests:
+        >>> def f(x, y, out):
+        ...     np.negative(y, out=out)
+        >>> rk = ExplicitRungeKutta(f, (2,), "rk8")
+        >>> y = np.array([1.0, 2.0])
+        >>> rk.integrate(0.0, y, 1.0, 0.1) is y
+        True
+        >>> bool(np.allclose(y, np.exp(-1.0) * np.array([1.0, 2.0]), rtol=1e-12, atol=0.0))
+        True
+        >>> len(ExplicitRungeKutta(f, (2,), "rk45").tableau.b)
+        6
+        >>> rk.step(0.0, np.ones((2, 2))[:, 0], 0.1)
+        Traceback (most recent call last):
+        ...
+        ValueError: The state must be a C-contiguous float array.
+
+    Documentation:
+        https://en.wikipedia.org/wiki/List_of_Runge%E2%80%93Kutta_methods
+    """
+
+    def __init__(self, f: Callable[[float, np.ndarray, np.ndarray], None], shape: tuple, method: str = "rk4"):
+        if method not in TABLEAUX:
+            raise ValueError(f"The method must be one of {', '.join(TABLEAUX)}.")
+
+        self.f = f
+        self.shape = tuple(shape) if np.ndim(shape) else (shape,)
+        self.tableau = TABLEAUX[method]
+        size = int(np.prod(self.shape))
+        self._stages = np.empty((len(self.tableau.b), size))
+        self._argument = np.empty(size)
+        self._increment = np.empty(size)
+        self._stage_views = [stage.reshape(self.shape) for stage in self._stages]
+        self._argument_view = self._argument.reshape(self.shape)
+
+        # A stage depends on the previous ones from its first nonzero coefficient on, the leading zeros are skipped.
+        self._first = [
+            int(np.flatnonzero(row[:i])[0]) if np.any(row[:i]) else i for i, row in enumerate(self.tableau.a)
+        ]
+        self._h = None
+        self._scaled_a = np.empty_like(self.tableau.a)
+        self._scaled_b = np.empty_like(self.tableau.b)
+
+    def step(self, x: float, y: np.ndarray, h: float) -> np.ndarray:
+        """
+        Advance the state in place by one step.
+
+        Args:
+            x (float): The start of the step.
+            y (np.ndarray): The C-contiguous float state of the given shape, overwritten by the solution at x + h.
+            h (float): The step.
+
+        Returns:
+            np.ndarray: The state y.
+
+        Raises:
+            ValueError: The state is not a C-contiguous float array, so it cannot be updated in place.
+        """
+
+        if not (y.flags.c_contiguous and y.dtype == float):
+            raise ValueError("The state must be a C-contiguous float array.")
+
+        if h != self._h:
+            np.multiply(self.tableau.a, h, out=self._scaled_a)
+            np.multiply(self.tableau.b, h, out=self._scaled_b)
+            self._h = h
+
+        flat = y.reshape(-1)
+
+        self.f(x, y, self._stage_views[0])
+        for i in range(1, len(self._stages)):
+            first = self._first[i]
+            np.dot(self._scaled_a[i, first:i], self._stages[first:i], out=self._argument)
+            self._argument += flat
+            self.f(x + self.tableau.c[i] * h, self._argument_view, self._stage_views[i])
+
+        np.dot(self._scaled_b, self._stages, out=self._increment)
+        flat += self._increment
+
+        return y
+
+    def integrate(self, x0: float, y: np.ndarray, x: float, h: float) -> np.ndarray:
+        """
+        Integrate the state in place from x0 to x with the step h, the last step is shortened to end at x.
+
+        Args:
+            x0 (float): The initial point.
+            y (np.ndarray): The C-contiguous float initial state, overwritten by the solution at x.
+            x (float): The end point.
+            h (float): The step.
+
+        Returns:
+            np.ndarray: The state y.
+        """
+
+        n = max(0, int(np.ceil((x - x0) / h - 1e-9)))
+        for i in range(n):
+            self.step(x0 + i * h, y, min(h, x - x0 - i * h))
+
+        return y
+
+
+def _crossed(before: np.ndarray, after: np.ndarray, direction: int) -> np.ndarray:
+    rising = (before < 0) & (after >= 0)
+    falling = (before > 0) & (after <= 0)
+    if direction > 0:
+        return rising
+    if direction < 0:
+        return falling
+    return rising | falling
+
+
+def ensemble(
+    f: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    x0: np.ndarray,
+    y0: np.ndarray,
+    x: np.ndarray,
+    h: float,
+    method: str = "rk4",
+    event: Callable[[np.ndarray, np.ndarray], np.ndarray] = None,
+    direction: int = 0,
+    params: np.ndarray = None,
+) -> EnsembleResult:
+    """
+    Integrate an ensemble of Cauchy problems for the same equation as one array.
+
+    The state is an (n_members, ...) array and the right-hand side is vectorized over the members: it gets
+    the (n_members,) array of their points and the states, so a step of the whole ensemble costs one call per
+    stage of the method. Every member runs to its own end point (the last step is shortened to end at it) or
+    stops at the first zero crossing of its event function; the crossing is located by bisection on the cubic
+    Hermite interpolant of the step. Finished members are dropped from the following steps.
+
+    Args:
+        f (Callable[[np.ndarray, np.ndarray], np.ndarray]): The vectorized right-hand side of y' = f(x, y).
+        x0 (np.ndarray): The initial point, common or per member.
+        y0 (np.ndarray): The (n_members, ...) array of the initial states.
+        x (np.ndarray): The end point, common or per member.
+        h (float): The step of the method.
+        method (str): The name of a tableau in TABLEAUX.
+        event (Callable[[np.ndarray, np.ndarray], np.ndarray]): The vectorized event function of the points
+            and the states, returning (n_members,) values; a member stops when its value crosses zero.
+        direction (int): Stop only when the event value rises (1), falls (-1) or at any crossing (0).
+        params (np.ndarray): The (n_members, ...) array of the member parameters; if given, the rows of
+            the running members are passed to f and event as the third argument.
+
+    Returns:
+        EnsembleResult: The final points and states of the members, whether the event stopped them
+            and the number of the ensemble steps.
+
+    Raises:
+        ValueError: Unknown method.
+
+    Doctests:
+        >>> result = ensemble(lambda x, y: -y, 0.0, np.array([[1.0], [2.0]]), np.array([1.0, 2.0]), 1e-2)
+        >>> result.x.tolist(), bool(np.allclose(result.y[:, 0], [np.exp(-1.0), 2.0 * np.exp(-2.0)]))
+        ([1.0, 2.0], True)
+        >>> def rotation(x, y):
+        ...     return np.stack([-y[:, 1], y[:, 0]], axis=1)
+        >>> y0 = np.array([[1.0, 0.0], [2.0, 0.0]])
+        >>> result = ensemble(rotation, 0.0, y0, 10.0, 1e-2, event=lambda x, y: y[:, 1], direction=1)
+        >>> result.x.round(8).tolist(), result.event.tolist()
+        ([6.28318531, 6.28318531], [True, True])
+        >>> result = ensemble(lambda x, y, k: -k * y, 0.0, np.ones((2, 1)), 1.0, 1e-2, params=np.array([[1.0], [2.0]]))
+        >>> bool(np.allclose(result.y[:, 0], np.exp([-1.0, -2.0])))
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Ensemble_forecasting
+    """
+
+    if method not in TABLEAUX:
+        raise ValueError(f"The method must be one of {', '.join(TABLEAUX)}.")
+
+    a, b, c, _ = TABLEAUX[method]
+    y = np.array(y0, dtype=float)
+    members = len(y)
+    points = np.array(np.broadcast_to(np.asarray(x0, dtype=float), (members,)))
+    end = np.broadcast_to(np.asarray(x, dtype=float), (members,))
+    stopped = np.zeros(members, dtype=bool)
+    extra = () if params is None else (np.asarray(params),)
+    values = None if event is None else np.asarray(event(points, y, *extra), dtype=float)
+
+    active = np.flatnonzero(points < end)
+    steps = 0
+
+    while active.size:
+        x_a, y_a = points[active], y[active]
+        extra_a = tuple(p[active] for p in extra)
+        h_a = np.minimum(h, end[active] - x_a)
+        column = h_a.reshape((-1,) + (1,) * (y.ndim - 1))
+
+        stages = np.empty((len(b),) + y_a.shape)
+        stages[0] = f(x_a, y_a, *extra_a)
+        for i in range(1, len(b)):
+            stages[i] = f(x_a + c[i] * h_a, y_a + column * np.tensordot(a[i, :i], stages[:i], axes=1), *extra_a)
+
+        y_new = y_a + column * np.tensordot(b, stages, axes=1)
+        x_new = np.where(h_a < h, end[active], x_a + h_a)
+        steps += 1
+
+        if event is not None:
+            values_new = np.asarray(event(x_new, y_new, *extra_a), dtype=float)
+            hit = np.flatnonzero(_crossed(values[active], values_new, direction))
+
+            if hit.size:
+                x_hit, y_hit = _locate_event(
+                    f, event, x_a[hit], y_a[hit], stages[0][hit], h_a[hit], y_new[hit], tuple(p[hit] for p in extra_a)
+                )
+                x_new[hit], y_new[hit] = x_hit, y_hit
+                stopped[active[hit]] = True
+
+            values[active] = values_new
+
+        points[active], y[active] = x_new, y_new
+        active = active[~stopped[active] & (x_new < end[active])]
+
+    return EnsembleResult(points, y, stopped, steps)
+
+
+def _locate_event(
+    f: Callable,
+    event: Callable,
+    x0: np.ndarray,
+    y0: np.ndarray,
+    f0: np.ndarray,
+    h: np.ndarray,
+    y1: np.ndarray,
+    extra: tuple,
+) -> tuple:
+    """
+    Find the zero crossing of the event function inside the steps of several members by bisection
+    on the cubic Hermite interpolants of the steps.
+    """
+
+    column = h.reshape((-1,) + (1,) * (y0.ndim - 1))
+    f1 = f(x0 + h, y1, *extra)
+    value0 = np.asarray(event(x0, y0, *extra), dtype=float)
+    left, right = np.zeros_like(h), np.ones_like(h)
+
+    for _ in range(50):
+        middle = (left + right) / 2.0
+        s = middle.reshape(column.shape)
+        value = np.asarray(event(x0 + middle * h, hermite_interpolate(0.0, y0, f0, y1, f1, column, s * column), *extra))
+        same = np.sign(value) == np.sign(value0)
+        left, right = np.where(same, middle, left), np.where(same, right, middle)
+
+    s = right.reshape(column.shape)
+    return x0 + right * h, hermite_interpolate(0.0, y0, f0, y1, f1, column, s * column)
+
+
+def _rms_norm(x: np.ndarray, scale: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(x / scale))))
+
+
+def initial_step(f: Callable, x0: float, y0: np.ndarray, f0: np.ndarray, rtol, atol, order: int) -> float:
+    """
+    Choose the first step of an adaptive method with the local error estimate of the given order
+    (Hairer, Norsett, Wanner, II.4) at one extra evaluation.
+    """
+
+    scale = atol + rtol * np.abs(y0)
+    d0, d1 = _rms_norm(y0, scale), _rms_norm(f0, scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    d2 = _rms_norm(f(x0 + h0, y0 + h0 * f0) - f0, scale) / h0
+    h1 = max(1e-6, h0 * 1e-3) if max(d1, d2) <= 1e-15 else (0.01 / max(d1, d2)) ** (1 / (order + 1))
+
+    return min(100 * h0, h1)
+
+
+def dormand_prince(
+    f: Callable[[float, np.ndarray], np.ndarray],
+    x0: float,
+    y0: np.ndarray,
+    t: np.ndarray,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    h: float = None,
+    max_steps: int = 100000,
+) -> OdeResult:
+    """
+    Solve the Cauchy problem with the adaptive Dormand-Prince 5(4) method.
+
+    The local error is estimated by the embedded 4th order solution and measured in the RMS norm of
+    atol + rtol * |y| (both tolerances may be given per component). The step is chosen by the PI controller,
+    the last stage of an accepted step is the first stage of the next one (FSAL), so a step costs six
+    evaluations, and the output times are served by the 4th order continuous extension of the method.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side of the equation y' = f(x, y).
+        x0 (float): The initial point.
+        y0 (np.ndarray): The initial value.
+        t (np.ndarray): The non-decreasing output times, not less than x0.
+        rtol (float): The relative tolerance, a scalar or an array broadcastable to the shape of y0.
+        atol (float): The absolute tolerance, a scalar or an array broadcastable to the shape of y0.
+        h (float): The first step, chosen automatically if None.
+        max_steps (int): The maximum number of the accepted and the rejected steps.
+
+    Returns:
+        OdeResult: The output times, the solution at them (the first axis runs over the times),
+            the numbers of the accepted and the rejected steps and of the right-hand side evaluations.
+
+    Raises:
+        ValueError: The output times are not sorted or precede x0, or the tolerances do not broadcast to y0.
+        RuntimeError: The maximum number of steps is exceeded.
+
+    Doctests:
+        >>> t = np.linspace(0.0, 3.0, 10)
+        >>> result = dormand_prince(lambda x, y: -y, 0.0, 1.0, t, rtol=1e-10, atol=1e-12)
+        >>> bool(np.max(np.abs(result.y - np.exp(-t))) < 1e-10), result.steps < 100
+        (True, True)
+        >>> result = dormand_prince(lambda x, y: np.array([y[1], -y[0]]), 0.0, [0.0, 1.0], [np.pi])
+        >>> bool(np.allclose(result.y, [[0.0, -1.0]], atol=1e-5))
+        True
+        >>> result.evaluations == 6 * (result.steps + result.rejected) + 2
+        True
+        >>> result = dormand_prince(lambda x, y: -y, 0.0, np.ones((2, 2)), [1.0], atol=np.full((2, 2), 1e-8))
+        >>> result.y.shape, bool(np.allclose(result.y, np.exp(-1.0), atol=1e-5))
+        ((1, 2, 2), True)
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Dormand%E2%80%93Prince_method
+    """
+
+    t = np.asarray(t, dtype=float)
+    if t.size and (t[0] < x0 or np.any(np.diff(t) < 0)):
+        raise ValueError("The output times must be sorted and not less than x0.")
+
+    y0 = np.array(y0, dtype=float)
+    shape = y0.shape
+    y0 = y0.ravel()
+    rtol, atol = (np.broadcast_to(np.asarray(tol, dtype=float), shape).ravel() for tol in (rtol, atol))
+    values = np.empty((t.size, y0.size))
+    stages = np.empty((7, y0.size))
+
+    def rhs(x, y):
+        return np.ravel(f(x, y.reshape(shape) if shape else float(y[0])))
+
+    stages[0] = rhs(x0, y0)
+    evaluations, steps, rejected = 1, 0, 0
+
+    if h is None and t.size and t[-1] > x0:
+        h = initial_step(rhs, x0, y0, stages[0], rtol, atol, 4)
+        evaluations += 1
+
+    beta, alpha, safety = 0.04, 1 / 5 - 0.75 * 0.04, 0.9
+    previous_error, max_factor = 1e-4, 10.0
+    k = 0
+
+    while k < t.size:
+        while k < t.size and t[k] == x0:
+            values[k] = y0
+            k += 1
+
+        if k == t.size:
+            break
+
+        if steps + rejected >= max_steps:
+            raise RuntimeError("The maximum number of steps is exceeded.")
+
+        step = min(h, t[-1] - x0)
+        for i, a in enumerate(_DOPRI_A):
+            stages[i + 1] = rhs(x0 + _DOPRI_C[i + 1] * step, y0 + step * (a @ stages[: i + 1]))
+        evaluations += 6
+
+        y1 = y0 + step * (_DOPRI_A[-1] @ stages[:6])
+        scale = atol + rtol * np.maximum(np.abs(y0), np.abs(y1))
+        error = max(_rms_norm(step * (_DOPRI_E @ stages), scale), 1e-10)
+
+        if error > 1.0:
+            rejected += 1
+            h = step * max(0.2, safety * error**-alpha)
+            max_factor = 1.0
+            continue
+
+        x1 = t[-1] if step == t[-1] - x0 else x0 + step
+        while k < t.size and t[k] < x1:
+            s = (t[k] - x0) / step
+            values[k] = y0 + step * (stages.T @ (_DOPRI_P @ (s ** np.arange(1, 5))))
+            k += 1
+
+        steps += 1
+        h = step * min(max_factor, max(0.2, safety * error**-alpha * previous_error**beta))
+        previous_error, max_factor = error, 10.0
+        x0, y0 = x1, y1
+        stages[0] = stages[6]
+
+    return OdeResult(t, values.reshape(t.shape + shape), steps, rejected, evaluations)
+
+
 if __name__ == "__main__":
     print("Solve the Cauchy problem:")
     print("x' = -x, x(0) = 1, 0 < t < 3")
     print()
 
-    for t in np.linspace(0, 3, 10):
-        print(f"Eiler's method: x({t}) = {eiler(lambda t, x: -x, 0, 1, t, 1e-5)}")
-        print(f"Runge-Kutta method 2: x({t}) = {runge_kutta(lambda t, x: -x, 0, 1, t, 1e-5, 2)}")
-        print(f"Runge-Kutta method 4: x({t}) = {runge_kutta(lambda t, x: -x, 0, 1, t, 1e-5, 4)}")
+    times = np.linspace(0, 3, 10)
+    solutions = [trajectory(lambda t, x: -x, 0, 1, times, 1e-5, order) for order in (1, 2, 4)]
+    adaptive = dormand_prince(lambda t, x: -x, 0, 1, times, rtol=1e-10, atol=1e-12)
+
+    for t, x_eiler, x_rk2, x_rk4, x_dopri in zip(times, *solutions, adaptive.y):
+        print(f"Eiler's method: x({t}) = {x_eiler}")
+        print(f"Runge-Kutta method 2: x({t}) = {x_rk2}")
+        print(f"Runge-Kutta method 4: x({t}) = {x_rk4}")
+        print(f"Dormand-Prince method: x({t}) = {x_dopri}")
         print(f"Exact solution: x({t}) = {np.exp(-t)}")
         print()
+
+    print(f"Runge-Kutta methods: {int(3 / 1e-5)} steps")
+    print(
+        f"Dormand-Prince method: {adaptive.steps} steps, {adaptive.rejected} rejected, "
+        f"{adaptive.evaluations} evaluations"
+    )
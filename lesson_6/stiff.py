@@ -0,0 +1,599 @@
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import csc_matrix, diags, identity, issparse
+from scipy.sparse.linalg import splu
+
+from lesson_6.cauchy import (  # pylint: disable=import-error
+    hermite_interpolate,
+    initial_step,
+)
+
+
+class StiffResult(NamedTuple):
+    """The solution of a stiff Cauchy problem at the output times and the work spent on it."""
+
+    t: np.ndarray
+    y: np.ndarray
+    steps: int
+    rejected: int
+    evaluations: int
+    jacobians: int
+    factorizations: int
+
+
+def banded_sparsity(n: int, lower: int, upper: int) -> csc_matrix:
+    """
+    The sparsity pattern of a banded n x n Jacobian with the given numbers of the sub- and superdiagonals.
+
+    Doctests:
+        >>> banded_sparsity(4, 1, 0).toarray().astype(int).tolist()
+        [[1, 0, 0, 0], [1, 1, 0, 0], [0, 1, 1, 0], [0, 0, 1, 1]]
+    """
+
+    offsets = range(-lower, upper + 1)
+    return csc_matrix(diags([np.ones(n - abs(k)) for k in offsets], offsets, shape=(n, n), dtype=bool))
+
+
+def group_columns(sparsity) -> np.ndarray:
+    """
+    Split the columns of a sparse Jacobian into the groups of structurally orthogonal columns.
+
+    No two columns of a group have a nonzero in the same row, so the whole group is found by a single
+    finite difference (Curtis, Powell, Reid). The columns are assigned greedily to the first fitting group.
+
+    Args:
+        sparsity: The sparsity pattern, a dense array or a scipy.sparse matrix.
+
+    Returns:
+        np.ndarray: The group of every column.
+
+    Doctests:
+        >>> group_columns(banded_sparsity(6, 1, 1)).tolist()
+        [0, 1, 2, 0, 1, 2]
+        >>> int(group_columns(np.eye(100)).max()) + 1
+        1
+    """
+
+    pattern = csc_matrix(sparsity, dtype=bool)
+    n_rows, n_columns = pattern.shape
+    groups = np.empty(n_columns, dtype=int)
+    used = np.zeros((0, n_rows), dtype=bool)
+
+    for j in range(n_columns):
+        rows = pattern.indices[pattern.indptr[j] : pattern.indptr[j + 1]]
+        free = np.flatnonzero(~used[:, rows].any(axis=1))
+        if free.size:
+            groups[j] = free[0]
+        else:
+            groups[j] = len(used)
+            used = np.vstack((used, np.zeros(n_rows, dtype=bool)))
+        used[groups[j], rows] = True
+
+    return groups
+
+
+def finite_difference_jacobian(
+    f: Callable[[float, np.ndarray], np.ndarray],
+    t: float,
+    y: np.ndarray,
+    f0: np.ndarray,
+    sparsity=None,
+    groups: Optional[np.ndarray] = None,
+) -> tuple:
+    """
+    Approximate the Jacobian of f(t, y) with respect to y by the forward differences.
+
+    Without the sparsity pattern every column costs an evaluation of f and the Jacobian is dense.
+    With it the structurally orthogonal columns (group_columns) are perturbed together, so a banded
+    Jacobian costs as many evaluations as its bandwidth, and the Jacobian is a sparse CSC matrix.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side.
+        t (float): The point.
+        y (np.ndarray): The state.
+        f0 (np.ndarray): The right-hand side at (t, y).
+        sparsity: The sparsity pattern of the Jacobian, a dense array or a scipy.sparse matrix.
+        groups (Optional[np.ndarray]): The column groups of the pattern, found if None.
+
+    Returns:
+        tuple: The Jacobian and the number of the evaluations of f.
+
+    Doctests:
+        >>> def f(t, y):
+        ...     return np.diff(y, prepend=0.0) - y**2
+        >>> y = np.arange(1.0, 7.0)
+        >>> jacobian, evaluations = finite_difference_jacobian(f, 0.0, y, f(0.0, y), banded_sparsity(6, 1, 0))
+        >>> evaluations, bool(np.allclose(jacobian.toarray(), np.eye(6) - np.eye(6, k=-1) - np.diag(2 * y), atol=1e-6))
+        (2, True)
+    """
+
+    y = np.asarray(y, dtype=float)
+    step = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y), 1.0)
+
+    if sparsity is None:
+        jacobian = np.empty((len(f0), len(y)))
+        for j in range(len(y)):
+            shifted = y.copy()
+            shifted[j] += step[j]
+            jacobian[:, j] = (f(t, shifted) - f0) / step[j]
+        return jacobian, len(y)
+
+    pattern = csc_matrix(sparsity, dtype=bool)
+    groups = group_columns(pattern) if groups is None else groups
+    rows, columns = pattern.nonzero()
+    differences = np.empty((groups.max() + 1, len(f0)))
+
+    for group, difference in enumerate(differences):
+        difference[:] = f(t, y + np.where(groups == group, step, 0.0)) - f0
+
+    values = differences[groups[columns], rows] / step[columns]
+    return csc_matrix((values, (rows, columns)), shape=pattern.shape), len(differences)
+
+
+def _factor(jacobian, c: float):
+    """Factor I - c * J, densely or sparsely as the Jacobian is stored."""
+
+    if issparse(jacobian):
+        return splu(csc_matrix(identity(jacobian.shape[0], format="csc") - c * jacobian))
+
+    return lu_factor(np.eye(len(jacobian)) - c * jacobian, check_finite=False)
+
+
+def _solve(lu, b: np.ndarray) -> np.ndarray:
+    return lu_solve(lu, b, check_finite=False) if isinstance(lu, tuple) else lu.solve(b)
+
+
+def _norm(x: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(x))))
+
+
+class _Problem:
+    """The right-hand side and its Jacobian with the counters of their evaluations."""
+
+    def __init__(self, f: Callable, jac: Optional[Callable], sparsity):
+        self.f = f
+        self.jac = jac
+        self.sparsity = sparsity
+        self.groups = None if sparsity is None else group_columns(sparsity)
+        self.evaluations = 0
+        self.jacobians = 0
+        self.factorizations = 0
+
+    def __call__(self, t: float, y: np.ndarray) -> np.ndarray:
+        self.evaluations += 1
+        return np.asarray(self.f(t, y), dtype=float)
+
+    def jacobian(self, t: float, y: np.ndarray, f0: Optional[np.ndarray] = None):
+        self.jacobians += 1
+        if self.jac is not None:
+            return self.jac(t, y)
+
+        f0 = self(t, y) if f0 is None else f0
+        jacobian, evaluations = finite_difference_jacobian(self.f, t, y, f0, self.sparsity, self.groups)
+        self.evaluations += evaluations
+        return jacobian
+
+    def factor(self, jacobian, c: float):
+        self.factorizations += 1
+        return _factor(jacobian, c)
+
+
+def _check_times(x0: float, t: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype=float)
+    if t.size == 0 or t[0] < x0 or np.any(np.diff(t) < 0):
+        raise ValueError("The output times must be sorted and not less than x0.")
+    return t
+
+
+# BDF of the orders 1-5 in the backward differences form (Shampine, Reichelt; as in scipy's BDF with kappa = 0).
+_BDF_MAX_ORDER = 5
+_BDF_GAMMA = np.hstack((0.0, np.cumsum(1.0 / np.arange(1, _BDF_MAX_ORDER + 1))))
+_BDF_ERROR = 1.0 / np.arange(1, _BDF_MAX_ORDER + 2)
+_NEWTON_MAX_ITER = 4
+
+
+def _bdf_rescale(order: int, factor: float) -> np.ndarray:
+    """The matrix that turns the backward differences of the step h into the ones of the step factor * h."""
+
+    i = np.arange(1, order + 1)[:, None]
+    j = np.arange(1, order + 1)
+    matrix = np.zeros((order + 1, order + 1))
+    matrix[1:, 1:] = (i - 1 - factor * j) / i
+    matrix[0] = 1.0
+    return np.cumprod(matrix, axis=0)
+
+
+def _bdf_change_step(differences: np.ndarray, order: int, factor: float):
+    rescale = _bdf_rescale(order, factor) @ _bdf_rescale(order, 1.0)
+    differences[: order + 1] = rescale.T @ differences[: order + 1]
+
+
+def _bdf_update(differences: np.ndarray, order: int, correction: np.ndarray):
+    """Update the backward differences with the Newton correction of an accepted step."""
+
+    differences[order + 2] = correction - differences[order + 1]
+    differences[order + 1] = correction
+    for i in reversed(range(order + 1)):
+        differences[i] += differences[i + 1]
+
+
+def _bdf_select_order(differences: np.ndarray, order: int, error: float, scale: np.ndarray, safety: float) -> tuple:
+    """Choose the order, among the current one and its neighbours, that allows the largest next step."""
+
+    lower = _norm(_BDF_ERROR[order - 1] * differences[order] / scale) if order > 1 else np.inf
+    higher = _norm(_BDF_ERROR[order + 1] * differences[order + 2] / scale) if order < _BDF_MAX_ORDER else np.inf
+    with np.errstate(divide="ignore"):
+        factors = np.array([lower, error, higher]) ** (-1.0 / np.arange(order, order + 3))
+
+    return order + int(np.argmax(factors)) - 1, min(10.0, safety * np.max(factors))
+
+
+def _bdf_interpolate(differences: np.ndarray, order: int, x_new: float, h: float, x: float) -> np.ndarray:
+    """Evaluate the interpolating polynomial of the last accepted step, that ends at x_new, at the point x."""
+
+    shift = x_new - h * np.arange(order)
+    denominator = h * (1 + np.arange(order))
+    return differences[0] + np.cumprod((x - shift) / denominator) @ differences[1 : order + 1]
+
+
+def _bdf_newton(problem, x, differences, order, h, lu, scale, tol) -> tuple:
+    """
+    Solve the BDF equation of the step to the point x by the modified Newton iteration from the predicted value
+    with the frozen factorization of I - h / gamma_k * J.
+    """
+
+    c = h / _BDF_GAMMA[order]
+    psi = differences[1 : order + 1].T @ _BDF_GAMMA[1 : order + 1] / _BDF_GAMMA[order]
+    y = differences[: order + 1].sum(axis=0)
+    correction = np.zeros_like(y)
+    previous = None
+
+    for iteration in range(1, _NEWTON_MAX_ITER + 1):
+        value = problem(x, y)
+        if not np.all(np.isfinite(value)):
+            break
+
+        delta = _solve(lu, c * value - psi - correction)
+        norm = _norm(delta / scale)
+        rate = None if previous is None else norm / previous
+
+        if rate is not None and (rate >= 1 or rate ** (_NEWTON_MAX_ITER - iteration + 1) / (1 - rate) * norm > tol):
+            break
+
+        y += delta
+        correction += delta
+
+        if norm == 0 or (rate is not None and rate / (1 - rate) * norm < tol):
+            return True, iteration, y, correction
+
+        previous = norm
+
+    return False, _NEWTON_MAX_ITER, y, correction
+
+
+def bdf(
+    f: Callable[[float, np.ndarray], np.ndarray],
+    x0: float,
+    y0: np.ndarray,
+    t: np.ndarray,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    jac: Optional[Callable] = None,
+    sparsity=None,
+    h: Optional[float] = None,
+    max_steps: int = 100000,
+) -> StiffResult:
+    """
+    Solve a stiff Cauchy problem with the variable-step, variable-order BDF method of the orders 1-5.
+
+    The solution is kept as the backward differences, which are rescaled when the step changes.
+    The implicit equation of a step is solved by the modified Newton iteration with the factored
+    matrix I - h / gamma_k * J. The Jacobian is reused across the steps and is recomputed only when
+    the iteration does not converge with the old one; the matrix is refactored only when the step or
+    the order changes. After order + 1 steps of the same size the order is raised or lowered by one
+    if the error estimate of the neighbouring order allows a larger step.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side of the equation y' = f(x, y).
+        x0 (float): The initial point.
+        y0 (np.ndarray): The initial value.
+        t (np.ndarray): The non-decreasing output times, not less than x0.
+        rtol (float): The relative tolerance.
+        atol (float): The absolute tolerance.
+        jac (Optional[Callable]): The Jacobian jac(x, y), approximated by the finite differences if None.
+        sparsity: The sparsity pattern of the finite difference Jacobian (see finite_difference_jacobian).
+        h (Optional[float]): The first step, chosen automatically if None.
+        max_steps (int): The maximum number of the accepted and the rejected steps.
+
+    Returns:
+        StiffResult: The output times, the solution at them (the first axis runs over the times),
+            the numbers of the accepted and the rejected steps, of the evaluations of f,
+            of the Jacobians and of the LU factorizations.
+
+    Raises:
+        ValueError: The output times are not sorted or precede x0.
+        RuntimeError: The maximum number of steps is exceeded.
+
+    Doctests:
+        >>> a = np.array([[998.0, 1998.0], [-999.0, -1999.0]])
+        >>> result = bdf(lambda x, y: a @ y, 0.0, [1.0, 0.0], [0.1, 10.0], rtol=1e-6, atol=1e-9)
+        >>> exact = [[2 * np.exp(-x) - np.exp(-1000 * x), -np.exp(-x) + np.exp(-1000 * x)] for x in (0.1, 10.0)]
+        >>> bool(np.allclose(result.y, exact, rtol=1e-4, atol=1e-8)), result.steps < 300
+        (True, True)
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Backward_differentiation_formula
+    """
+
+    t = _check_times(x0, t)
+    problem = _Problem(f, jac, sparsity)
+    y = np.array(y0, dtype=float).ravel()
+    values = np.empty((t.size, y.size))
+    end = t[-1]
+
+    f0 = problem(x0, y)
+    h = initial_step(problem, x0, y, f0, rtol, atol, 1) if h is None else h
+    h = min(h, end - x0) if end > x0 else h
+
+    differences = np.zeros((_BDF_MAX_ORDER + 3, y.size))
+    differences[0], differences[1] = y, h * f0
+    jacobian, current = problem.jacobian(x0, y, f0), True
+    tol = max(10 * np.finfo(float).eps / rtol, min(0.03, rtol**0.5))
+
+    order, equal_steps, steps, rejected, lu = 1, 0, 0, 0, None
+    k = int(np.searchsorted(t, x0, side="right"))
+    values[:k] = y
+
+    while k < t.size:
+        if steps + rejected >= max_steps:
+            raise RuntimeError("The maximum number of steps is exceeded.")
+
+        if x0 + h > end:
+            _bdf_change_step(differences, order, (end - x0) / h)
+            h, equal_steps, lu = end - x0, 0, None
+
+        x_new = end if x0 + h >= end else x0 + h
+        if lu is None:
+            lu = problem.factor(jacobian, h / _BDF_GAMMA[order])
+
+        converged, iterations, y_new, correction = _bdf_newton(
+            problem, x_new, differences, order, h, lu, atol + rtol * np.abs(differences[: order + 1].sum(axis=0)), tol
+        )
+
+        if not converged and not current:
+            jacobian, current, lu = problem.jacobian(x0, differences[0]), True, None
+            continue
+
+        safety = 0.9 * (2 * _NEWTON_MAX_ITER + 1) / (2 * _NEWTON_MAX_ITER + iterations)
+        scale = atol + rtol * np.abs(y_new)
+        error = _norm(_BDF_ERROR[order] * correction / scale) if converged else np.inf
+
+        if error > 1:
+            rejected += 1
+            factor = max(0.2, safety * error ** (-1 / (order + 1))) if converged else 0.5
+            _bdf_change_step(differences, order, factor)
+            h, equal_steps, lu = h * factor, 0, None
+            continue
+
+        steps += 1
+        current = False
+        _bdf_update(differences, order, correction)
+
+        while k < t.size and t[k] <= x_new:
+            values[k] = _bdf_interpolate(differences, order, x_new, h, t[k])
+            k += 1
+
+        x0 = x_new
+        equal_steps += 1
+        if equal_steps < order + 1:
+            continue
+
+        order, factor = _bdf_select_order(differences, order, error, scale, safety)
+        _bdf_change_step(differences, order, factor)
+        h, equal_steps, lu = h * factor, 0, None
+
+    return StiffResult(
+        t,
+        values.reshape(t.shape + np.shape(y0)),
+        steps,
+        rejected,
+        problem.evaluations,
+        problem.jacobians,
+        problem.factorizations,
+    )
+
+
+# The L-stable Rosenbrock-W method ROS34PW2 (Rang, Angermann) of the order 3 with the embedded method of the order 2:
+# the stage coefficients alpha, gamma (with gamma on the diagonal) and the weights. Being a W-method, it keeps
+# the order with any approximation of the Jacobian, so the Jacobian may be as old as the step size control allows.
+_ROS_GAMMA = 4.3586652150845900e-01
+_ROS_ALPHA = np.array(
+    [
+        [0.0, 0.0, 0.0, 0.0],
+        [8.7173304301691801e-01, 0.0, 0.0, 0.0],
+        [8.4457060015369423e-01, -1.1299064236484185e-01, 0.0, 0.0],
+        [0.0, 0.0, 1.0, 0.0],
+    ]
+)
+_ROS_STAGE_GAMMA = np.array(
+    [
+        [_ROS_GAMMA, 0.0, 0.0, 0.0],
+        [-8.7173304301691801e-01, _ROS_GAMMA, 0.0, 0.0],
+        [-9.0338057013044082e-01, 5.4180672388095326e-02, _ROS_GAMMA, 0.0],
+        [2.4212380706095346e-01, -1.2232505839045147e00, 5.4526025533510214e-01, _ROS_GAMMA],
+    ]
+)
+_ROS_B = np.array([2.4212380706095346e-01, -1.2232505839045147e00, 1.5452602553351020e00, 4.3586652150845900e-01])
+_ROS_B_EMBEDDED = np.array([3.7810903145819369e-01, -9.6042292212423178e-02, 0.5, 2.1793326075422950e-01])
+
+# The same method for the variables u_i = sum_j gamma_ij * k_j, that need no products with the Jacobian
+# (Hairer, Wanner, IV.7): u_i = gamma * h * (I - gamma * h * W)^-1 (f(x + alpha_i * h, y + sum_j a_ij * u_j)
+# + sum_j c_ij / h * u_j + gamma_i * h * f_x), y_new = y + sum_i m_i * u_i.
+_ROS_INVERSE = np.linalg.inv(_ROS_STAGE_GAMMA)
+_ROS_A = _ROS_ALPHA @ _ROS_INVERSE
+_ROS_C = np.diag(np.diag(_ROS_INVERSE)) - _ROS_INVERSE
+_ROS_M = _ROS_B @ _ROS_INVERSE
+_ROS_E = (_ROS_B - _ROS_B_EMBEDDED) @ _ROS_INVERSE
+_ROS_NODES = _ROS_ALPHA.sum(axis=1)
+_ROS_TIME = _ROS_STAGE_GAMMA.sum(axis=1)
+
+
+def rosenbrock(
+    f: Callable[[float, np.ndarray], np.ndarray],
+    x0: float,
+    y0: np.ndarray,
+    t: np.ndarray,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    jac: Optional[Callable] = None,
+    sparsity=None,
+    h: Optional[float] = None,
+    max_steps: int = 100000,
+) -> StiffResult:
+    """
+    Solve a stiff Cauchy problem with the adaptive Rosenbrock-W method ROS34PW2 of the order 3.
+
+    A step solves four linear systems with the same factored matrix I - gamma * h * W and no Newton
+    iteration. Being a W-method, it keeps the order with any matrix W, so the Jacobian (and the finite
+    difference derivative with respect to x) is reused while the steps are accepted and may grow; it is
+    recomputed after a rejected step or when the step has to shrink. The matrix is refactored only when
+    the step changes (steps that would grow by less than 20% are kept). The local error is the difference
+    with the embedded 2nd order solution. The output times are served by the cubic Hermite interpolation,
+    which on the long steps over the fast decaying components is less accurate than the steps themselves.
+
+    Being of the order 3, the method needs about 10 times more steps for a 1000 times smaller tolerance: on the
+    stiff system of lesson_8 it takes 20 steps at rtol = 1e-3 and 143 at 1e-6, but about 1400 at rtol = 1e-9,
+    where the variable-order bdf needs a few hundred. It is meant for the moderate tolerances; use bdf for the
+    tight ones.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side of the equation y' = f(x, y).
+        x0 (float): The initial point.
+        y0 (np.ndarray): The initial value.
+        t (np.ndarray): The non-decreasing output times, not less than x0.
+        rtol (float): The relative tolerance.
+        atol (float): The absolute tolerance.
+        jac (Optional[Callable]): The Jacobian jac(x, y), approximated by the finite differences if None.
+        sparsity: The sparsity pattern of the finite difference Jacobian (see finite_difference_jacobian).
+        h (Optional[float]): The first step, chosen automatically if None.
+        max_steps (int): The maximum number of the accepted and the rejected steps.
+
+    Returns:
+        StiffResult: The output times, the solution at them (the first axis runs over the times),
+            the numbers of the accepted and the rejected steps, of the evaluations of f,
+            of the Jacobians and of the LU factorizations.
+
+    Raises:
+        ValueError: The output times are not sorted or precede x0.
+        RuntimeError: The maximum number of steps is exceeded.
+
+    Doctests:
+        >>> a = np.array([[998.0, 1998.0], [-999.0, -1999.0]])
+        >>> result = rosenbrock(lambda x, y: a @ y, 0.0, [1.0, 0.0], [0.1, 10.0], rtol=1e-6, atol=1e-9)
+        >>> exact = [[2 * np.exp(-x) - np.exp(-1000 * x), -np.exp(-x) + np.exp(-1000 * x)] for x in (0.1, 10.0)]
+        >>> bool(np.allclose(result.y, exact, rtol=1e-4, atol=1e-8)), result.steps < 1000, result.jacobians
+        (True, True, 1)
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Rosenbrock_methods
+    """
+
+    t = _check_times(x0, t)
+    problem = _Problem(f, jac, sparsity)
+    y = np.array(y0, dtype=float).ravel()
+    values = np.empty((t.size, y.size))
+    stages = np.empty((len(_ROS_B), y.size))
+    end = t[-1]
+
+    def derivatives(x, state, value):
+        delta = np.sqrt(np.finfo(float).eps) * max(abs(x), 1.0)
+        return problem.jacobian(x, state, value), (problem(x + delta, state) - value) / delta, 0
+
+    f0 = problem(x0, y)
+    h = initial_step(problem, x0, y, f0, rtol, atol, 2) if h is None else h
+    jacobian, f_x, age = derivatives(x0, y, f0)
+
+    steps, rejected, lu, lu_step = 0, 0, None, None
+    k = 0
+
+    while k < t.size:
+        while k < t.size and t[k] <= x0:
+            values[k] = y
+            k += 1
+
+        if k == t.size:
+            break
+
+        if steps + rejected >= max_steps:
+            raise RuntimeError("The maximum number of steps is exceeded.")
+
+        step = min(h, end - x0)
+        if lu is None or lu_step != step:
+            lu, lu_step = problem.factor(jacobian, _ROS_GAMMA * step), step
+
+        for i, stage in enumerate(stages):
+            value = f0 if i == 0 else problem(x0 + _ROS_NODES[i] * step, y + _ROS_A[i, :i] @ stages[:i])
+            value = value + _ROS_C[i, :i] @ stages[:i] / step + _ROS_TIME[i] * step * f_x
+            stage[:] = _ROS_GAMMA * step * _solve(lu, value)
+
+        y_new = y + _ROS_M @ stages
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error = max(_norm((_ROS_E @ stages) / scale), 1e-10)
+
+        if error > 1.0:
+            rejected += 1
+            h = step * max(0.2, 0.9 * error ** (-1 / 3))
+            if age > 0:
+                jacobian, f_x, age = derivatives(x0, y, f0)
+            continue
+
+        x_new = end if step == end - x0 else x0 + step
+        f_new = problem(x_new, y_new)
+        while k < t.size and t[k] <= x_new:
+            values[k] = hermite_interpolate(x0, y, f0, y_new, f_new, step, t[k])
+            k += 1
+
+        steps += 1
+        age += 1
+        x0, y, f0 = x_new, y_new, f_new
+
+        factor = min(5.0, max(0.2, 0.9 * error ** (-1 / 3)))
+        h = step if 1.0 <= factor <= 1.2 else step * factor
+        if factor < 1.0 and age > 0:
+            jacobian, f_x, age = derivatives(x0, y, f0)
+
+    return StiffResult(
+        t,
+        values.reshape(t.shape + np.shape(y0)),
+        steps,
+        rejected,
+        problem.evaluations,
+        problem.jacobians,
+        problem.factorizations,
+    )
+
+
+if __name__ == "__main__":
+    print("Solve the rigid system of equations of lesson_8:")
+    print("u' = 998u + 1998v")
+    print("v' = -999u - 1999v")
+    print("u(0) = 1, v(0) = 0, 0 < t < 0.1")
+    print()
+
+    matrix = np.array([[998.0, 1998.0], [-999.0, -1999.0]])
+    times = np.linspace(0, 0.1, 1001)
+    exact = np.column_stack([2 * np.exp(-times) - np.exp(-1000 * times), -np.exp(-times) + np.exp(-1000 * times)])
+
+    for method in (bdf, rosenbrock):
+        for tolerance in (1e-3, 1e-6, 1e-9):
+            result = method(lambda t, y: matrix @ y, 0, [1.0, 0.0], times, rtol=tolerance, atol=tolerance * 1e-3)
+            print(
+                f"{method.__name__}, rtol = {tolerance:.0e}: max error = {np.max(np.abs(result.y - exact)):.2e}, "
+                f"{result.steps} steps, {result.rejected} rejected, {result.evaluations} evaluations, "
+                f"{result.jacobians} Jacobians, {result.factorizations} LU"
+            )
+
+    print("The explicit Adams schemes of lesson_8 need 1000-2000 steps of h = 1e-4 or 5e-5 on this interval.")
+    print("The order 3 Rosenbrock method is for the moderate tolerances, at rtol = 1e-9 the bdf method is cheaper.")
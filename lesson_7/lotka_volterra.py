@@ -1,7 +1,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
-from lesson_6.cauchy import runge_kutta  # pylint: disable=import-error
+from lesson_6.cauchy import ensemble, trajectory  # pylint: disable=import-error
 
 if __name__ == "__main__":
     print("Solve the Lotka-Volterra equations:")
@@ -16,17 +16,17 @@ if __name__ == "__main__":
     plt.grid()
 
     for x0, y0, color in [(1, 1, "red"), (2, 2, "blue"), (3, 3, "green"), (4, 4, "orange")]:
-        for t in np.linspace(0, 50, 500):
-            x = runge_kutta(
-                f=lambda t, x: np.array([a * x[0] - b * x[0] * x[1], c * x[0] * x[1] - d * x[1]]),
-                x0=0,
-                y0=np.array([x0, y0]),
-                x=t,
-                h=1e-2,
-                order=4,
-            )
-            plt.scatter(x[0], x[1], color=color, s=1)
-            print(f"t = {t}, x = {x[0]}, y = {x[1]}", end="\r")
+        t = np.linspace(0, 50, 500)
+        x = trajectory(
+            f=lambda t, x: np.array([a * x[0] - b * x[0] * x[1], c * x[0] * x[1] - d * x[1]]),
+            x0=0,
+            y0=np.array([x0, y0]),
+            t=t,
+            h=1e-2,
+            order=4,
+        )
+        plt.scatter(x[:, 0], x[:, 1], color=color, s=1)
+        print(f"t = {t[-1]}, x = {x[-1, 0]}, y = {x[-1, 1]}")
 
         plt.scatter(x0, y0, color=color, s=10, marker="*", label=f"x0 = {x0}, y0 = {y0}")
 
@@ -35,3 +35,19 @@ if __name__ == "__main__":
     plt.ylabel("Predators")
     plt.title("Lotka-Volterra equations")
     plt.savefig("lesson_7/lotka_volterra.png")
+
+    print()
+    print("The periods of the cycles, the whole ensemble of initial conditions is integrated at once:")
+    initial = np.array([[1.0, 1.0], [2.0, 2.0], [3.0, 3.0], [4.0, 4.0]])
+    periods = ensemble(
+        f=lambda t, x, x0: np.stack([a * x[:, 0] - b * x[:, 0] * x[:, 1], c * x[:, 0] * x[:, 1] - d * x[:, 1]], axis=1),
+        x0=0,
+        y0=initial,
+        x=50,
+        h=1e-3,
+        event=lambda t, x, x0: x[:, 0] - x0[:, 0],
+        direction=1,
+        params=initial,
+    )
+    for (x0, y0), period in zip(initial, periods.x):
+        print(f"x0 = {x0}, y0 = {y0}, T = {period}")
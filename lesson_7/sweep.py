@@ -0,0 +1,330 @@
+import functools
+import hashlib
+import itertools
+import os
+import pickle
+import types
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from lesson_6.cauchy import trajectory  # pylint: disable=import-error
+
+# The columns of a sweep point and of the results table.
+PARAMETERS = ("a", "b", "c", "d", "x0", "y0", "h")
+METRICS = ("period", "amplitude", "drift")
+TABLE_DTYPE = np.dtype([(name, float) for name in PARAMETERS + METRICS])
+
+
+class SweepResult(NamedTuple):
+    """The results table of a parameter sweep and the cache statistics."""
+
+    table: np.ndarray
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / max(1, self.hits + self.misses)
+
+
+def lotka_volterra(t: float, x: np.ndarray, a: float, b: float, c: float, d: float) -> np.ndarray:
+    """
+    The right-hand side of the Lotka-Volterra equations.
+
+    Doctests:
+        >>> lotka_volterra(0.0, np.array([1.0, 1.0]), 10, 2, 2, 10).tolist()
+        [8.0, -8.0]
+    """
+
+    # pylint: disable=unused-argument
+    return np.array([a * x[0] - b * x[0] * x[1], c * x[0] * x[1] - d * x[1]])
+
+
+def _code_fingerprint(code: types.CodeType) -> bytes:
+    """The bytecode, the names of the globals and the attributes, and the constants with the nested code."""
+
+    parts = [code.co_code, repr(code.co_names).encode()]
+    for constant in code.co_consts:
+        parts.append(_code_fingerprint(constant) if isinstance(constant, types.CodeType) else repr(constant).encode())
+
+    return b"\0".join(parts)
+
+
+def _global_names(code: types.CodeType) -> set:
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _global_names(constant)
+
+    return names
+
+
+def _value_fingerprint(value, seen: set) -> bytes:
+    if isinstance(value, (types.FunctionType, types.MethodType, functools.partial)):
+        return _fingerprint(value, seen)
+    if isinstance(value, types.ModuleType):
+        return value.__name__.encode()
+    if isinstance(value, np.ndarray):
+        return repr((value.dtype, value.shape)).encode() + value.tobytes()
+
+    return repr(value).encode()
+
+
+def _callable_fingerprint(f: Callable, seen: set) -> bytes:
+    """The fingerprint of a callable that is not a plain function: a partial, a bound method or an instance."""
+
+    if isinstance(f, functools.partial):
+        parts = [b"partial", _fingerprint(f.func, seen)]
+        parts.extend(_value_fingerprint(arg, seen) for arg in f.args)
+        parts.extend(name.encode() + b"=" + _value_fingerprint(f.keywords[name], seen) for name in sorted(f.keywords))
+        return b"\0".join(parts)
+
+    if isinstance(f, types.MethodType):
+        return b"\0".join([b"method", _fingerprint(f.__func__, seen), _value_fingerprint(f.__self__, seen)])
+
+    parts = [type(f).__module__.encode(), type(f).__qualname__.encode()]
+    call = getattr(type(f), "__call__", None)
+    if isinstance(call, types.FunctionType):
+        parts.append(_fingerprint(call, seen))
+    try:
+        parts.append(pickle.dumps(f))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        parts.append(repr(f).encode())
+
+    return b"\0".join(parts)
+
+
+def _fingerprint(f: Callable, seen: Optional[set] = None) -> bytes:
+    """
+    Describe everything the result of a function depends on: its code (with the nested functions), the defaults,
+    the contents of the closure and the values of the module globals it refers to, the called functions
+    recursively. The other callables (partials, bound methods, ufuncs and the instances with __call__) are
+    described by their pickle or repr and the code of their underlying function. The values without a stable
+    representation only make the key change between the processes, so they cost cache misses, never stale hits.
+    """
+
+    seen = set() if seen is None else seen
+    if id(f) in seen:
+        return repr(getattr(f, "__qualname__", type(f).__qualname__)).encode()
+    seen.add(id(f))
+
+    if not isinstance(f, types.FunctionType):
+        return _callable_fingerprint(f, seen)
+
+    parts = [f.__qualname__.encode(), _code_fingerprint(f.__code__)]
+    parts.append(repr(f.__defaults__).encode() + repr(f.__kwdefaults__).encode())
+
+    for cell in f.__closure__ or ():
+        try:
+            parts.append(_value_fingerprint(cell.cell_contents, seen))
+        except ValueError:
+            parts.append(b"<empty>")
+
+    for name in sorted(_global_names(f.__code__)):
+        if name in f.__globals__:
+            parts.append(name.encode() + b"=" + _value_fingerprint(f.__globals__[name], seen))
+
+    return b"\0".join(parts)
+
+
+@functools.lru_cache(maxsize=1)
+def _integrator_fingerprint() -> bytes:
+    """The fingerprint of _sweep_point, so the changes of the integrator or of the metrics invalidate the cache."""
+
+    return hashlib.sha256(_fingerprint(_sweep_point)).digest()
+
+
+def cache_key(f: Callable, point: np.ndarray, t_end: float, n_out: int, order: int) -> str:
+    """
+    Find the content address of a trajectory: the hash of the right-hand side (its code, defaults, closure and
+    the globals it refers to, see _fingerprint), of the code that integrates and measures it (_sweep_point with
+    the integrator it calls), the parameters and the integrator settings.
+
+    Args:
+        f (Callable): The right-hand side f(t, x, a, b, c, d).
+        point (np.ndarray): The parameters a, b, c, d, x0, y0, h.
+        t_end (float): The end of the integration.
+        n_out (int): The number of the output times.
+        order (int): The order of the Runge-Kutta method.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+
+    Doctests:
+        >>> point = np.array([10, 2, 2, 10, 1, 1, 1e-2])
+        >>> cache_key(lotka_volterra, point, 5.0, 100, 4) == cache_key(lotka_volterra, point, 5.0, 100, 4)
+        True
+        >>> cache_key(lotka_volterra, point, 5.0, 100, 4) == cache_key(lotka_volterra, point, 5.0, 100, 2)
+        False
+        >>> first, second = lambda t, x, *p: np.sin(x), lambda t, x, *p: np.cos(x)
+        >>> cache_key(first, point, 5.0, 100, 4) == cache_key(second, point, 5.0, 100, 4)
+        False
+        >>> def scaled(k):
+        ...     return lambda t, x, *p: k * x
+        >>> cache_key(scaled(1.0), point, 5.0, 100, 4) == cache_key(scaled(2.0), point, 5.0, 100, 4)
+        False
+        >>> first, second = functools.partial(lotka_volterra, a=10), functools.partial(lotka_volterra, a=5)
+        >>> cache_key(first, point, 5.0, 100, 4) == cache_key(second, point, 5.0, 100, 4)
+        False
+        >>> cache_key(np.sin, point, 5.0, 100, 4) == cache_key(np.cos, point, 5.0, 100, 4)
+        False
+    """
+
+    digest = hashlib.sha256(_fingerprint(f))
+    digest.update(_integrator_fingerprint())
+    digest.update(np.asarray(point, dtype=float).tobytes())
+    digest.update(np.array([t_end, n_out, order], dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def cycle_metrics(t: np.ndarray, y: np.ndarray, a: float, b: float, c: float, d: float) -> np.ndarray:
+    """
+    Find the period, the amplitude of the preys and the drift of the invariant of a Lotka-Volterra trajectory.
+
+    The period is the mean time between the rising crossings of the mean number of the preys (linearly
+    interpolated between the output times, nan if there are less than two). The amplitude is the half
+    of the range of the preys. The invariant V = c x - d ln x + b y - a ln y is conserved by the exact
+    solution, its maximal relative deviation measures the error of the integrator.
+
+    Args:
+        t (np.ndarray): The output times.
+        y (np.ndarray): The (len(t), 2) trajectory.
+        a (float): The parameters of the equations.
+        b (float): The parameters of the equations.
+        c (float): The parameters of the equations.
+        d (float): The parameters of the equations.
+
+    Returns:
+        np.ndarray: The period, the amplitude and the drift.
+
+    Doctests:
+        >>> t = np.linspace(0.0, 10.0, 10001)
+        >>> y = trajectory(lambda t, x: lotka_volterra(t, x, 10, 2, 2, 10), 0.0, [1.0, 1.0], t, 1e-3)
+        >>> period, amplitude, drift = cycle_metrics(t, y, 10, 2, 2, 10)
+        >>> round(float(period), 3), bool(drift < 1e-7)
+        (0.807, True)
+    """
+
+    x = y[:, 0] - np.mean(y[:, 0])
+    i = np.flatnonzero((x[:-1] < 0) & (x[1:] >= 0))
+    crossings = t[i] - x[i] * (t[i + 1] - t[i]) / (x[i + 1] - x[i])
+    period = np.mean(np.diff(crossings)) if len(crossings) > 1 else np.nan
+
+    invariant = c * y[:, 0] - d * np.log(y[:, 0]) + b * y[:, 1] - a * np.log(y[:, 1])
+    drift = np.max(np.abs(invariant - invariant[0])) / abs(invariant[0])
+
+    return np.array([period, np.ptp(y[:, 0]) / 2.0, drift])
+
+
+def _sweep_point(task: tuple) -> np.ndarray:
+    """Integrate one point of the sweep, store the trajectory in the cache and return its metrics."""
+
+    f, point, t_end, n_out, order, path = task
+    a, b, c, d, x0, y0, h = point
+    t = np.linspace(0.0, t_end, n_out)
+    y = trajectory(lambda t, x: f(t, x, a, b, c, d), 0.0, np.array([x0, y0]), t, h, order)
+    metrics = cycle_metrics(t, y, a, b, c, d)
+
+    # The file appears under its final name only when it is complete, so an interrupted sweep resumes cleanly.
+    temporary = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(temporary, t=t, y=y, point=point, metrics=metrics)
+    os.replace(temporary, path)
+
+    return metrics
+
+
+def sweep(
+    points: np.ndarray,
+    cache_dir: str,
+    f: Callable = lotka_volterra,
+    t_end: float = 10.0,
+    n_out: int = 1001,
+    order: int = 4,
+    max_workers: Optional[int] = None,
+    parallel: bool = True,
+) -> SweepResult:
+    """
+    Integrate the Lotka-Volterra equations over a grid of parameters with a content-addressed cache of trajectories.
+
+    Every trajectory is stored as cache_dir/<cache_key>.npz with its output times, the states and the metrics,
+    so a rerun (or a resumed interrupted sweep) integrates only the points it has not seen. The missing points
+    are integrated on a process pool.
+
+    Args:
+        points (np.ndarray): The (n, 7) array of the parameters a, b, c, d, x0, y0, h.
+        cache_dir (str): The cache directory, created if missing.
+        f (Callable): The right-hand side f(t, x, a, b, c, d), a module level function if parallel is True.
+        t_end (float): The end of the integration.
+        n_out (int): The number of the output times.
+        order (int): The order of the Runge-Kutta method.
+        max_workers (Optional[int]): The number of worker processes, by default the number of processors.
+        parallel (bool): Integrate on a process pool; otherwise in the current process.
+
+    Returns:
+        SweepResult: The structured table (TABLE_DTYPE) of the parameters and the metrics of every point,
+            the numbers of the cache hits and misses.
+
+    Doctests:
+        >>> import tempfile
+        >>> points = np.array([[10, 2, 2, 10, x0, x0, 1e-2] for x0 in (1.0, 2.0, 3.0)])
+        >>> with tempfile.TemporaryDirectory() as cache_dir:
+        ...     first = sweep(points[:2], cache_dir, t_end=2.0, parallel=False)
+        ...     second = sweep(points, cache_dir, t_end=2.0, max_workers=2)
+        >>> first.hits, first.misses, second.hits, second.misses
+        (0, 2, 2, 1)
+        >>> second.table["period"].round(2).tolist(), round(second.hit_rate, 2)
+        ([0.81, 0.7, 0.65], 0.67)
+    """
+
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    paths = [os.path.join(cache_dir, f"{cache_key(f, point, t_end, n_out, order)}.npz") for point in points]
+    table = np.zeros(len(points), dtype=TABLE_DTYPE)
+    for name, column in zip(PARAMETERS, points.T):
+        table[name] = column
+
+    metrics = np.empty((len(points), len(METRICS)))
+    missing = []
+    for i, path in enumerate(paths):
+        if os.path.exists(path):
+            with np.load(path) as data:
+                metrics[i] = data["metrics"]
+        else:
+            missing.append(i)
+
+    tasks = [(f, points[i], t_end, n_out, order, paths[i]) for i in missing]
+    if parallel and tasks:
+        max_workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_sweep_point, tasks, chunksize=max(1, len(tasks) // (4 * max_workers)))
+            metrics[missing] = list(results)
+    elif tasks:
+        metrics[missing] = [_sweep_point(task) for task in tasks]
+
+    for name, column in zip(METRICS, metrics.T):
+        table[name] = column
+
+    return SweepResult(table, len(points) - len(missing), len(missing))
+
+
+if __name__ == "__main__":
+    print("Sweep the Lotka-Volterra equations over the parameters and the initial conditions:")
+    print("    dx/dt = a * x - b * x * y")
+    print("    dy/dt = c * x * y - d * y")
+    print("with the trajectories cached in lesson_7/sweep_cache.")
+    print()
+
+    grid = np.array(list(itertools.product([5, 10], [2], [2], [5, 10], [1, 2, 3, 4], [1, 2, 3, 4], [1e-2, 1e-3])))
+    result = sweep(grid, "lesson_7/sweep_cache")
+    print(f"{len(grid)} points, cache hits: {result.hits}, misses: {result.misses}, hit rate: {result.hit_rate:.0%}")
+    print()
+
+    print("   a    d   x0   y0       h   period  amplitude      drift")
+    for row in result.table[::8]:
+        print(
+            f"{row['a']:4.0f} {row['d']:4.0f} {row['x0']:4.0f} {row['y0']:4.0f} {row['h']:7.0e}"
+            f" {row['period']:8.4f} {row['amplitude']:10.4f} {row['drift']:10.2e}"
+        )
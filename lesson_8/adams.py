@@ -0,0 +1,181 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+from lesson_6.cauchy import OdeResult, trajectory  # pylint: disable=import-error
+
+# y_n+1 = y_n + h * (b_0 * f_n + b_1 * f_n-1 + ... + b_p-1 * f_n-p+1), the coefficients of the order p.
+ADAMS_BASHFORTH = {
+    1: (1.0,),
+    2: (3 / 2, -1 / 2),
+    3: (23 / 12, -16 / 12, 5 / 12),
+    4: (55 / 24, -59 / 24, 37 / 24, -9 / 24),
+    5: (1901 / 720, -2774 / 720, 2616 / 720, -1274 / 720, 251 / 720),
+}
+
+# y_n+1 = y_n + h * (b_0 * f_n+1 + b_1 * f_n + ... + b_p-1 * f_n-p+2), the coefficients of the order p.
+ADAMS_MOULTON = {
+    1: (1.0,),
+    2: (1 / 2, 1 / 2),
+    3: (5 / 12, 8 / 12, -1 / 12),
+    4: (9 / 24, 19 / 24, -5 / 24, 1 / 24),
+    5: (251 / 720, 646 / 720, -264 / 720, 106 / 720, -19 / 720),
+}
+
+MODES = ("ab", "am", "pec", "pece")
+
+
+def _ring_weights(coefficients: np.ndarray, size: int) -> np.ndarray:
+    """
+    Arrange the coefficients of the past values for every position of the newest value in a ring buffer.
+
+    Row j is for the newest value stored at j, so the weighted sum of the buffer is one matrix-vector product.
+
+    Doctests:
+        >>> _ring_weights(np.array([3.0, 2.0]), 3).tolist()
+        [[3.0, 0.0, 2.0], [2.0, 3.0, 0.0], [0.0, 2.0, 3.0]]
+    """
+
+    weights = np.zeros((size, size))
+    for head in range(size):
+        for age, coefficient in enumerate(coefficients):
+            weights[head, (head - age) % size] = coefficient
+
+    return weights
+
+
+def _fixed_point(f: Callable, beta_h: float, t: float, r: np.ndarray, y: np.ndarray, max_iter: int = 50) -> np.ndarray:
+    """Solve y = r + beta_h * f(t, y) by the fixed-point iteration from the guess y."""
+
+    for _ in range(max_iter):
+        y_new = r + beta_h * f(t, y)
+        if np.all(np.abs(y_new - y) <= 1e-13 * (1.0 + np.abs(y_new))):
+            return y_new
+        y = y_new
+
+    return y
+
+
+def adams(
+    f: Callable[[float, np.ndarray], np.ndarray],
+    x0: float,
+    y0: np.ndarray,
+    x: float,
+    h: float,
+    order: int,
+    mode: str = "pece",
+    start: Optional[np.ndarray] = None,
+    implicit: Optional[Callable[[float, float, np.ndarray], np.ndarray]] = None,
+) -> OdeResult:
+    """
+    Solve the Cauchy problem with the Adams multistep methods of the orders 1-5.
+
+    The right-hand side values of the last steps are kept in a fixed-size ring buffer, and the weighted
+    sum over it is a single product with the coefficients arranged for the current buffer position,
+    so a step evaluates f only at the new point. The modes are:
+
+        ab: the explicit Adams-Bashforth method, one evaluation per step;
+        am: the implicit Adams-Moulton method, the equation y = r + b_0 * h * f(x, y) is solved by
+            implicit(b_0 * h, x, r) (for example LinearProblem.implicit_solve) or by the fixed-point
+            iteration from the Adams-Bashforth predictor;
+        pec, pece: the Adams-Bashforth predictor and one Adams-Moulton corrector, with the corrected
+            value evaluated again (pece, two evaluations per step) or not (pec, one evaluation).
+
+    The missing starting values are found by the Runge-Kutta method of order 4.
+
+    Args:
+        f (Callable[[float, np.ndarray], np.ndarray]): The right-hand side of the equation y' = f(x, y).
+        x0 (float): The initial point.
+        y0 (np.ndarray): The initial value.
+        x (float): The end point, x0 + n * h for an integer n.
+        h (float): The step.
+        order (int): The order of the method, 1-5.
+        mode (str): ab, am, pec or pece.
+        start (Optional[np.ndarray]): The values at x0, x0 + h, ..., the first one must be y0.
+        implicit (Optional[Callable[[float, float, np.ndarray], np.ndarray]]): The solver of the implicit equation.
+
+    Returns:
+        OdeResult: The grid x0 + i * h, the solution on it, the number of the steps (the starting ones
+            included), zero rejected steps and the number of the evaluations of f.
+
+    Raises:
+        ValueError: Unknown mode or order.
+
+    Doctests:
+        >>> result = adams(lambda x, y: -y, 0.0, 1.0, 1.0, 1e-2, 4, mode="ab")
+        >>> bool(abs(result.y[-1] - np.exp(-1.0)) < 1e-8), result.evaluations
+        (True, 114)
+        >>> errors = [abs(adams(lambda x, y: -y, 0.0, 1.0, 1.0, h, 5).y[-1] - np.exp(-1.0)) for h in (0.1, 0.05)]
+        >>> round(float(np.log2(errors[0] / errors[1])))
+        5
+        >>> result = adams(lambda x, y: np.array([y[1], -y[0]]), 0.0, [0.0, 1.0], np.pi, np.pi / 100, 3, mode="am")
+        >>> bool(np.allclose(result.y[-1], [0.0, -1.0], atol=1e-4))
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Linear_multistep_method#Adams%E2%80%93Bashforth_methods
+    """
+
+    if mode not in MODES:
+        raise ValueError(f"The mode must be one of {', '.join(MODES)}.")
+
+    if order not in ADAMS_BASHFORTH:
+        raise ValueError("The order of the method must be 1-5.")
+
+    y0 = np.asarray(y0, dtype=float)
+    shape = y0.shape
+    n = int(round((x - x0) / h))
+    t = x0 + h * np.arange(n + 1)
+    evaluations = 0
+
+    def counted(point, value):
+        nonlocal evaluations
+        evaluations += 1
+        return f(point, value)
+
+    def rhs(i, value):
+        return np.ravel(counted(t[i], value.reshape(shape)))
+
+    # The explicit methods and the predictors use the order past values, the implicit method one less.
+    size = max(1, order - 1) if mode == "am" else order
+    y = np.empty((n + 1, y0.size))
+    start = y0.reshape(1, -1) if start is None else np.asarray(start, dtype=float).reshape(-1, y0.size)
+    known = min(len(start), n + 1)
+    y[:known] = start[:known]
+
+    first = min(max(size, known), n + 1)
+    if first > known:
+        values = trajectory(counted, t[known - 1], y[known - 1].reshape(shape), t[known - 1 : first], h)
+        y[known:first] = values[1:].reshape(first - known, -1)
+
+    buffer = np.zeros((size, y0.size))
+    for i in range(max(0, first - size), first):
+        buffer[i % size] = rhs(i, y[i])
+
+    predictor = _ring_weights(np.array(ADAMS_BASHFORTH[size]) * h, size)
+    corrector = _ring_weights(np.array(ADAMS_MOULTON[order][1:]) * h, size)
+    beta_h = ADAMS_MOULTON[order][0] * h
+
+    for i in range(first, n + 1):
+        head = (i - 1) % size
+
+        if mode == "ab":
+            y[i] = y[i - 1] + predictor[head] @ buffer
+            new = rhs(i, y[i])
+        elif mode == "am":
+            r = y[i - 1] + corrector[head] @ buffer
+            if implicit is not None:
+                y[i] = np.ravel(implicit(beta_h, t[i], r.reshape(shape)))
+            else:
+                guess = y[i - 1] + predictor[head] @ buffer
+                y[i] = _fixed_point(lambda point, value: rhs(i, value), beta_h, t[i], r, guess)
+            new = rhs(i, y[i])
+        else:
+            new = rhs(i, y[i - 1] + predictor[head] @ buffer)
+            y[i] = y[i - 1] + corrector[head] @ buffer + beta_h * new
+            if mode == "pece":
+                new = rhs(i, y[i])
+
+        buffer[i % size] = new
+
+    return OdeResult(t, y.reshape((n + 1,) + shape), n, 0, evaluations)
@@ -0,0 +1,346 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from lesson_6.cauchy import (  # pylint: disable=import-error
+    dormand_prince,
+    eiler,
+    runge_kutta,
+)
+from lesson_6.stiff import bdf, rosenbrock  # pylint: disable=import-error
+from lesson_7.sweep import lotka_volterra  # pylint: disable=import-error
+from lesson_8.adams import adams  # pylint: disable=import-error
+from lesson_8.linear import LinearProblem  # pylint: disable=import-error
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TOLERANCES = (1e-3, 1e-5, 1e-7, 1e-9)
+
+
+class Problem(NamedTuple):
+    """
+    A reference Cauchy problem y' = f(x, y), y(x0) = y0 with the exact value at the end point x.
+
+    The steps of the sweep divide x - x0, so the fixed step methods end exactly at x.
+    """
+
+    f: Callable[[float, np.ndarray], np.ndarray]
+    x0: float
+    y0: np.ndarray
+    x: float
+    exact: np.ndarray
+    steps: tuple
+    implicit: Optional[Callable[[float, float, np.ndarray], np.ndarray]] = None
+
+
+class Method(NamedTuple):
+    """An integrator solve(f, problem, parameter) -> y(x), swept over the steps or over the tolerances."""
+
+    solve: Callable[[Callable, Problem, float], np.ndarray]
+    adaptive: bool = False
+
+
+class Run(NamedTuple):
+    """The measurements of one integration."""
+
+    problem: str
+    method: str
+    parameter: float
+    time: float
+    evaluations: int
+    peak_memory: int
+    error: Optional[float]
+
+
+def reference_problems() -> dict:
+    """
+    Build the reference problems: the decay x' = -x, the Lotka-Volterra equations and the stiff system of lesson_8.
+
+    The Lotka-Volterra equations have no closed-form solution, their end value is found by the Dormand-Prince
+    method with the tolerance far below the errors measured by the benchmark.
+
+    Returns:
+        dict: The problems by name.
+
+    Doctests:
+        >>> problems = reference_problems()
+        >>> sorted(problems)
+        ['decay', 'lotka_volterra', 'stiff']
+        >>> bool(np.allclose(problems["stiff"].f(0.0, problems["stiff"].y0), [998.0, -999.0]))
+        True
+    """
+
+    decay = LinearProblem([[-1.0]])
+    stiff = LinearProblem([[998.0, 1998.0], [-999.0, -1999.0]])
+
+    def predators(t, x):
+        return lotka_volterra(t, x, 10, 2, 2, 10)
+
+    reference = dormand_prince(predators, 0.0, [1.0, 1.0], [1.0], rtol=1e-13, atol=1e-15).y[-1]
+
+    return {
+        "decay": Problem(
+            decay.f,
+            0.0,
+            np.array([1.0]),
+            1.0,
+            np.exp([-1.0]),
+            (1e-1, 5e-2, 2e-2, 1e-2, 5e-3, 2e-3, 1e-3),
+            decay.implicit_solve,
+        ),
+        "lotka_volterra": Problem(predators, 0.0, np.array([1.0, 1.0]), 1.0, reference, (1e-2, 5e-3, 2e-3, 1e-3, 5e-4)),
+        "stiff": Problem(
+            stiff.f,
+            0.0,
+            np.array([1.0, 0.0]),
+            0.1,
+            np.array([2 * np.exp(-0.1) - np.exp(-100.0), -np.exp(-0.1) + np.exp(-100.0)]),
+            (2.5e-3, 1e-3, 5e-4, 2e-4, 1e-4),
+            stiff.implicit_solve,
+        ),
+    }
+
+
+def _implicit_adams(f: Callable, problem: Problem, h: float) -> np.ndarray:
+    return adams(f, problem.x0, problem.y0, problem.x, h, 2, "am", implicit=problem.implicit).y[-1]
+
+
+def _adaptive(integrator: Callable) -> Method:
+    def solve(f, problem, rtol):
+        return integrator(f, problem.x0, problem.y0, [problem.x], rtol=rtol, atol=rtol * 1e-3).y[-1]
+
+    return Method(solve, adaptive=True)
+
+
+# The fixed step methods are swept over the steps of the problem, the adaptive ones over TOLERANCES.
+METHODS = {
+    "eiler": Method(lambda f, p, h: eiler(f, p.x0, p.y0, p.x, h)),
+    "rk2": Method(lambda f, p, h: runge_kutta(f, p.x0, p.y0, p.x, h, 2)),
+    "rk4": Method(lambda f, p, h: runge_kutta(f, p.x0, p.y0, p.x, h, 4)),
+    "ab4": Method(lambda f, p, h: adams(f, p.x0, p.y0, p.x, h, 4, "ab").y[-1]),
+    "pece4": Method(lambda f, p, h: adams(f, p.x0, p.y0, p.x, h, 4, "pece").y[-1]),
+    "am2": Method(_implicit_adams),
+    "dopri": _adaptive(dormand_prince),
+    "bdf": _adaptive(bdf),
+    "rosenbrock": _adaptive(rosenbrock),
+}
+
+
+def measure(problem: Problem, method: Method, parameter: float, repeat: int = 3) -> tuple:
+    """
+    Integrate a problem and measure the work and the precision.
+
+    The wall time is the best of the repeated runs with the garbage collector off (as in timeit). The evaluations
+    of f are counted and the peak of the allocated memory is traced (tracemalloc) in a separate run, so the tracing
+    does not slow the timed ones. The global error is the maximal absolute error at the end point, None if the
+    solution diverged.
+
+    Args:
+        problem (Problem): The reference problem.
+        method (Method): The integrator.
+        parameter (float): The step or the tolerance.
+        repeat (int): The number of the timed runs.
+
+    Returns:
+        tuple: The wall time in seconds, the number of the evaluations, the peak memory in bytes and the error.
+
+    Doctests:
+        >>> problem = reference_problems()["decay"]
+        >>> seconds, evaluations, memory, error = measure(problem, METHODS["rk4"], 1e-2, repeat=1)
+        >>> evaluations, bool(error < 1e-10), memory > 0
+        (400, True, True)
+    """
+
+    evaluations = 0
+
+    def counted(x, y):
+        nonlocal evaluations
+        evaluations += 1
+        return problem.f(x, y)
+
+    best = np.inf
+    with np.errstate(all="ignore"):
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                method.solve(problem.f, problem, parameter)
+                best = min(best, time.perf_counter() - start)
+        finally:
+            if collecting:
+                gc.enable()
+
+        tracemalloc.start()
+        try:
+            y = method.solve(counted, problem, parameter)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        error = float(np.max(np.abs(np.ravel(y) - problem.exact)))
+
+    return best, evaluations, peak, error if np.isfinite(error) else None
+
+
+def benchmark(problems: Optional[dict] = None, methods: Optional[dict] = None, repeat: int = 3) -> list:
+    """
+    Run every method on every problem over the sweep of the steps (the tolerances for the adaptive methods).
+
+    Args:
+        problems (Optional[dict]): The problems by name, reference_problems() if None.
+        methods (Optional[dict]): The methods by name, METHODS if None.
+        repeat (int): The number of the timed runs of every integration.
+
+    Returns:
+        list: The runs.
+
+    Doctests:
+        >>> runs = benchmark({"decay": reference_problems()["decay"]}, {"eiler": METHODS["eiler"]}, repeat=1)
+        >>> [run.evaluations for run in runs]
+        [10, 20, 50, 100, 200, 500, 1000]
+        >>> errors = [run.error for run in runs]
+        >>> bool(0.9 < np.log10(errors[0] / errors[-1]) / np.log10(1e-1 / 1e-3) < 1.1)
+        True
+    """
+
+    problems = reference_problems() if problems is None else problems
+    methods = METHODS if methods is None else methods
+
+    runs = []
+    for problem_name, problem in problems.items():
+        for method_name, method in methods.items():
+            for parameter in TOLERANCES if method.adaptive else problem.steps:
+                runs.append(Run(problem_name, method_name, parameter, *measure(problem, method, parameter, repeat)))
+
+    return runs
+
+
+def report(runs: list) -> dict:
+    """
+    Arrange the runs into the work-precision tables: problem -> method -> the rows of the sweep.
+
+    Args:
+        runs (list): The runs.
+
+    Returns:
+        dict: The JSON-serializable report with the environment and the tables.
+    """
+
+    tables = {}
+    for run in runs:
+        row = {key: value for key, value in run._asdict().items() if key not in ("problem", "method")}
+        tables.setdefault(run.problem, {}).setdefault(run.method, []).append(row)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "tables": tables,
+    }
+
+
+def compare(current: dict, baseline: dict, time_factor: Optional[float] = None, memory_factor: float = 1.5) -> list:
+    """
+    Find the performance regressions of a report against the pinned baseline.
+
+    The number of the evaluations is deterministic and must not grow. The error must not grow by more than 5%
+    (nor the solution diverge) and the peak memory by more than memory_factor (plus 64 KiB for the interpreter
+    noise). These checks do not depend on the machine. The wall times of the baseline do, so they are checked
+    only if time_factor is given, on the machine that pinned the baseline: the time must not grow by more than
+    time_factor (plus 1 ms for the timer noise). The runs missing from the baseline are not checked.
+
+    Args:
+        current (dict): The report.
+        baseline (dict): The baseline report.
+        time_factor (Optional[float]): The allowed slowdown, None to skip the wall time check.
+        memory_factor (float): The allowed growth of the peak memory.
+
+    Returns:
+        list: The descriptions of the regressions, empty if there are none.
+
+    Doctests:
+        >>> row = {"parameter": 0.1, "time": 1e-3, "evaluations": 10, "peak_memory": 1000, "error": 1e-2}
+        >>> baseline = {"tables": {"decay": {"eiler": [row]}}}
+        >>> compare(baseline, baseline)
+        []
+        >>> slower = {"tables": {"decay": {"eiler": [dict(row, time=5e-2, error=None)]}}}
+        >>> compare(slower, baseline)
+        ['decay/eiler/0.1: diverged, was 0.01']
+        >>> compare(slower, baseline, time_factor=3.0)
+        ['decay/eiler/0.1: diverged, was 0.01', 'decay/eiler/0.1: time 0.05 > 3.0 * 0.001']
+    """
+
+    regressions = []
+    for problem, methods in current["tables"].items():
+        for method, rows in methods.items():
+            pinned = {row["parameter"]: row for row in baseline["tables"].get(problem, {}).get(method, [])}
+            for row in rows:
+                if row["parameter"] not in pinned:
+                    continue
+
+                old = pinned[row["parameter"]]
+                name = f"{problem}/{method}/{row['parameter']:g}"
+                if row["evaluations"] > old["evaluations"]:
+                    regressions.append(f"{name}: evaluations {row['evaluations']} > {old['evaluations']}")
+                if old["error"] is not None and row["error"] is None:
+                    regressions.append(f"{name}: diverged, was {old['error']:.3g}")
+                elif old["error"] is not None and row["error"] > 1.05 * old["error"] + 1e-15:
+                    regressions.append(f"{name}: error {row['error']:.3g} > {old['error']:.3g}")
+                if time_factor is not None and row["time"] > time_factor * old["time"] + 1e-3:
+                    regressions.append(f"{name}: time {row['time']:.3g} > {time_factor} * {old['time']:.3g}")
+                if row["peak_memory"] > memory_factor * old["peak_memory"] + 65536:
+                    regressions.append(f"{name}: peak memory {row['peak_memory']} > {old['peak_memory']}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the integrators of the Cauchy problem.")
+    parser.add_argument("--output", default="lesson_8/benchmark.json", help="the JSON report")
+    parser.add_argument("--baseline", default=BASELINE, help="the pinned baseline report")
+    parser.add_argument("--update", action="store_true", help="pin the report as the new baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="the number of the timed runs")
+    parser.add_argument(
+        "--time-factor", type=float, help="check the wall time with this allowed slowdown (on the baseline machine)"
+    )
+    arguments = parser.parse_args()
+
+    results = report(benchmark(repeat=arguments.repeat))
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    for problem_name, table in results["tables"].items():
+        print(f"{problem_name}:")
+        print("    method     step/tol     time, s  evaluations  memory, KiB      error")
+        for method_name, sweep in table.items():
+            for result in sweep:
+                error_text = "diverged" if result["error"] is None else f"{result['error']:.2e}"
+                print(
+                    f"    {method_name:10s}{result['parameter']:9.1e}{result['time']:12.2e}{result['evaluations']:13d}"
+                    f"{result['peak_memory'] / 1024:13.1f}{error_text:>11s}"
+                )
+        print()
+
+    if arguments.update:
+        with open(arguments.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"The baseline {arguments.baseline} is updated.")
+    elif os.path.exists(arguments.baseline):
+        with open(arguments.baseline, encoding="utf-8") as file:
+            found = compare(results, json.load(file), arguments.time_factor)
+        if found:
+            print(f"{len(found)} performance regressions against {arguments.baseline}:", file=sys.stderr)
+            print("\n".join(found), file=sys.stderr)
+            sys.exit(1)
+        print(f"No performance regressions against {arguments.baseline}.")
@@ -0,0 +1,150 @@
+from typing import Callable, Optional
+
+import numpy as np
+from scipy.linalg import expm, lu_factor, lu_solve
+
+from lesson_8.adams import ADAMS_MOULTON, adams  # pylint: disable=import-error
+
+
+class LinearProblem:
+    """
+    Linear system of equations with constant coefficients u' = A u + g(t).
+
+    The implicit schemes need to solve (I - beta * h * A) y = r at every step. The matrix depends only
+    on beta * h, so it is LU-factored once per step size and the factors are cached; a step then costs
+    a pair of triangular solves instead of a nonlinear (Krylov) solve. For the homogeneous system
+    the exact propagator expm(h * A) is cached in the same way.
+
+    Args:
+        a (np.ndarray): The square matrix A.
+        g (Optional[Callable[[float], np.ndarray]]): The inhomogeneous term, zero if None.
+
+    Doctests:
+        >>> problem = LinearProblem([[998.0, 1998.0], [-999.0, -1999.0]])
+        >>> problem.f(0.0, np.array([1.0, 0.0])).tolist()
+        [998.0, -999.0]
+        >>> y = problem.implicit_solve(0.5 * 1e-4, 1e-4, np.array([1.0, 0.0]))
+        >>> bool(np.allclose(y - 0.5 * 1e-4 * problem.f(1e-4, y), [1.0, 0.0]))
+        True
+        >>> problem.factor(0.5 * 1e-4) is problem.factor(0.5 * 1e-4)
+        True
+
+    Documentation:
+        https://en.wikipedia.org/wiki/LU_decomposition
+    """
+
+    def __init__(self, a: np.ndarray, g: Optional[Callable[[float], np.ndarray]] = None):
+        self.a = np.array(a, dtype=float)
+        self.g = g
+        self._factors = {}
+        self._propagators = {}
+
+    def f(self, t: float, y: np.ndarray) -> np.ndarray:
+        """The right-hand side A y + g(t)."""
+
+        return self.a @ y if self.g is None else self.a @ y + self.g(t)
+
+    def factor(self, beta_h: float) -> tuple:
+        """The cached LU factors of I - beta_h * A."""
+
+        if beta_h not in self._factors:
+            matrix = np.eye(len(self.a)) - beta_h * self.a
+            self._factors[beta_h] = lu_factor(matrix, check_finite=False)
+
+        return self._factors[beta_h]
+
+    def implicit_solve(self, beta_h: float, t: float, r: np.ndarray) -> np.ndarray:
+        """
+        Solve y = r + beta_h * f(t, y) for y.
+
+        Args:
+            beta_h (float): The implicit coefficient of the scheme times the step.
+            t (float): The point of the unknown value.
+            r (np.ndarray): The explicit part of the scheme.
+
+        Returns:
+            np.ndarray: The unknown value.
+        """
+
+        if self.g is not None:
+            r = r + beta_h * self.g(t)
+
+        return lu_solve(self.factor(beta_h), r, check_finite=False)
+
+    def propagator(self, h: float) -> np.ndarray:
+        """The cached exact propagator expm(h * A) of the homogeneous system."""
+
+        if h not in self._propagators:
+            self._propagators[h] = expm(h * self.a)
+
+        return self._propagators[h]
+
+    def propagate(self, y0: np.ndarray, h: float, n: int) -> np.ndarray:
+        """
+        Solve the homogeneous system exactly on the grid t_k = k * h, k = 0, 1, ..., n.
+
+        Args:
+            y0 (np.ndarray): The initial value.
+            h (float): The step of the grid.
+            n (int): The number of steps.
+
+        Returns:
+            np.ndarray: The (n + 1, dim) solution on the grid.
+
+        Raises:
+            ValueError: The system is not homogeneous.
+
+        Doctests:
+            >>> problem = LinearProblem([[998.0, 1998.0], [-999.0, -1999.0]])
+            >>> y = problem.propagate([1.0, 0.0], 1e-3, 100)
+            >>> t = 0.1
+            >>> bool(np.allclose(y[-1], [2 * np.exp(-t) - np.exp(-1000 * t), -np.exp(-t) + np.exp(-1000 * t)]))
+            True
+        """
+
+        if self.g is not None:
+            raise ValueError("The exact propagator needs a homogeneous system.")
+
+        propagator = self.propagator(h)
+        y = np.empty((n + 1, len(self.a)))
+        y[0] = y0
+        for k in range(n):
+            np.dot(propagator, y[k], out=y[k + 1])
+
+        return y
+
+
+def implicit_adams(problem: LinearProblem, t0: float, start: np.ndarray, h: float, n: int) -> np.ndarray:
+    """
+    Solve a linear system with the implicit Adams (Adams-Moulton) scheme and the prefactored matrix.
+
+    The number of the given starting values k selects the k-step scheme (of the order k + 1) of ADAMS_MOULTON.
+    Every step evaluates the right-hand side once, at the new value, and solves the prefactored system.
+
+    Args:
+        problem (LinearProblem): The linear system.
+        t0 (float): The initial point.
+        start (np.ndarray): The (k, dim) values at t0, t0 + h, ..., t0 + (k - 1) * h.
+        h (float): The step.
+        n (int): The number of steps.
+
+    Returns:
+        np.ndarray: The (n + 1, dim) solution on the grid t0 + i * h, i = 0, 1, ..., n.
+
+    Raises:
+        ValueError: There is no scheme for the given number of starting values.
+
+    Doctests:
+        >>> problem = LinearProblem([[998.0, 1998.0], [-999.0, -1999.0]])
+        >>> y = implicit_adams(problem, 0.0, [[1.0, 0.0]], 1e-4, 1000)
+        >>> exact = problem.propagate([1.0, 0.0], 1e-4, 1000)
+        >>> bool(np.max(np.abs(y - exact)) < 2e-3)
+        True
+    """
+
+    start = np.atleast_2d(np.asarray(start, dtype=float))
+
+    if len(start) + 1 not in ADAMS_MOULTON:
+        raise ValueError(f"The number of starting values must be 1-{len(ADAMS_MOULTON) - 1}.")
+
+    return adams(problem.f, t0, start[0], t0 + n * h, h, len(start) + 1, "am", start, problem.implicit_solve).y
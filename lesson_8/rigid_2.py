@@ -1,6 +1,11 @@
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.optimize import newton_krylov
+
+from lesson_8.adams import adams  # pylint: disable=import-error
+from lesson_8.linear import (  # pylint: disable=import-error
+    LinearProblem,
+    implicit_adams,
+)
 
 if __name__ == "__main__":
     print("Solve the rigid system of equations:")
@@ -11,15 +16,14 @@ if __name__ == "__main__":
     print("and implicit scheme:")
     print("y_n+2 = y_n+1 + h/12 * (5 * f(x_n+2, y_n+2) + 8 * f(x_n+1, y_n+1) - f(x_n, y_n))")
 
-    def f(x, y):
-        return np.array([998 * x + 1998 * y, -999 * x - 1999 * y])
-
     def u_exact(t):
         return 2 * np.exp(-t) - np.exp(-1000 * t)
 
     def v_exact(t):
         return -np.exp(-t) + np.exp(-1000 * t)
 
+    problem = LinearProblem([[998, 1998], [-999, -1999]])
+
     plt.figure(figsize=(10, 5), dpi=200)
 
     for h in [0.0001, 0.00005]:
@@ -28,40 +32,18 @@ if __name__ == "__main__":
         n = int((tn - t0) / h)
         t = np.linspace(t0, tn, n + 1)
 
-        u_e = np.zeros(n + 1)
-        v_e = np.zeros(n + 1)
-        u_e[0], v_e[0] = u0, v0
-        u_e[1], v_e[1] = u_exact(h), v_exact(h)
-        u_e[2], v_e[2] = u_exact(2 * h), v_exact(2 * h)
-
-        for i in range(n - 3):
-            u_e[i + 3] = u_e[i + 2] + h / 12 * (
-                23 * f(u_e[i + 2], v_e[i + 2])[0] - 16 * f(u_e[i + 1], v_e[i + 1])[0] + 5 * f(u_e[i], v_e[i])[0]
-            )
-            v_e[i + 3] = v_e[i + 2] + h / 12 * (
-                23 * f(u_e[i + 2], v_e[i + 2])[1] - 16 * f(u_e[i + 1], v_e[i + 1])[1] + 5 * f(u_e[i], v_e[i])[1]
-            )
-            print(f"Explicit: {i/(n-1)*100:.2f}%", end="\r")
-
-        u_i = np.zeros(n + 1)
-        v_i = np.zeros(n + 1)
-        u_i[0], v_i[0] = u0, v0
-        u_i[1], v_i[1] = u_exact(h), v_exact(h)
+        u_e, v_e = adams(
+            problem.f,
+            t0,
+            [u0, v0],
+            tn,
+            h,
+            3,
+            mode="ab",
+            start=[[u0, v0], [u_exact(h), v_exact(h)], [u_exact(2 * h), v_exact(2 * h)]],
+        ).y.T
 
-        for i in range(n - 2):
-            y = newton_krylov(
-                lambda y: y
-                - np.array([u_i[i + 1], v_i[i + 1]])
-                - h / 12 * (5 * f(y[0], y[1]) + 8 * f(u_i[i + 1], v_i[i + 1]) - f(u_i[i], v_i[i])),
-                np.array([u_i[i], v_i[i]]),
-            )
-            u_i[i + 2] = u_i[i + 1] + h / 12 * (
-                5 * f(y[0], y[1])[0] + 8 * f(u_i[i + 1], v_i[i + 1])[0] - f(u_i[i], v_i[i])[0]
-            )
-            v_i[i + 2] = v_i[i + 1] + h / 12 * (
-                5 * f(y[0], y[1])[1] + 8 * f(u_i[i + 1], v_i[i + 1])[1] - f(u_i[i], v_i[i])[1]
-            )
-            print(f"Implicit: {i/(n-1)*100:.2f}%", end="\r")
+        u_i, v_i = implicit_adams(problem, t0, [[u0, v0], [u_exact(h), v_exact(h)]], h, n).T
 
         plt.subplot(1, 2, 1)
         plt.plot(t, u_exact(t) - u_e, label=f"delta u with {h=}", linestyle="dashed")
@@ -19,32 +19,31 @@ where f_i = y''(x_i) = sin(x_i)
 
 alpha_1 = 1 / 2
 beta_1 = (a - h^2 * f_1) / 2
+
+The sweeps are done by lesson_9/tridiagonal.py.
 """
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+from lesson_9.tridiagonal import (  # pylint: disable=import-error
+    constant,
+    dirichlet,
+    neumann,
+)
+
 if __name__ == "__main__":
     a, b = 0, 1
     h = 0.001
     x = np.arange(-np.pi / 2, np.pi / 2 + h, h)
     n = len(x)
-    alpha = np.zeros(n)
-    beta = np.zeros(n)
     f = np.sin(x)
 
-    alpha[1] = 1 / 2
-    beta[1] = (a - h**2 * f[1]) / 2
-
-    for i in range(2, n - 1):
-        alpha[i] = 1 / (2 - alpha[i - 1])
-        beta[i] = (beta[i - 1] - h**2 * f[i]) / (2 - alpha[i - 1])
-
-    y = np.zeros(n)
-    y[0], y[-1] = a, (beta[-2] + h * b) / (1 - alpha[-2])
-
-    for i in range(n - 2, 0, -1):
-        y[i] = alpha[i] * y[i + 1] + beta[i]
+    # The rows y_i-1 - 2 * y_i + y_i+1 = h^2 * f_i with the end conditions, solved by the run-through method.
+    left, right = dirichlet(a), neumann(b)
+    d = h**2 * f
+    d[0], d[-1] = left.gamma, right.gamma
+    y = constant(n, 1.0, -2.0, 1.0, h, left, right).solve(d)
 
     y_exact = -np.sin(x) - 1 + a + b * x + np.pi * b / 2
 
@@ -0,0 +1,229 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class Boundary(NamedTuple):
+    """
+    The end condition alpha * y + beta * y' = gamma of a boundary value problem.
+
+    Dirichlet (beta = 0) and Neumann (alpha = 0) conditions are the special cases, see dirichlet and neumann;
+    the general one is the Robin condition.
+    """
+
+    alpha: float
+    beta: float
+    gamma: float
+
+
+def dirichlet(value: float) -> Boundary:
+    """The end condition y = value."""
+
+    return Boundary(1.0, 0.0, value)
+
+
+def neumann(derivative: float) -> Boundary:
+    """The end condition y' = derivative."""
+
+    return Boundary(0.0, 1.0, derivative)
+
+
+class Tridiagonal:
+    """
+    Factored tridiagonal matrix for the run-through (Thomas) method.
+
+    The row i of the system is lower[i] * y[i - 1] + diagonal[i] * y[i] + upper[i] * y[i + 1] = d[i]
+    (lower[0] and upper[-1] are not used). The forward sweep of the run-through method is split into the part
+    that depends only on the matrix, the run-through coefficients alpha_i = -upper[i] / (diagonal[i] + lower[i]
+    * alpha_i-1), computed once here, and the part that depends on the right-hand side, so a factored matrix
+    solves any number of right-hand sides in O(n) each. The solve is vectorized over the other axes of the
+    right-hand side: every step of the sweeps is one NumPy operation over all the systems of the batch.
+
+    There is no pivoting, which is stable for the diagonally dominant matrices of the difference schemes.
+
+    Args:
+        lower (np.ndarray): The subdiagonal, lower[i] is the coefficient of y[i - 1] in the row i.
+        diagonal (np.ndarray): The diagonal.
+        upper (np.ndarray): The superdiagonal, upper[i] is the coefficient of y[i + 1] in the row i.
+
+    Raises:
+        ValueError: The diagonals are empty or have different lengths, or a zero pivot is met.
+
+    Doctests:
+        >>> matrix = Tridiagonal([0.0, 1.0, 1.0], [2.0, 2.0, 2.0], [1.0, 1.0, 0.0])
+        >>> matrix.solve([3.0, 4.0, 3.0]).round(12).tolist()
+        [1.0, 1.0, 1.0]
+        >>> matrix.solve([[3.0, 1.0], [4.0, 0.0], [3.0, 0.0]]).round(12).tolist()
+        [[1.0, 0.75], [1.0, -0.5], [1.0, 0.25]]
+        >>> matrix.solve(np.ones((5, 3)), axis=1).shape
+        (5, 3)
+        >>> matrix.alpha.flags.writeable
+        False
+        >>> Tridiagonal([], [], [])
+        Traceback (most recent call last):
+        ...
+        ValueError: The matrix must not be empty.
+
+    Documentation:
+        https://en.wikipedia.org/wiki/Tridiagonal_matrix_algorithm
+    """
+
+    def __init__(self, lower: np.ndarray, diagonal: np.ndarray, upper: np.ndarray):
+        self.lower = np.array(lower, dtype=float)
+        self.diagonal = np.array(diagonal, dtype=float)
+        self.upper = np.array(upper, dtype=float)
+        self.n = len(self.diagonal)
+
+        if not len(self.lower) == len(self.upper) == self.n:
+            raise ValueError("The diagonals must have the same length.")
+
+        if self.n == 0:
+            raise ValueError("The matrix must not be empty.")
+
+        # y_i = alpha_i * y_i+1 + beta_i with beta_i = (d_i - lower_i * beta_i-1) * inverse_i.
+        self.alpha = np.zeros(self.n)
+        self.inverse = np.empty(self.n)
+        previous = 0.0
+        for i in range(self.n):
+            pivot = self.diagonal[i] + (self.lower[i] * previous if i > 0 else 0.0)
+            if pivot == 0.0:
+                raise ValueError("The matrix has a zero pivot, the run-through method needs pivoting.")
+            self.inverse[i] = 1.0 / pivot
+            previous = self.alpha[i] = -self.upper[i] * self.inverse[i] if i < self.n - 1 else 0.0
+
+        # The factor may be shared (see constant), so it is read-only.
+        for array in (self.lower, self.diagonal, self.upper, self.alpha, self.inverse):
+            array.setflags(write=False)
+
+    def solve(self, d: np.ndarray, axis: int = 0) -> np.ndarray:
+        """
+        Solve the system for a right-hand side or a batch of them.
+
+        Args:
+            d (np.ndarray): The right-hand sides, the axis runs over the rows of the system.
+            axis (int): The axis of the rows, the other axes enumerate the independent systems.
+
+        Returns:
+            np.ndarray: The solutions of the shape of d.
+
+        Raises:
+            ValueError: The length of the axis differs from the size of the matrix.
+        """
+
+        d = np.moveaxis(np.asarray(d, dtype=float), axis, 0)
+        if len(d) != self.n:
+            raise ValueError(f"The right-hand side has {len(d)} rows, the matrix has {self.n}.")
+
+        y = np.empty(d.shape)
+        y[0] = d[0] * self.inverse[0]
+        for i in range(1, self.n):
+            y[i] = (d[i] - self.lower[i] * y[i - 1]) * self.inverse[i]
+
+        for i in range(self.n - 2, -1, -1):
+            y[i] += self.alpha[i] * y[i + 1]
+
+        return np.moveaxis(y, 0, axis)
+
+
+def end_rows(
+    lower: np.ndarray, diagonal: np.ndarray, upper: np.ndarray, h: float, left: Boundary, right: Boundary
+) -> tuple:
+    """
+    Replace the first and the last rows of a tridiagonal system with the end conditions.
+
+    The derivatives are the one-sided differences (y_1 - y_0) / h and (y_n - y_n-1) / h, as in lesson_9/run2.py;
+    the ends of the right-hand side are left.gamma and right.gamma.
+
+    Args:
+        lower (np.ndarray): The subdiagonal.
+        diagonal (np.ndarray): The diagonal.
+        upper (np.ndarray): The superdiagonal.
+        h (float): The step of the grid.
+        left (Boundary): The condition at the first node.
+        right (Boundary): The condition at the last node.
+
+    Returns:
+        tuple: The new lower, diagonal and upper diagonals.
+
+    Doctests:
+        >>> ones = np.ones(4)
+        >>> lower, diagonal, upper = end_rows(ones, -2 * ones, ones, 0.5, dirichlet(1.0), neumann(0.0))
+        >>> lower.tolist(), diagonal.tolist(), upper.tolist()
+        ([0.0, 1.0, 1.0, -2.0], [1.0, -2.0, -2.0, 2.0], [0.0, 1.0, 1.0, 0.0])
+    """
+
+    lower, diagonal, upper = (np.array(array, dtype=float) for array in (lower, diagonal, upper))
+
+    lower[0], diagonal[0], upper[0] = 0.0, left.alpha - left.beta / h, left.beta / h
+    lower[-1], diagonal[-1], upper[-1] = -right.beta / h, right.alpha + right.beta / h, 0.0
+
+    return lower, diagonal, upper
+
+
+@lru_cache(maxsize=64)
+def _constant(n: int, lower: float, diagonal: float, upper: float, h: float, left: tuple, right: tuple) -> Tridiagonal:
+    diagonals = (np.full(n, lower), np.full(n, diagonal), np.full(n, upper))
+    if left is not None:
+        diagonals = end_rows(*diagonals, h, Boundary(*left, 0.0), Boundary(*right, 0.0))
+
+    return Tridiagonal(*diagonals)
+
+
+def constant(
+    n: int,
+    lower: float,
+    diagonal: float,
+    upper: float,
+    h: Optional[float] = None,
+    left: Optional[Boundary] = None,
+    right: Optional[Boundary] = None,
+) -> Tridiagonal:
+    """
+    Find the cached factor of the matrix with the constant diagonals and the optional end rows.
+
+    The factors are cached by the size, the coefficients, h and the values alpha and beta of the end conditions,
+    so the schemes with a constant matrix factor it once for all the steps. The gamma of a condition enters only
+    the right-hand side and is left out of the key; alpha and beta are the end rows of the matrix, so the key
+    must hold their values and not only the kind of the condition (two Robin conditions differ in the matrix).
+
+    Args:
+        n (int): The size of the matrix.
+        lower (float): The subdiagonal coefficient.
+        diagonal (float): The diagonal coefficient.
+        upper (float): The superdiagonal coefficient.
+        h (Optional[float]): The step of the grid for the end conditions.
+        left (Optional[Boundary]): The condition at the first node, both or neither of the conditions are given.
+        right (Optional[Boundary]): The condition at the last node.
+
+    Returns:
+        Tridiagonal: The factored matrix, shared between the calls with the same arguments.
+
+    Raises:
+        ValueError: Only one of the end conditions is given, or they are given without h.
+
+    Doctests:
+        >>> matrix = constant(5, 1.0, -2.0, 1.0, 0.25, dirichlet(0.0), dirichlet(1.0))
+        >>> matrix is constant(5, 1.0, -2.0, 1.0, 0.25, dirichlet(2.0), dirichlet(3.0))
+        True
+        >>> matrix.solve([0.0, 0.0, 0.0, 0.0, 1.0]).round(12).tolist()
+        [0.0, 0.25, 0.5, 0.75, 1.0]
+        >>> robin = constant(5, 1.0, -2.0, 1.0, 0.25, Boundary(1.0, 1.0, 0.0), dirichlet(1.0))
+        >>> robin is constant(5, 1.0, -2.0, 1.0, 0.25, Boundary(5.0, 1.0, 0.0), dirichlet(1.0))
+        False
+        >>> constant(5, 1.0, -2.0, 1.0, left=dirichlet(0.0), right=dirichlet(1.0))
+        Traceback (most recent call last):
+        ...
+        ValueError: The end conditions need the step of the grid h.
+    """
+
+    if (left is None) != (right is None):
+        raise ValueError("Both or neither of the end conditions must be given.")
+
+    if left is not None and h is None:
+        raise ValueError("The end conditions need the step of the grid h.")
+
+    if left is None:
+        return _constant(n, lower, diagonal, upper, h, None, None)
+
+    return _constant(n, lower, diagonal, upper, h, tuple(left[:2]), tuple(right[:2]))